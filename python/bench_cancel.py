@@ -0,0 +1,86 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from decimal import Decimal
+
+from aiohttp import web
+
+from shared.api_client import api_client, close_api_clients
+from shared.api_config import ApiConfig
+from shared.cancel_engine import CancelEngine
+from shared.paradex_api_utils import Order, OrderSide, OrderStatus, OrderType
+
+number = int(os.getenv("BENCH_NUMBER", "500"))
+# Simulated exchange latency and share of transient errors
+latency = float(os.getenv("BENCH_LATENCY", "0.005"))
+error_rate = float(os.getenv("BENCH_ERROR_RATE", "0.02"))
+
+
+async def delete_order_stub(request: web.Request) -> web.Response:
+    await asyncio.sleep(latency)
+    if random.random() < error_rate:
+        return web.json_response({"error": "SERVICE_UNAVAILABLE"}, status=503)
+    return web.Response(status=204)
+
+
+def resting_orders() -> list:
+    orders = []
+    for i in range(number):
+        o = Order(
+            market="ETH-USD-PERP",
+            order_type=OrderType.Limit,
+            order_side=OrderSide.Buy if i % 2 else OrderSide.Sell,
+            size=Decimal("0.1"),
+            limit_price=Decimal("1850") + i,
+            client_id=str(i),
+        )
+        o.id = str(i)
+        o.status = OrderStatus.OPEN
+        orders.append(o)
+    return orders
+
+
+async def main() -> None:
+    app = web.Application()
+    app.router.add_delete("/orders/{order_id}", delete_order_stub)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    config = ApiConfig()
+    config.paradex_http_url = f"http://127.0.0.1:{port}"
+    config.paradex_jwt = "jwt"
+    with open(os.path.join("fixtures", "paradex_config.json")) as f:
+        config.paradex_config = json.load(f)
+
+    # Previous behaviour: one DELETE at a time, no retries
+    orders = resting_orders()
+    client = api_client(config)
+    t0 = time.perf_counter()
+    for o in orders:
+        await client.delete_order_payload(config.paradex_jwt, o.id)
+    print(f"sequential cancels:\n\ttime to flat:\t{1000*(time.perf_counter() - t0):.0f}ms")
+
+    orders = resting_orders()
+    engine = CancelEngine(config, max_in_flight=config.cancel_max_in_flight)
+    t0 = time.perf_counter()
+    failed = await engine.cancel_matching(orders, market="ETH-USD-PERP")
+    print(
+        f"CancelEngine ({config.cancel_max_in_flight} in flight):"
+        f"\n\ttime to flat:\t{1000*(time.perf_counter() - t0):.0f}ms"
+        f"\n\tfailed:\t{len(failed)}"
+        f"\n\tattempts:\t{sum(o.cancel_attempts for o in orders)}"
+    )
+
+    await close_api_clients()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+import json
+import timeit
+from decimal import Decimal
+
+from shared import codec
+from shared.api_client_utils import DecimalEncoder
+from shared.codec import OrderBookUpdate, decode_data, decode_subscription
+
+number = 10_000
+rep = 7
+
+payload = {
+    "market": "ETH-USD-PERP",
+    "side": "BUY",
+    "size": Decimal("0.1"),
+    "price": Decimal("1850.5"),
+    "type": "LIMIT",
+    "client_id": "mock",
+    "signature": '["1234567890123456789","9876543210987654321"]',
+    "signature_timestamp": 1690000000000,
+    "instruction": "GTC",
+}
+
+book_message = json.dumps(
+    {
+        "jsonrpc": "2.0",
+        "method": "subscription",
+        "params": {
+            "channel": "order_book.ETH-USD-PERP.deltas",
+            "data": {
+                "seq_no": 42,
+                "market": "ETH-USD-PERP",
+                "last_updated_at": 1690000000000,
+                "update_type": "d",
+                "deletes": [{"side": "BUY", "price": "1849.9", "size": "0"}],
+                "inserts": [
+                    {"side": "SELL", "price": f"{1851 + i / 10:.1f}", "size": "1.5"}
+                    for i in range(10)
+                ],
+                "updates": [
+                    {"side": "BUY", "price": f"{1850 - i / 10:.1f}", "size": "2.25"}
+                    for i in range(10)
+                ],
+            },
+        },
+    }
+).encode()
+
+
+def encode_previous():
+    # Previous behaviour: json.dumps for the signed body, then aiohttp's json= again
+    json.dumps(payload, cls=DecimalEncoder)
+    json.dumps({k: str(v) if isinstance(v, Decimal) else v for k, v in payload.items()})
+
+
+def decode_previous():
+    json.loads(book_message)["params"]["data"]
+
+
+def decode_typed():
+    channel, data = decode_subscription(book_message)
+    decode_data(data, OrderBookUpdate)
+
+
+def report(name: str, fn) -> None:
+    t = timeit.repeat(fn, number=number, repeat=rep)
+    print(f"{name}:\n\tbest time:\t{1e6*min(t)/number:.2f}us\n\tbest per sec:\t{number/min(t):.0f}")
+
+
+print(f"codec backend: {codec.BACKEND}")
+report("encode order (previous)", encode_previous)
+report("encode order (codec)", lambda: codec.dumps(payload))
+report("decode book delta (previous, dict)", decode_previous)
+report("decode book delta (codec, typed)", decode_typed)
@@ -0,0 +1,10 @@
+import os
+
+from helpers import hashing
+
+# Seconds spent on each backend
+duration = float(os.getenv("BENCH_DURATION", "1"))
+
+print(f"resolved backend: {hashing.backend.name}")
+for name, backend in hashing.available_backends().items():
+    print(f"{name}:\n\thashes per sec:\t{hashing.benchmark(backend, duration):.0f}")
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+from shared.api_client import ParadexApiClient
+
+number = int(os.getenv("BENCH_NUMBER", "500"))
+
+payload = {
+    "market": "ETH-USD-PERP",
+    "side": "BUY",
+    "size": "0.1",
+    "type": "MARKET",
+    "client_id": "mock",
+    "signature": '["1","2"]',
+    "signature_timestamp": 0,
+    "instruction": "GTC",
+}
+
+
+async def post_orders_stub(request: web.Request) -> web.Response:
+    body = await request.json()
+    return web.json_response({"id": "1", **body}, status=201)
+
+
+async def post_with_new_session(url: str) -> None:
+    # Previous behaviour: one session (and connection) per request
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url + "/orders", json=payload) as response:
+            await response.json(content_type=None)
+
+
+def report(name: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(0.99 * (len(latencies) - 1))]
+    print(f"{name}:\n\tp50:\t{1000*p50:.3f}ms\n\tp99:\t{1000*p99:.3f}ms")
+
+
+async def main() -> None:
+    app = web.Application()
+    app.router.add_post("/orders", post_orders_stub)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}"
+
+    latencies = []
+    for _ in range(number):
+        t0 = time.perf_counter()
+        await post_with_new_session(url)
+        latencies.append(time.perf_counter() - t0)
+    report("new session per order", latencies)
+
+    latencies = []
+    async with ParadexApiClient(url) as client:
+        for _ in range(number):
+            t0 = time.perf_counter()
+            await client.post_order_payload("jwt", payload)
+            latencies.append(time.perf_counter() - t0)
+    report("pooled ParadexApiClient", latencies)
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main())
@@ -4,12 +4,16 @@ import os
 
 from decimal import Decimal
 
-from shared.api_client import generate_accounts, get_paradex_config, sign_order
+from shared.api_client import generate_accounts, sign_order, sign_orders
+from shared.config_store import load_paradex_config
+from shared.sessions import close_sessions
 from shared.api_config import ApiConfig
 from shared.paradex_api_utils import Order, OrderSide, OrderType
 
 number = 100
 rep = 7
+# Set to e.g. 200 to also benchmark sign_orders over the process pool
+batch_size = int(os.getenv("BENCH_BATCH_SIZE", "0"))
 
 mock_order = Order(
     market='ETH-USD-PERP',
@@ -21,10 +25,10 @@ mock_order = Order(
 os.environ["PARADEX_ENVIRONMENT"] = "local"
 
 config = ApiConfig()
-config.paradex_http_url = "https://api.testnet.paradex.trade/v1"
+config.paradex_http_url = os.getenv("PARADEX_HTTP_URL", "https://api.testnet.paradex.trade/v1")
 
 loop = asyncio.get_event_loop()
-config.paradex_config = loop.run_until_complete(get_paradex_config(config.paradex_http_url))
+config.paradex_config = loop.run_until_complete(load_paradex_config(config.paradex_http_url))
 generate_accounts(config)
 
 t1 = timeit.repeat(lambda: sign_order(config, mock_order), number=number, repeat=rep)
@@ -32,3 +36,15 @@ t1 = timeit.repeat(lambda: sign_order(config, mock_order), number=number, repeat
 print(
     f"order sign:\n\tbest time:\t{1000*min(t1)/number:.0f}ms\n\tbest per sec:\t{number/min(t1):.0f}\n\tavg per sec:\t{(number*rep)/sum(t1):.0f}"
 )
+
+if batch_size:
+    orders = [mock_order] * batch_size
+    # Warm up worker processes
+    sign_orders(config, orders)
+    t2 = timeit.repeat(lambda: sign_orders(config, orders), number=1, repeat=rep)
+
+    print(
+        f"batch order sign ({batch_size} orders, {config.order_signer_pool.workers} workers):\n\tbest time:\t{1000*min(t2):.0f}ms\n\tbest per sec:\t{batch_size/min(t2):.0f}\n\tavg per sec:\t{(batch_size*rep)/sum(t2):.0f}"
+    )
+
+loop.run_until_complete(close_sessions())
@@ -0,0 +1,227 @@
+import asyncio
+import inspect
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from aiohttp import web
+from starknet_crypto_py import sign as rs_sign
+from starkware.crypto.signature.signature import generate_k_rfc6979
+
+from helpers import hashing
+from helpers.typed_data import TypedData
+from helpers.utils import private_to_stark_key
+from shared import codec
+from shared.api_client import api_client, close_api_clients, order_signer, sign_order
+from shared.api_client_utils import get_acc_contract_address_and_call_data, order_sign_message
+from shared.api_config import ApiConfig
+from shared.paradex_api_utils import Order, OrderSide, OrderType
+
+# Offline order signing benchmarks.
+# Uses fixtures/paradex_config.json and a fixed key, no network access.
+# Results are written to BENCH_OUTPUT, and compared to BENCH_BASELINE
+# if set: the exit code is 1 if any p50 or p99 regressed by more than
+# BENCH_TOLERANCE (relative).
+
+number = int(os.getenv("BENCH_NUMBER", "2000"))
+# Operations traced to measure allocations, tracemalloc slows them down
+alloc_number = int(os.getenv("BENCH_ALLOC_NUMBER", "50"))
+only = [name for name in os.getenv("BENCH_ONLY", "").split(",") if name]
+output = os.getenv("BENCH_OUTPUT", "bench_results.json")
+baseline = os.getenv("BENCH_BASELINE", "")
+tolerance = float(os.getenv("BENCH_TOLERANCE", "0.2"))
+
+PERCENTILES = (50, 90, 99, 99.9)
+GATED = ("p50", "p99")
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "paradex_config.json")
+PRIVATE_KEY = 0x3C1E9550E66958296D11B60F8E8E7A7AD990D07FA65D5F7652C4A6C87D4E3CC
+
+# Synchronous or returning an awaitable
+Op = Callable[[], Any]
+
+
+def load_config(paradex_http_url: str) -> ApiConfig:
+    config = ApiConfig()
+    config.paradex_http_url = paradex_http_url
+    with open(FIXTURE) as f:
+        config.paradex_config = json.load(f)
+    config.paradex_account_private_key = hex(PRIVATE_KEY)
+    config.paradex_account = get_acc_contract_address_and_call_data(
+        config.paradex_config["paraclear_account_proxy_hash"],
+        config.paradex_config["paraclear_account_hash"],
+        hex(private_to_stark_key(PRIVATE_KEY)),
+    )
+    return config
+
+
+def fixture_order() -> Order:
+    return Order(
+        market="ETH-USD-PERP",
+        order_type=OrderType.Limit,
+        order_side=OrderSide.Buy,
+        size=Decimal("0.1"),
+        limit_price=Decimal("1850.5"),
+        client_id="bench",
+        signature_timestamp=1690000000000,
+    )
+
+
+def percentile(latencies: List[float], p: float) -> float:
+    return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+
+def histogram(latencies: List[float]) -> Dict[str, int]:
+    """
+    Number of operations per power of two microseconds bucket.
+    """
+    buckets: Dict[str, int] = {}
+    for latency in latencies:
+        bucket = 1
+        while bucket < latency * 1e6:
+            bucket *= 2
+        key = f"<={bucket}us"
+        buckets[key] = buckets.get(key, 0) + 1
+    return buckets
+
+
+async def run_op(op: Op, n: int) -> List[float]:
+    latencies = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        result = op()
+        if inspect.isawaitable(result):
+            await result
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+async def allocations(op: Op, n: int) -> Dict[str, float]:
+    tracemalloc.start()
+    blocks = peak = 0
+    for _ in range(n):
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = op()
+        if inspect.isawaitable(result):
+            await result
+        _, op_peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        peak += op_peak - base
+        blocks += sum(max(0, stat.count_diff) for stat in after.compare_to(before, "lineno"))
+    tracemalloc.stop()
+    return {"alloc_peak_bytes": peak / n, "alloc_retained_blocks": blocks / n}
+
+
+async def bench(name: str, op: Op) -> Dict:
+    # Warm up caches and connections
+    await run_op(op, max(10, number // 100))
+    latencies = sorted(await run_op(op, number))
+    result = {
+        "n": number,
+        "mean": sum(latencies) / len(latencies),
+        **{f"p{p:g}": percentile(latencies, p) for p in PERCENTILES},
+        "ops_per_sec": len(latencies) / sum(latencies),
+        "histogram": histogram(latencies),
+        **await allocations(op, alloc_number),
+    }
+    print(
+        f"{name}:\n"
+        + "".join(f"\tp{p:g}:\t{1e6 * result[f'p{p:g}']:.1f}us\n" for p in PERCENTILES)
+        + f"\tper sec:\t{result['ops_per_sec']:.0f}\n"
+        + f"\tpeak alloc:\t{result['alloc_peak_bytes']:.0f}B/op"
+    )
+    return result
+
+
+def regressions(results: Dict, baseline_results: Dict) -> List[str]:
+    failures = []
+    for name, result in results.items():
+        previous = baseline_results.get(name)
+        if previous is None:
+            continue
+        for key in GATED:
+            if result[key] > previous[key] * (1 + tolerance):
+                failures.append(
+                    f"{name} {key}: {1e6 * previous[key]:.1f}us -> {1e6 * result[key]:.1f}us"
+                )
+    return failures
+
+
+async def post_orders_stub(request: web.Request) -> web.Response:
+    body = await request.read()
+    return web.Response(body=body, status=201, content_type="application/json")
+
+
+async def main() -> int:
+    app = web.Application()
+    app.router.add_post("/orders", post_orders_stub)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    config = load_config(f"http://127.0.0.1:{port}")
+    signer = order_signer(config)
+    order = fixture_order()
+    chain_id = signer.chain_id
+    account_address = int(config.paradex_account, 16)
+    typed_data = TypedData.from_dict(order_sign_message(chain_id, order))
+    msg_hash = signer.message_hash(order)
+    k = generate_k_rfc6979(msg_hash, PRIVATE_KEY)
+    payload = order.dump_to_dict()
+    client = api_client(config)
+
+    async def submit() -> None:
+        order.signature = sign_order(config, order)
+        await client.post_order_payload("jwt", order.dump_to_dict())
+
+    ops: Dict[str, Op] = {
+        "typed_data_build": lambda: TypedData.from_dict(order_sign_message(chain_id, order)),
+        "message_hash": lambda: typed_data.message_hash(account_address),
+        "message_hash_precomputed": lambda: signer.message_hash(order),
+        "k_generation": lambda: generate_k_rfc6979(msg_hash, PRIVATE_KEY),
+        "ecdsa_sign": lambda: rs_sign(private_key=PRIVATE_KEY, msg_hash=msg_hash, k=k),
+        "sign_order": lambda: sign_order(config, order),
+        "json_encode": lambda: codec.dumps(payload),
+        "submit": submit,
+    }
+
+    results = {}
+    for name, op in ops.items():
+        if not only or name in only:
+            results[name] = await bench(name, op)
+
+    await close_api_clients()
+    await runner.cleanup()
+
+    report = {
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "hash_backend": hashing.backend.name,
+        "json_backend": codec.BACKEND,
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}")
+
+    if not baseline:
+        return 0
+    with open(baseline) as f:
+        failures = regressions(results, json.load(f)["results"])
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+import os
+
+from shared.config_store import load_paradex_config
+from shared.api_client_utils import derive_accounts
+from shared.keystore import open_keystore
+from shared.sessions import closing_sessions
+
+paradex_http_url = "https://api.testnet.paradex.trade/v1"
+
+
+# Derive the Paradex accounts of the first HD indices of a mnemonic
+# into the keystore, so pods starting with it skip derivation
+@closing_sessions
+async def main(mnemonic: str, count: int, keystore_path: str, keystore_password: str) -> None:
+    # Load Paradex config
+    paradex_config = await load_paradex_config(paradex_http_url)
+
+    keystore = open_keystore(keystore_path, keystore_password)
+    if keystore is None:
+        logging.warning("KEYSTORE_PATH and KEYSTORE_PASSWORD are not set, accounts are not cached")
+
+    workers = int(os.getenv("DERIVE_WORKERS", "0"))
+    accounts = derive_accounts(mnemonic, range(count), paradex_config, keystore, workers)
+    for index, account in enumerate(accounts):
+        print(f"{index} {account.ethereum_account} {account.paradex_account}")
+
+
+if __name__ == "__main__":
+    # Logging
+    logging.basicConfig(
+        level=os.getenv("LOGGING_LEVEL", "INFO"),
+        format="%(asctime)s.%(msecs)03d | %(levelname)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    # Load environment variables
+    mnemonic = os.getenv("ETHEREUM_HD_PHRASE", "")
+    count = int(os.getenv("ACCOUNT_COUNT", "15"))
+    keystore_path = os.getenv("KEYSTORE_PATH", "")
+    keystore_password = os.getenv("KEYSTORE_PASSWORD", "")
+    asyncio.run(main(mnemonic, count, keystore_path, keystore_password))
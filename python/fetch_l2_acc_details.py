@@ -2,19 +2,21 @@ import asyncio
 import logging
 import os
 from typing import Dict, List
-from shared.api_client import get_paradex_config
+from shared.config_store import load_paradex_config
+from shared.sessions import closing_sessions
 from utils import (
     generate_paradex_account,
     get_l1_eth_account,
 )
 
 paradex_http_url = "https://api.testnet.paradex.trade/v1"
+@closing_sessions
 async def main(eth_private_key_hex: str) -> None:
     # Initialize Ethereum account
     _, eth_account = get_l1_eth_account(eth_private_key_hex)
 
     # Load Paradex config
-    paradex_config = await get_paradex_config(paradex_http_url)
+    paradex_config = await load_paradex_config(paradex_http_url)
 
     # Generate Paradex account (only local)
     paradex_account_address, paradex_account_private_key_hex = generate_paradex_account(
@@ -1,75 +1,219 @@
 import asyncio
+import csv
 import logging
 import os
-import time
 import traceback
-from typing import Dict, List
-import json
-from decimal import Decimal
-import aiohttp
-from starknet_py.common import int_from_bytes
-from starknet_py.utils.typed_data import TypedData
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
 from utils import (
     generate_paradex_account,
-    get_account,
     get_l1_eth_account,
-    sign_stark_key_message,
 )
-import pandas as pd
 from onboarding import get_jwt_token
-from shared.api_client import get_paradex_config
-
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return str(obj)
-        return json.JSONEncoder.default(self, obj)
+from shared.api_client import get_api_client
+from shared.config_store import load_paradex_config
+from shared.sessions import closing_sessions
 
 paradex_http_url = "https://api.testnet.paradex.trade/v1"
 
-async def _get(url: str, params, paradex_jwt: str):
-    headers = {"Authorization": f"Bearer {paradex_jwt}"}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=params) as response:
-            status_code: int = response.status
-            response: Dict = await response.json()
-            if status_code == 200:
-                logging.info(f"Success")
-                logging.info("Get Trades successful")
-                return response["results"], response["next"]
-            else:
-                # print(response)
-                logging.error(f"Status Code: {status_code}")
-                logging.error(f"Response Text: {response}")
-    return dict(), None
-
-async def get_trades(
+trades_market = "ETH-USD-PERP"
+trades_file = "Trades_Paradex"
+# Stores the cursor of the next page until the export completes
+cursor_file = "Trades_Paradex.cursor"
+# csv or parquet (requires pyarrow)
+trades_format = os.getenv("TRADES_FORMAT", "csv")
+# Rows buffered before writing a parquet row group
+row_group_size = 100_000
+
+# Column types used for the parquet schema, other columns are strings
+TRADE_COLUMN_TYPES = {
+    "size": "float64",
+    "price": "float64",
+    "created_at": "int64",
+}
+
+
+async def iter_trade_pages(
+    paradex_http_url: str,
+    paradex_jwt: str,
+    market: str,
+    cursor: Optional[str] = None,
+) -> AsyncIterator[Tuple[List[Dict], Optional[str]]]:
+    """
+    Yields each page of trades along with the cursor of the next page,
+    starting from `cursor` if given.
+    """
+    paginator = get_api_client(paradex_http_url).paginator(paradex_jwt)
+    params = {'market': market}
+    if cursor is not None:
+        params['cursor'] = cursor
+    async for page in paginator.pages('/trades', params):
+        yield page
+
+
+class CsvTradeWriter:
+    """
+    Appends trades page by page to a CSV file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.buffered = 0
+        self.columns: Optional[List[str]] = None
+        self._file = None
+        self._writer = None
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, newline="") as f:
+                self.columns = next(csv.reader(f))
+
+    def write(self, trades: List[Dict]) -> None:
+        if not trades:
+            return
+        if self._file is None:
+            new_file = self.columns is None
+            if new_file:
+                self.columns = list(trades[0].keys())
+            self._file = open(self.path, "a", newline="")
+            self._writer = csv.DictWriter(self._file, self.columns, extrasaction="ignore")
+            if new_file:
+                self._writer.writeheader()
+        self._writer.writerows(trades)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class ParquetTradeWriter:
+    """
+    Writes trades with typed numeric columns. Once `row_group_size` rows
+    are buffered they are written to a new part file, which is renamed
+    into place once complete, so rows counted as written are never in a
+    truncated file and an interrupted export can be resumed. Pages are
+    not split across parts, since the cursor can only resume at a page
+    boundary, so a part holds up to one page more than `row_group_size`.
+    """
+
+    def __init__(self, path: str, row_group_size: int):
+        import pyarrow
+
+        self.pa = pyarrow
+        self.path = path
+        self.row_group_size = row_group_size
+        self.schema = None
+        self.buffered = 0
+        self._rows: List[Dict] = []
+        self.part = 0
+        while os.path.exists(f"{path}.{self.part}.parquet"):
+            self.part += 1
+
+    def write(self, trades: List[Dict]) -> None:
+        self._rows.extend(trades)
+        self.buffered = len(self._rows)
+        if self.buffered >= self.row_group_size:
+            self.flush()
+
+    def typed_value(self, value, type):
+        # Paradex sends numbers as strings, and timestamps as ints
+        if value is None:
+            return None
+        if self.pa.types.is_integer(type):
+            return int(value)
+        if self.pa.types.is_floating(type):
+            return float(value)
+        return str(value)
+
+    def flush(self) -> None:
+        import pyarrow.parquet
+
+        if not self._rows:
+            return
+        if self.schema is None:
+            self.schema = self.pa.schema(
+                [
+                    (column, TRADE_COLUMN_TYPES.get(column, "string"))
+                    for column in self._rows[0].keys()
+                ]
+            )
+        columns = {
+            field.name: self.pa.array(
+                [self.typed_value(row.get(field.name), field.type) for row in self._rows],
+                type=field.type,
+            )
+            for field in self.schema
+        }
+        part_path = f"{self.path}.{self.part}.parquet"
+        tmp_path = f"{part_path}.tmp"
+        pyarrow.parquet.write_table(self.pa.table(columns, schema=self.schema), tmp_path)
+        os.replace(tmp_path, part_path)
+        self.part += 1
+        self._rows = []
+        self.buffered = 0
+
+    def close(self) -> None:
+        self.flush()
+
+
+def read_cursor() -> Optional[str]:
+    if not os.path.exists(cursor_file):
+        return None
+    with open(cursor_file) as f:
+        return f.read().strip() or None
+
+
+def save_cursor(cursor: Optional[str]) -> None:
+    if cursor is None:
+        if os.path.exists(cursor_file):
+            os.remove(cursor_file)
+        return
+    with open(cursor_file, "w") as f:
+        f.write(cursor)
+
+
+async def export_trades(
     paradex_http_url: str,
     paradex_jwt: str,
-) -> List[Dict]:
-    headers = {"Authorization": f"Bearer {paradex_jwt}"}
-    count=0
-    base_url = paradex_http_url + '/trades'
-    params={
-    'market': 'ETH-USD-PERP'
-    }
-    logging.info(f"GET {base_url}")
-    logging.info(f"Headers: {headers}")
-    trades, next= await _get(url=base_url, params=params, paradex_jwt=paradex_jwt)
-    print(type(trades))
-    while next is not None:
-        url=base_url+'/?cursor='+next
-        TempTrades, next= await _get(url=url, params=params, paradex_jwt=paradex_jwt)
-        trades.extend(TempTrades)   
-    return trades
+    market: str,
+) -> int:
+    """
+    Streams every trade page to the trades file, keeping memory bounded.
+    The next page cursor is stored once a page is written so that an
+    interrupted export resumes where it stopped.
+    """
+    if trades_format == "parquet":
+        writer = ParquetTradeWriter(trades_file, row_group_size)
+    else:
+        writer = CsvTradeWriter(f"{trades_file}.csv")
+
+    cursor = read_cursor()
+    if cursor is not None:
+        logging.info(f"Resuming trades export from cursor {cursor}")
+
+    count = 0
+    try:
+        async for trades, cursor in iter_trade_pages(paradex_http_url, paradex_jwt, market, cursor):
+            writer.write(trades)
+            count += len(trades)
+            # Only move the cursor past rows that reached the file
+            if writer.buffered == 0:
+                save_cursor(cursor)
+    finally:
+        # Buffered rows are written on close, after which the cursor is current.
+        # If they cannot be written the cursor stays at the last complete write.
+        writer.close()
+        save_cursor(cursor)
+    logging.info(f"Exported {count} trades")
+    return count
 
 
+@closing_sessions
 async def main(eth_private_key_hex: str) -> None:
     # Initialize Ethereum account
     _, eth_account = get_l1_eth_account(eth_private_key_hex)
 
     # Load Paradex config
-    paradex_config = await get_paradex_config(paradex_http_url)
+    paradex_config = await load_paradex_config(paradex_http_url)
 
     # Generate Paradex account (only local)
     paradex_account_address, paradex_account_private_key_hex = generate_paradex_account(
@@ -85,13 +229,9 @@ async def main(eth_private_key_hex: str) -> None:
         paradex_account_private_key_hex,
     )
 
-    # Get account's open orders using the JWT token
+    # Export account's trades
     logging.info("Getting account's trades...")
-    trades = await get_trades(paradex_http_url, paradex_jwt)
-    print(type(trades))
-    df=pd.DataFrame(trades)
-    print(df)
-    df.to_csv('Trades_Paradex.csv')
+    await export_trades(paradex_http_url, paradex_jwt, trades_market)
 
 if __name__ == "__main__":
     # Logging
@@ -110,4 +250,4 @@ if __name__ == "__main__":
     except Exception as e:
         logging.error("Local Main Error")
         logging.error(e)
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
@@ -0,0 +1,158 @@
+"""
+Description:
+    Pedersen hash and Stark curve ECDSA backends, resolved once at import.
+"""
+import functools
+import logging
+import os
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+HashFunction = Callable[[int, int], int]
+
+
+class CryptoBackend(NamedTuple):
+    name: str
+    pedersen_hash: HashFunction
+    compute_hash_on_elements: Callable[[Sequence[int]], int]
+    # (msg_hash, priv_key, seed) -> (r, s), k is derived with RFC 6979
+    sign: Callable[[int, int, Optional[int]], Tuple[int, int]]
+    # (msg_hash, r, s, public_key) -> valid
+    verify: Callable[[int, int, int, int], bool]
+    get_public_key: Callable[[int], int]
+
+
+def _chain(hash_fn: HashFunction) -> Callable[[Sequence[int]], int]:
+    """
+    Hash chain calling the native function directly for every element,
+    without going through a Python wrapper.
+    """
+
+    def compute_hash_on_elements(data: Sequence[int]) -> int:
+        return hash_fn(functools.reduce(hash_fn, data, 0), len(data))
+
+    return compute_hash_on_elements
+
+
+def _rust_backend() -> Optional[CryptoBackend]:
+    try:
+        from starknet_crypto_py import (
+            get_public_key,
+            pedersen_hash as rs_pedersen_hash,
+            sign as rs_sign,
+            verify as rs_verify,
+        )
+        from starkware.crypto.signature.signature import generate_k_rfc6979
+    except ImportError:
+        return None
+
+    def sign(msg_hash: int, priv_key: int, seed: Optional[int]) -> Tuple[int, int]:
+        k = generate_k_rfc6979(msg_hash, priv_key, seed)
+        return rs_sign(private_key=priv_key, msg_hash=msg_hash, k=k)
+
+    return CryptoBackend(
+        "rust",
+        rs_pedersen_hash,
+        _chain(rs_pedersen_hash),
+        sign,
+        lambda msg_hash, r, s, public_key: rs_verify(
+            msg_hash=msg_hash, r=r, s=s, public_key=public_key
+        ),
+        get_public_key,
+    )
+
+
+def _cpp_backend() -> Optional[CryptoBackend]:
+    if os.getenv("DISABLE_CRYPTO_C_EXTENSION", "false").lower() == "true":
+        return None
+    try:
+        from crypto_cpp_py.cpp_bindings import (
+            cpp_get_public_key,
+            cpp_hash,
+            cpp_sign,
+            cpp_verify,
+            get_cpp_lib_file,
+        )
+        from starknet_py.constants import EC_ORDER
+    except ImportError:
+        return None
+    try:
+        # Raises instead of returning a falsy path when the library is missing
+        get_cpp_lib_file()
+    except (RuntimeError, OSError):
+        return None
+    return CryptoBackend(
+        "cpp",
+        cpp_hash,
+        _chain(cpp_hash),
+        cpp_sign,
+        lambda msg_hash, r, s, public_key: cpp_verify(
+            msg_hash=msg_hash, r=r, w=pow(s, -1, EC_ORDER), stark_key=public_key
+        ),
+        cpp_get_public_key,
+    )
+
+
+def _python_backend() -> Optional[CryptoBackend]:
+    try:
+        from starkware.cairo.lang.vm.crypto import pedersen_hash as py_pedersen_hash
+        from starkware.crypto.signature.signature import private_to_stark_key, sign, verify
+    except ImportError:
+        return None
+    return CryptoBackend(
+        "python",
+        py_pedersen_hash,
+        _chain(py_pedersen_hash),
+        sign,
+        verify,
+        private_to_stark_key,
+    )
+
+
+def available_backends() -> Dict[str, CryptoBackend]:
+    """
+    Installed backends, fastest first.
+    """
+    backends = {}
+    for load in (_rust_backend, _cpp_backend, _python_backend):
+        backend = load()
+        if backend is not None:
+            backends[backend.name] = backend
+    return backends
+
+
+def resolve_backend(name: str = "") -> CryptoBackend:
+    """
+    Returns the backend called `name`, or the fastest installed one.
+    """
+    backends = available_backends()
+    if not backends:
+        raise ImportError("No crypto backend installed")
+    if not name:
+        return next(iter(backends.values()))
+    if name not in backends:
+        raise ValueError(f"Hash backend {name} is not installed, available: {list(backends)}")
+    return backends[name]
+
+
+backend = resolve_backend(os.getenv("HASH_BACKEND", ""))
+logging.debug(f"Using {backend.name} crypto backend")
+
+pedersen_hash: HashFunction = backend.pedersen_hash
+compute_hash_on_elements: Callable[[Sequence[int]], int] = backend.compute_hash_on_elements
+sign = backend.sign
+verify = backend.verify
+get_public_key = backend.get_public_key
+
+
+def benchmark(backend: CryptoBackend, duration: float = 1) -> float:
+    """
+    Returns the number of pedersen hashes per second of `backend`.
+    """
+    data = [int.from_bytes(os.urandom(31), "big") for _ in range(64)]
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        backend.compute_hash_on_elements(data)
+        count += len(data) + 1
+    return count / (time.perf_counter() - start)
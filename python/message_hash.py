@@ -4,19 +4,20 @@ import logging
 import os
 import traceback
 
-from crypto_cpp_py.cpp_bindings import cpp_hash, get_cpp_lib_file
 from typing import cast, Sequence, List, Union
 
 from starknet_py.cairo.felt import encode_shortstring
 from starknet_py.common import int_from_bytes
 from starknet_py.hash.selector import get_selector_from_name
-from starkware.cairo.lang.vm.crypto import pedersen_hash as default_hash
+
+from helpers.hashing import pedersen_hash
 
 from utils import (
     generate_paradex_account,
     get_l1_eth_account,
 )
-from shared.api_client import get_paradex_config
+from shared.config_store import load_paradex_config
+from shared.sessions import closing_sessions
 paradex_http_url = "https://api.testnet.paradex.trade/v1"
 # This is a very stripped down version of message hashing
 # Added notes around the code to explain what's going on
@@ -34,12 +35,13 @@ types = {
     ],
 }
 
+@closing_sessions
 async def main(eth_private_key_hex: str) -> None:
     # Initialize Ethereum account
     _, eth_account = get_l1_eth_account(eth_private_key_hex)
 
     # Load Paradex config
-    paradex_config = await get_paradex_config(paradex_http_url)
+    paradex_config = await load_paradex_config(paradex_http_url)
     chain = int_from_bytes(paradex_config["starknet_chain_id"].encode())
 
     # Generate Paradex account (only local)
@@ -204,23 +206,6 @@ def compute_hash_on_elements(data: Sequence) -> int:
     return functools.reduce(pedersen_hash, [*data, len(data)], 0)
 
 
-def pedersen_hash(left: int, right: int) -> int:
-    """
-    One of two hash functions (along with _starknet_keccak) used throughout StarkNet.
-    """
-    if use_cpp_variant():
-        return cpp_hash(left, right)
-    return default_hash(left, right)
-
-
-def use_cpp_variant() -> bool:
-    force_disable_ext = (
-        os.getenv("DISABLE_CRYPTO_C_EXTENSION", "false").lower() == "true"
-    )
-    cpp_lib_file = get_cpp_lib_file()
-    return not force_disable_ext and bool(cpp_lib_file)
-
-
 if __name__ == "__main__":
     # Logging
     logging.basicConfig(
@@ -14,7 +14,8 @@ from utils import (
     get_account,
     get_l1_eth_account,
 )
-from shared.api_client import get_paradex_config
+from shared.config_store import load_paradex_config
+from shared.sessions import closing_sessions
 
 paradex_http_url = "https://api.testnet.paradex.trade/v1"
 
@@ -124,12 +125,13 @@ async def get_open_orders(
     return []
 
 
+@closing_sessions
 async def main(eth_private_key_hex: str) -> None:
     # Initialize Ethereum account
     _, eth_account = get_l1_eth_account(eth_private_key_hex)
 
     # Load Paradex config
-    paradex_config = await get_paradex_config(paradex_http_url)
+    paradex_config = await load_paradex_config(paradex_http_url)
 
     # Generate Paradex account (only local)
     paradex_account_address, paradex_account_private_key_hex = generate_paradex_account(
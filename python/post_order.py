@@ -6,7 +6,9 @@ import traceback
 from decimal import Decimal
 from shared.api_config import ApiConfig
 from shared.paradex_api_utils import Order, OrderSide, OrderType
-from shared.api_client import get_jwt_token, get_paradex_config, post_order_payload, sign_order
+from shared.api_client import get_jwt_token, post_order_payload, sign_order
+from shared.config_store import load_paradex_config
+from shared.sessions import closing_sessions
 
 from utils import (
     generate_paradex_account,
@@ -28,6 +30,7 @@ def build_order(config: ApiConfig, order_type: OrderType, order_side: OrderSide,
     return order
 
 
+@closing_sessions
 async def main(config: ApiConfig) -> None:
     # Initialize Ethereum account
     _, eth_account = get_l1_eth_account(config.ethereum_private_key)
@@ -70,7 +73,7 @@ if __name__ == "__main__":
     try:
         loop = asyncio.get_event_loop()
         # Load paradex config
-        config.paradex_config = loop.run_until_complete(get_paradex_config(config.paradex_http_url))
+        config.paradex_config = loop.run_until_complete(load_paradex_config(config.paradex_http_url))
         loop.run_until_complete(main(config))
     except Exception as e:
         logging.error("Local Main Error")
@@ -0,0 +1,61 @@
+import asyncio
+import json
+import logging
+import os
+
+from shared.exchange_sim import ExchangeSimulator
+
+# Serves a local Paradex stand-in, point clients at it with
+#   PARADEX_HTTP_URL=http://127.0.0.1:8080/v1 PARADEX_WS_URL=ws://127.0.0.1:8081/v1
+# Latency and jitter are in seconds.
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "paradex_config.json")
+
+host = os.getenv("SIM_HOST", "127.0.0.1")
+http_port = int(os.getenv("SIM_PORT", "8080"))
+ws_port = int(os.getenv("SIM_WS_PORT", "8081"))
+latency = float(os.getenv("SIM_LATENCY", "0"))
+jitter = float(os.getenv("SIM_JITTER", "0"))
+error_rate = float(os.getenv("SIM_ERROR_RATE", "0"))
+jwt_ttl = int(os.getenv("SIM_JWT_TTL", "300"))
+# Comma separated public keys (hex) onboarded at startup
+public_keys = [key for key in os.getenv("SIM_PUBLIC_KEYS", "").split(",") if key]
+seed = os.getenv("SIM_SEED")
+
+
+async def main() -> None:
+    with open(os.getenv("SIM_CONFIG", FIXTURE)) as f:
+        paradex_config = json.load(f)
+
+    sim = ExchangeSimulator(
+        paradex_config,
+        host=host,
+        http_port=http_port,
+        ws_port=ws_port,
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        jwt_ttl=jwt_ttl,
+        seed=None if seed is None else int(seed),
+    )
+    for public_key in public_keys:
+        logging.info(f"Onboarded {sim.register(int(public_key, 16))}")
+
+    async with sim:
+        try:
+            while True:
+                await asyncio.sleep(10)
+                logging.info(f"Stats: {dict(sim.stats)}")
+        finally:
+            logging.info(f"Stats: {dict(sim.stats)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("LOGGING_LEVEL", "INFO"),
+        format="%(asctime)s.%(msecs)03d | %(levelname)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,159 @@
+"""
+Description:
+    Process-wide cache of Starknet accounts and node clients.
+"""
+import asyncio
+import functools
+import logging
+import os
+from collections import OrderedDict
+from enum import IntEnum
+from typing import Dict, Optional, Set, Tuple
+
+import aiohttp
+from starknet_py.common import int_from_bytes
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.signer.stark_curve_signer import KeyPair
+
+from helpers.account import Account
+
+# (rpc url, account address, chain id)
+AccountKey = Tuple[str, int, int]
+
+
+@functools.lru_cache(maxsize=None)
+def get_chain_id(chain_id: str) -> IntEnum:
+    class CustomStarknetChainId(IntEnum):
+        PRIVATE_TESTNET = int_from_bytes(chain_id.encode("UTF-8"))
+
+    return CustomStarknetChainId.PRIVATE_TESTNET
+
+
+class AccountRegistry:
+    """
+    Bounded LRU of accounts keyed by (rpc url, address, chain).
+
+    Accounts on the same node share one FullNodeClient, and clients
+    used from a running event loop share one HTTP session per node
+    instead of opening a session per request. A new session, and so a
+    new client, is created when the event loop changes, the one of the
+    previous loop is closed. Deriving the public key of an account
+    happens once per key.
+    """
+
+    def __init__(self, max_accounts: int = 256):
+        self.max_accounts = max_accounts
+        self._accounts: "OrderedDict[AccountKey, Account]" = OrderedDict()
+        # rpc url -> (session, client using it)
+        self._clients: Dict[str, Tuple[Optional[aiohttp.ClientSession], FullNodeClient]] = {}
+        # rpc url -> (event loop, session)
+        self._sessions: Dict[str, Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+        self._closing: Set[asyncio.Future] = set()
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def client(self, rpc_url: str) -> FullNodeClient:
+        session = self.session(rpc_url)
+        entry = self._clients.get(rpc_url)
+        if entry is not None and entry[0] is session:
+            return entry[1]
+        client = FullNodeClient(node_url=rpc_url, session=session)
+        self._clients[rpc_url] = (session, client)
+        return client
+
+    def session(self, rpc_url: str) -> Optional[aiohttp.ClientSession]:
+        """
+        HTTP session shared by the clients of `rpc_url` in the running
+        event loop, None outside a loop.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside a loop the client opens a session per request
+            return None
+        entry = self._sessions.get(rpc_url)
+        if entry is not None:
+            session_loop, session = entry
+            if session_loop is loop and not session.closed:
+                return session
+            self._discard_session(session)
+        session = aiohttp.ClientSession()
+        self._sessions[rpc_url] = (loop, session)
+        return session
+
+    def _discard_session(self, session: aiohttp.ClientSession) -> None:
+        if session.closed:
+            return
+        # Its connections were opened by the previous loop, close them without awaiting it
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            task = asyncio.ensure_future(self._close_connector(connector))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_connector(connector: aiohttp.BaseConnector) -> None:
+        try:
+            await connector.close()
+        except RuntimeError as e:
+            logging.debug(f"Connections of a closed event loop: {e}")
+
+    def get_account(
+        self, account_address: str, private_key: int, rpc_url: str, chain_id: str
+    ) -> Account:
+        chain = get_chain_id(chain_id)
+        key = (rpc_url, int(account_address, 16), int(chain))
+        client = self.client(rpc_url)
+        account = self._accounts.get(key)
+        if account is not None and account.signer.private_key == private_key:
+            self._accounts.move_to_end(key)
+            if account.client is not client:
+                # Its client uses the session of a previous event loop, the signer is kept
+                account = Account(
+                    client=client, address=account_address, signer=account.signer, chain=chain
+                )
+                self._accounts[key] = account
+            return account
+
+        account = Account(
+            client=client,
+            address=account_address,
+            key_pair=KeyPair.from_private_key(key=private_key),
+            chain=chain,
+        )
+        self._accounts[key] = account
+        self._accounts.move_to_end(key)
+        if len(self._accounts) > self.max_accounts:
+            self._accounts.popitem(last=False)
+        return account
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        for session_loop, session in self._sessions.values():
+            if session_loop is loop:
+                await session.close()
+            else:
+                self._discard_session(session)
+        self._sessions.clear()
+        self._clients.clear()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+
+account_registry = AccountRegistry(int(os.getenv("ACCOUNT_CACHE_SIZE", "256")))
+
+
+def get_account(account_address: str, account_key: str, paradex_config: dict) -> Account:
+    return account_registry.get_account(
+        account_address,
+        int(account_key, 16),
+        paradex_config["starknet_fullnode_rpc_url"],
+        paradex_config["starknet_chain_id"],
+    )
+
+
+async def close_account_clients() -> None:
+    logging.debug(f"Closing node clients of {len(account_registry)} accounts")
+    await account_registry.close()
@@ -9,32 +9,31 @@ import base64
 import hmac
 import json
 import logging
-import sys
 import time
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 
 import aiohttp
 import websockets
 from .api_client_utils import (
-    DecimalEncoder,
+    AuthError,
     auth_message,
-    derive_stark_key_from_eth_key,
+    derive_account_from_key,
+    derive_accounts,
     flatten_signature,
     gen_and_save_recovery_phrase,
-    generate_keys,
-    get_acc_contract_address_and_call_data,
     get_account,
     is_token_expired,
     onboarding_message,
-    order_sign_message,
-    stark_key_message,
+    TokenExpired,
 )
 from .api_config import ApiConfig
+from .codec import dumps, dumps_str, read_json
+from .contract_registry import get_contract
+from .keystore import open_keystore
+from .order_signer import OrderSigner, OrderSignerPool
+from .paginator import PaginationError, Paginator, RateLimiter
 from .paradex_api_utils import Order
 from starknet_py.common import int_from_bytes
-from starknet_py.contract import Contract
-from starknet_py.net.signer.stark_curve_signer import KeyPair
-from .starknet_utils import get_proxy_config
 from web3.auto import w3
 
 from helpers.account import Account
@@ -88,129 +87,198 @@ async def create_rest_headers(
     return headers
 
 
-async def get_open_orders(
-    paradex_http_url: str,
-    paradex_jwt: str,
-) -> List[Dict]:
-    """
-    Paradex RESToverHTTP endpoint.
-    [GET] /orders
-    """
-    logging.info("Getting Open Orders")
-    method: str = "GET"
-    path: str = "/orders"
-
-    headers: Dict = await create_rest_headers(
-        paradex_jwt=paradex_jwt,
-        paradex_maker_secret_key="",
-        method=method,
-        path=path,
-        body="",
-    )
+class ParadexApiClient:
+    """
+    Paradex RESToverHTTP client.
+
+    Owns one long-lived aiohttp session so connections to the API
+    are kept alive and reused across requests instead of paying
+    the TCP and TLS handshakes on every call.
+    """
+
+    def __init__(
+        self,
+        paradex_http_url: str,
+        pool_size: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 60,
+        dns_cache_ttl: int = 300,
+    ):
+        self.paradex_http_url = paradex_http_url
+        self.pool_size = pool_size
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._session = None
+        self._loop = None
+        self._closing = set()
+        # Rate limiters by endpoint, shared by the paginators of this client
+        self.rate_limiters: Dict[str, RateLimiter] = {}
+
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Returns the pooled session, creating it on first use.
+        A new session is created if the running event loop changed,
+        the one of the previous loop is closed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._loop is not loop:
+            self._discard_session()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+        return self._session
+
+    def _discard_session(self) -> None:
+        session, self._session = self._session, None
+        if session.closed:
+            return
+        # Its connections were opened by the previous loop, close them without awaiting it
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            task = asyncio.ensure_future(self._close_connector(connector))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_connector(connector: aiohttp.BaseConnector) -> None:
+        try:
+            await connector.close()
+        except RuntimeError as e:
+            logging.debug(f"Connections of a closed event loop: {e}")
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    async def __aenter__(self) -> "ParadexApiClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def get(
+        self, path: str, paradex_jwt: str, params: Optional[Dict] = None
+    ) -> Tuple[int, Dict]:
+        """
+        Paradex RESToverHTTP GET on any endpoint.
+        Returns the status code along with the decoded response.
+        """
+        headers: Dict = await create_rest_headers(
+            paradex_jwt=paradex_jwt,
+            paradex_maker_secret_key="",
+            method="GET",
+            path=path,
+            body="",
+        )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(paradex_http_url + path, headers=headers) as response:
+        async with self.session().get(
+            self.paradex_http_url + path, headers=headers, params=params
+        ) as response:
             status_code: int = response.status
-            response: Dict = await response.json()
-            logging.debug("GET /orders: ", response)
+            response: Dict = await read_json(response)
             check_token_expiry(status_code=status_code, response=response)
-            if status_code != 200:
-                logging.error("Unable to [GET] /orders")
-                logging.error(f"Status Code: {status_code}")
-                logging.error(f"Response Text: {response}")
-            response = response["results"]
-    return response
-
-
-async def fetch_account(
-    paradex_http_url: str,
-    paradex_jwt: str,
-) -> List[Dict]:
-    """
-    Paradex RESToverHTTP endpoint.
-    [GET] /account
-    """
-    logging.info("Getting Account state")
-    method: str = "GET"
-    path: str = "/account"
-
-    headers: Dict = await create_rest_headers(
-        paradex_jwt=paradex_jwt,
-        paradex_maker_secret_key="",
-        method=method,
-        path=path,
-        body="",
-    )
+        return status_code, response
+
+    def paginator(self, paradex_jwt: str, **options) -> Paginator:
+        """
+        Paginator sharing the per-endpoint rate limits of this client.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            # Their locks belong to the previous event loop
+            self.rate_limiters.clear()
+        return Paginator(self, paradex_jwt, limiters=self.rate_limiters, **options)
+
+    async def get_all(
+        self, path: str, paradex_jwt: str, params: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Paradex RESToverHTTP GET on a list endpoint.
+        Returns the results of every page.
+        """
+        try:
+            return [result async for result in self.paginator(paradex_jwt).results(path, params)]
+        except PaginationError as e:
+            logging.error(f"Unable to [GET] {path}")
+            logging.error(f"Status Code: {e.status_code}")
+            logging.error(f"Response Text: {e.response}")
+            raise
+
+    async def get_open_orders(self, paradex_jwt: str) -> List[Dict]:
+        """
+        Paradex RESToverHTTP endpoint.
+        [GET] /orders, every page.
+        """
+        logging.info("Getting Open Orders")
+        return await self.get_all("/orders", paradex_jwt)
+
+    async def fetch_account(self, paradex_jwt: str) -> List[Dict]:
+        """
+        Paradex RESToverHTTP endpoint.
+        [GET] /account
+        """
+        logging.info("Getting Account state")
+        method: str = "GET"
+        path: str = "/account"
+
+        headers: Dict = await create_rest_headers(
+            paradex_jwt=paradex_jwt,
+            paradex_maker_secret_key="",
+            method=method,
+            path=path,
+            body="",
+        )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(paradex_http_url + path, headers=headers) as response:
+        async with self.session().get(self.paradex_http_url + path, headers=headers) as response:
             status_code: int = response.status
-            response: Dict = await response.json()
+            response: Dict = await read_json(response)
             check_token_expiry(status_code=status_code, response=response)
             if status_code != 200:
                 logging.error("Unable to [GET] /account")
                 logging.error(f"Status Code: {status_code}")
                 logging.error(f"Response Text: {response}")
-    return response
-
-
-async def fetch_transfers(
-    paradex_http_url: str,
-    paradex_jwt: str,
-) -> List[Dict]:
-    """
-    Paradex RESToverHTTP endpoint.
-    [GET] /account/transfers
-    """
-    logging.info("Getting Account state")
-    method: str = "GET"
-    path: str = "/account/transfers"
-
-    headers: Dict = await create_rest_headers(
-        paradex_jwt=paradex_jwt,
-        paradex_maker_secret_key="",
-        method=method,
-        path=path,
-        body="",
-    )
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(paradex_http_url + path, headers=headers) as response:
-            status_code: int = response.status
-            response: Dict = await response.json()
-            check_token_expiry(status_code=status_code, response=response)
-            if status_code != 200:
-                logging.error("Unable to [{method}] {path}")
-                logging.error(f"Status Code: {status_code}")
-                logging.error(f"Response Text: {response}")
-    return response
-
-
-async def fetch_positions(
-    paradex_http_url: str,
-    paradex_jwt: str,
-) -> List[Dict]:
-    """
-    Paradex RESToverHTTP endpoint.
-    [GET] /positions
-    """
-    FN = "private_get_positions"
-    logging.info("Getting Positions")
-    method: str = "GET"
-    path: str = "/positions"
-
-    headers: Dict = await create_rest_headers(
-        paradex_jwt=paradex_jwt,
-        paradex_maker_secret_key="",
-        method=method,
-        path=path,
-        body="",
-    )
+        return response
+
+    async def fetch_transfers(self, paradex_jwt: str) -> Dict:
+        """
+        Paradex RESToverHTTP endpoint.
+        [GET] /account/transfers, every page in one response.
+        """
+        logging.info("Getting Transfers")
+        transfers = await self.get_all("/account/transfers", paradex_jwt)
+        return {"next": None, "prev": None, "results": transfers}
+
+    async def fetch_positions(self, paradex_jwt: str) -> List[Dict]:
+        """
+        Paradex RESToverHTTP endpoint.
+        [GET] /positions
+        """
+        FN = "private_get_positions"
+        logging.info("Getting Positions")
+        method: str = "GET"
+        path: str = "/positions"
+
+        headers: Dict = await create_rest_headers(
+            paradex_jwt=paradex_jwt,
+            paradex_maker_secret_key="",
+            method=method,
+            path=path,
+            body="",
+        )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(paradex_http_url + path, headers=headers) as response:
+        async with self.session().get(self.paradex_http_url + path, headers=headers) as response:
             status_code: int = response.status
-            response: Dict = await response.json()
+            response: Dict = await read_json(response)
             check_token_expiry(status_code=status_code, response=response)
             if status_code != 200:
                 logging.error(
@@ -219,33 +287,28 @@ async def fetch_positions(
                     f" Response: {response}"
                 )
             response = response["results"]
-    return response
-
-
-async def fetch_tokens(
-    paradex_http_url: str,
-    paradex_jwt: str,
-) -> List[Dict]:
-    """
-    Paradex RESToverHTTP endpoint.
-    [GET] /balance
-    """
-    logging.info("Getting Token balances")
-    method: str = "GET"
-    path: str = "/balance"
-
-    headers: Dict = await create_rest_headers(
-        paradex_jwt=paradex_jwt,
-        paradex_maker_secret_key="",
-        method=method,
-        path=path,
-        body="",
-    )
+        return response
+
+    async def fetch_tokens(self, paradex_jwt: str) -> List[Dict]:
+        """
+        Paradex RESToverHTTP endpoint.
+        [GET] /balance
+        """
+        logging.info("Getting Token balances")
+        method: str = "GET"
+        path: str = "/balance"
+
+        headers: Dict = await create_rest_headers(
+            paradex_jwt=paradex_jwt,
+            paradex_maker_secret_key="",
+            method=method,
+            path=path,
+            body="",
+        )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(paradex_http_url + path, headers=headers) as response:
+        async with self.session().get(self.paradex_http_url + path, headers=headers) as response:
             status_code: int = response.status
-            response: Dict = await response.json()
+            response: Dict = await read_json(response)
             check_token_expiry(status_code=status_code, response=response)
             logging.info(f"Token Balances: {response}")
             if status_code != 200:
@@ -253,77 +316,41 @@ async def fetch_tokens(
                 logging.error(f"Status Code: {status_code}")
                 logging.error(f"Response Text: {response}")
             response = response["results"]
-    return response
-
-
-async def fetch_trades(paradex_http_url: str, paradex_jwt: str, market: str) -> None:
-    """
-    Paradex RESToverHTTP endpoint.
-    [GET] /trades
-    """
-    logging.info("Getting Trades")
-    method: str = "GET"
-    path: str = "/trades"
-
-    headers: Dict = await create_rest_headers(
-        paradex_jwt=paradex_jwt,
-        paradex_maker_secret_key="",
-        method=method,
-        path=path,
-        body="",
-    )
-    params = {"market": market}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            paradex_http_url + path, headers=headers, params=params
-        ) as response:
-            status_code: int = response.status
-            logging.info(f"URL: {response.url}")
-            response: Dict = await response.json()
-            check_token_expiry(status_code=status_code, response=response)
-            if status_code != 200:
-                logging.error("Unable to [GET] /trades")
-                logging.error(f"Status Code: {status_code}")
-                logging.error(f"Response Text: {response}")
-            response = response["results"]
-    return response
-
-
-def check_token_expiry(status_code: int, response: Dict) -> None:
-    """
-    Checks the response from the Paradex API
-    to see if the token has expired.
-    """
-    if is_token_expired(status_code, response):
-        logging.info(response["message"])
-        logging.error("Token has expired, please restart the bot.")
-        sys.exit(1)
-
-
-async def post_order_payload(paradex_http_url: str, paradex_jwt: str, payload: dict) -> dict:
-    """
-    Paradex RESToverHTTP endpoint.
-    [POST] /orders
-    """
-    method: str = "POST"
-    path: str = "/orders"
-    _payload: str = json.dumps(payload, cls=DecimalEncoder)
-    headers: Dict = await create_rest_headers(
-        paradex_jwt=paradex_jwt,
-        paradex_maker_secret_key="",
-        method=method,
-        path=path,
-        body=_payload,
-    )
-    response = {}
-    logging.debug(f"post_order_payload:{payload}")
-    async with aiohttp.ClientSession() as session:
+        return response
+
+    async def fetch_trades(self, paradex_jwt: str, market: str) -> List[Dict]:
+        """
+        Paradex RESToverHTTP endpoint.
+        [GET] /trades, every page.
+        """
+        logging.info("Getting Trades")
+        return await self.get_all("/trades", paradex_jwt, {"market": market})
+
+    async def post_order_payload(self, paradex_jwt: str, payload: dict) -> dict:
+        """
+        Paradex RESToverHTTP endpoint.
+        [POST] /orders
+        """
+        method: str = "POST"
+        path: str = "/orders"
+        # Serialized once, the same bytes are sent as the body
+        _payload: bytes = dumps(payload)
+        headers: Dict = await create_rest_headers(
+            paradex_jwt=paradex_jwt,
+            paradex_maker_secret_key="",
+            method=method,
+            path=path,
+            body=_payload,
+        )
+        headers["Content-Type"] = "application/json"
+        response = {}
+        logging.debug(f"post_order_payload:{payload}")
         try:
-            async with session.post(
-                paradex_http_url + path, headers=headers, json=payload
+            async with self.session().post(
+                self.paradex_http_url + path, headers=headers, data=_payload
             ) as response:
                 status_code: int = response.status
-                response: Dict = await response.json(content_type=None)
+                response: Dict = await read_json(response)
                 response["status_code"] = status_code
                 check_token_expiry(status_code=status_code, response=response)
                 if status_code == 201:
@@ -337,103 +364,240 @@ async def post_order_payload(paradex_http_url: str, paradex_jwt: str, payload: d
                     )
         except aiohttp.ClientConnectorError as e:
             logging.error(f"[POST] /orders ClientConnectorError: {e}")
-    return response
-
-
-async def delete_order_payload(paradex_http_url: str, paradex_jwt: str, order_id: str) -> bool:
-    """
-    Paradex RESToverHTTP endpoint.
-    [DELETE] /orders/{order_id}
-    """
-    method: str = "DELETE"
-    path: str = f"/orders/{order_id}"
-    ret_val = False
-    headers: Dict = await create_rest_headers(
-        paradex_jwt=paradex_jwt,
-        paradex_maker_secret_key="",
-        method=method,
-        path=path,
-        body="",
-    )
+        return response
+
+    async def delete_order_payload(self, paradex_jwt: str, order_id: str) -> bool:
+        """
+        Paradex RESToverHTTP endpoint.
+        [DELETE] /orders/{order_id}
+        """
+        status_code, _ = await self.delete_order(paradex_jwt, order_id)
+        return status_code == 201 or status_code == 204
+
+    async def delete_order(self, paradex_jwt: str, order_id: str) -> Tuple[int, Dict]:
+        """
+        [DELETE] /orders/{order_id}, returns the status code and response.
+        The status code is 0 if the request could not be sent.
+        """
+        method: str = "DELETE"
+        path: str = f"/orders/{order_id}"
+        headers: Dict = await create_rest_headers(
+            paradex_jwt=paradex_jwt,
+            paradex_maker_secret_key="",
+            method=method,
+            path=path,
+            body="",
+        )
 
-    async with aiohttp.ClientSession() as session:
         try:
-            async with session.delete(paradex_http_url + path, headers=headers) as response:
+            async with self.session().delete(
+                self.paradex_http_url + path, headers=headers
+            ) as response:
                 status_code: int = response.status
-                response: Dict = await response.json(content_type=None)
+                response: Dict = await read_json(response) or {}
                 check_token_expiry(status_code=status_code, response=response)
                 if status_code == 201 or status_code == 204:
                     logging.info(f"Order cancelled: {status_code} | Id: {order_id}")
-                    ret_val = True
                 else:
                     logging.info(f"Unable to [DELETE] {path}")
                     logging.info(f"Status Code: {status_code}")
                     logging.info(f"Response Text: {response}")
+                return status_code, response
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"[DELETE] /orders {type(e).__name__}: {e}")
+        return 0, {}
+
+    async def get_markets(self, paradex_jwt: str) -> List[Dict]:
+        """
+        Paradex RESToverHTTP endpoint.
+        [GET] /markets
+        """
+        logging.info("Getting markets...")
+        method: str = "GET"
+        path: str = "/markets"
+        payload: str = ""
+
+        headers: Dict = await create_rest_headers(
+            paradex_jwt=paradex_jwt,
+            paradex_maker_secret_key=None,
+            method=method,
+            path=path,
+            body=payload,
+        )
 
-        except aiohttp.ClientConnectorError as e:
-            logging.error(f"[DELETE] /orders ClientConnectorError: {e}")
-    return ret_val
-
-
-async def get_markets(
-    paradex_http_url: str,
-    paradex_jwt: str,
-) -> List[Dict]:
-    """
-    Paradex RESToverHTTP endpoint.
-    [GET] /markets
-    """
-    logging.info("Getting markets...")
-    method: str = "GET"
-    path: str = "/markets"
-    payload: str = ""
-
-    headers: Dict = await create_rest_headers(
-        paradex_jwt=paradex_jwt,
-        paradex_maker_secret_key=None,
-        method=method,
-        path=path,
-        body=payload,
-    )
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(paradex_http_url + path, headers=headers) as response:
+        async with self.session().get(self.paradex_http_url + path, headers=headers) as response:
             status_code: int = response.status
-            response: Dict = await response.json()
+            response: Dict = await read_json(response)
             check_token_expiry(status_code=status_code, response=response)
-            logging.debug("GET /markets: ", response)
+            logging.debug(f"GET /markets: {response}")
             if status_code != 200:
                 message: str = "Unable to [GET] /markets"
                 logging.error(message)
                 logging.error(f"Status Code: {status_code}")
                 logging.error(f"Response Text: {response}")
             response = response["results"]
-    return response
+        return response
 
+    async def get_paradex_config(self) -> Dict:
+        """
+        Paradex RESToverHTTP endpoint.
+        [GET] /config
+        """
+        logging.info("Getting config...")
+        path: str = "/system/config"
 
-async def get_paradex_config(
-    paradex_http_url: str,
-) -> Dict:
-    """
-    Paradex RESToverHTTP endpoint.
-    [GET] /config
-    """
-    logging.info("Getting config...")
-    path: str = "/system/config"
-
-    headers = dict()
+        headers = dict()
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(paradex_http_url + path, headers=headers) as response:
+        async with self.session().get(self.paradex_http_url + path, headers=headers) as response:
             status_code: int = response.status
-            response: Dict = await response.json()
+            response: Dict = await read_json(response)
             logging.info(response)
             if status_code != 200:
                 message: str = "Unable to [GET] /system/config"
                 logging.error(message)
                 logging.error(f"Status Code: {status_code}")
                 logging.error(f"Response Text: {response}")
-    return response
+        return response
+
+    async def get_system_config(
+        self, etag: str = "", last_modified: str = ""
+    ) -> Tuple[int, Optional[Dict], Mapping[str, str]]:
+        """
+        [GET] /system/config, conditional on `etag` and `last_modified` if set.
+        Returns the status code, the config (None on 304) and the response headers.
+        """
+        headers: Dict = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        async with self.session().get(
+            self.paradex_http_url + "/system/config", headers=headers
+        ) as response:
+            status_code: int = response.status
+            body = await read_json(response) if status_code == 200 else None
+            # Case insensitive, servers differ on e.g. ETag or Etag
+            return status_code, body, response.headers.copy()
+
+
+# One pooled client per API url, shared by the functions below
+_api_clients: Dict[str, ParadexApiClient] = {}
+
+
+def pool_options(config: ApiConfig) -> Dict:
+    """
+    ParadexApiClient connection pool settings of `config`.
+    """
+    return {
+        "pool_size": config.http_pool_size,
+        "limit_per_host": config.http_limit_per_host,
+        "keepalive_timeout": config.http_keepalive_timeout,
+        "dns_cache_ttl": config.http_dns_cache_ttl,
+    }
+
+
+def get_api_client(paradex_http_url: str, config: Optional[ApiConfig] = None) -> ParadexApiClient:
+    """
+    Shared client of `paradex_http_url`, created with the pool settings
+    of `config`, by default those of the HTTP_* environment variables.
+    The settings of an existing client cannot change, a warning is
+    logged if `config` asks for others.
+    """
+    client = _api_clients.get(paradex_http_url)
+    if client is None:
+        options = pool_options(config or ApiConfig())
+        client = ParadexApiClient(paradex_http_url, **options)
+        _api_clients[paradex_http_url] = client
+    elif config is not None:
+        options = pool_options(config)
+        current = {name: getattr(client, name) for name in options}
+        if options != current:
+            logging.warning(
+                f"Ignoring pool settings {options} for {paradex_http_url}, "
+                f"its client already uses {current}"
+            )
+    return client
+
+
+def api_client(config: ApiConfig) -> ParadexApiClient:
+    return get_api_client(config.paradex_http_url, config)
+
+
+async def close_api_clients() -> None:
+    for client in _api_clients.values():
+        await client.close()
+    _api_clients.clear()
+
+
+async def get_open_orders(
+    paradex_http_url: str,
+    paradex_jwt: str,
+) -> List[Dict]:
+    return await get_api_client(paradex_http_url).get_open_orders(paradex_jwt)
+
+
+async def fetch_account(
+    paradex_http_url: str,
+    paradex_jwt: str,
+) -> List[Dict]:
+    return await get_api_client(paradex_http_url).fetch_account(paradex_jwt)
+
+
+async def fetch_transfers(
+    paradex_http_url: str,
+    paradex_jwt: str,
+) -> Dict:
+    return await get_api_client(paradex_http_url).fetch_transfers(paradex_jwt)
+
+
+async def fetch_positions(
+    paradex_http_url: str,
+    paradex_jwt: str,
+) -> List[Dict]:
+    return await get_api_client(paradex_http_url).fetch_positions(paradex_jwt)
+
+
+async def fetch_tokens(
+    paradex_http_url: str,
+    paradex_jwt: str,
+) -> List[Dict]:
+    return await get_api_client(paradex_http_url).fetch_tokens(paradex_jwt)
+
+
+async def fetch_trades(paradex_http_url: str, paradex_jwt: str, market: str) -> List[Dict]:
+    return await get_api_client(paradex_http_url).fetch_trades(paradex_jwt, market)
+
+
+def check_token_expiry(status_code: int, response: Dict) -> None:
+    """
+    Checks the response from the Paradex API
+    to see if the token has expired.
+    """
+    if is_token_expired(status_code, response):
+        logging.warning(response["message"])
+        raise TokenExpired(response["message"])
+
+
+async def post_order_payload(paradex_http_url: str, paradex_jwt: str, payload: dict) -> dict:
+    return await get_api_client(paradex_http_url).post_order_payload(paradex_jwt, payload)
+
+
+async def delete_order_payload(paradex_http_url: str, paradex_jwt: str, order_id: str) -> bool:
+    return await get_api_client(paradex_http_url).delete_order_payload(paradex_jwt, order_id)
+
+
+async def get_markets(
+    paradex_http_url: str,
+    paradex_jwt: str,
+) -> List[Dict]:
+    return await get_api_client(paradex_http_url).get_markets(paradex_jwt)
+
+
+async def get_paradex_config(
+    paradex_http_url: str,
+) -> Dict:
+    return await get_api_client(paradex_http_url).get_paradex_config()
 
 
 # JSON-RPCoverWebsocket Interface
@@ -441,7 +605,7 @@ async def send_heartbeat_id(websocket: websockets.WebSocketClientProtocol, id: i
     """
     Sends a Heartbeat to keep the Paradex WebSocket connection alive.
     """
-    await websocket.send(json.dumps({"id": id, "jsonrpc": "2.0", "method": "heartbeat"}))
+    await websocket.send(dumps_str({"id": id, "jsonrpc": "2.0", "method": "heartbeat"}))
     logging.debug(f"send_heartbeat_id:{id}")
 
 
@@ -452,7 +616,7 @@ async def send_auth_id(
     Sends an authentication message to the Paradex WebSocket.
     """
     await websocket.send(
-        json.dumps(
+        dumps_str(
             {
                 "id": msg_id,
                 "jsonrpc": "2.0",
@@ -470,7 +634,7 @@ async def subscribe_channel_with_id(
     Subscribe to a named `` WS Channel.
     """
     await websocket.send(
-        json.dumps(
+        dumps_str(
             {
                 "id": sub_id,
                 "jsonrpc": "2.0",
@@ -505,15 +669,11 @@ async def get_usdc_balance(config: ApiConfig) -> int:
 async def deposit_to_paraclear(config: ApiConfig, amount: int) -> None:
     paraclear_address = config.paradex_config["paraclear_address"]
     account = starknet_account(config)
-    paraclear_contract = await Contract.from_address(
-        provider=account, address=paraclear_address, proxy_config=get_proxy_config()
-    )
+    paraclear_contract = await get_contract(paraclear_address, account)
     logging.info(f"Paraclear Contract: {hex(paraclear_contract.address)}")
     usdc_address = config.paradex_config["bridged_tokens"][0]["l2_token_address"]
     usdc_decimals = config.paradex_config["bridged_tokens"][0]["decimals"]
-    usdc_contract = await Contract.from_address(
-        provider=account, address=usdc_address, proxy_config=get_proxy_config()
-    )
+    usdc_contract = await get_contract(usdc_address, account)
     logging.info(f"USDC Contract: {usdc_contract}")
 
     amount_usdc = await get_usdc_balance(config)
@@ -533,40 +693,69 @@ async def deposit_to_paraclear(config: ApiConfig, amount: int) -> None:
     return amount / 10**8
 
 
-async def get_jwt_token(
-    paradex_config: Dict, paradex_http_url: str, account_address: str, private_key: str
-) -> str:
-    logging.info("get_jwt_token")
-    token = ""
-    chain = int_from_bytes(paradex_config["starknet_chain_id"].encode())
-    account = get_account(
-        account_address=account_address, account_key=private_key, paradex_config=paradex_config
-    )
-    now = int(time.time())
-    expiry = now + 24 * 60 * 60
+def auth_headers(
+    account: Account, account_address: str, chain: int, now: int, expiry: int
+) -> Dict:
+    """
+    Signs the auth request, the headers can be sent until `expiry`.
+    """
     message = auth_message(chain, now, expiry)
-
     sig = account.sign_message(message)
-
-    headers: Dict = {
+    return {
         "PARADEX-STARKNET-ACCOUNT": account_address,
         "PARADEX-STARKNET-SIGNATURE": flatten_signature(sig),
         "PARADEX-TIMESTAMP": str(now),
         "PARADEX-SIGNATURE-EXPIRATION": str(expiry),
     }
+
+
+async def request_jwt_token(
+    paradex_http_url: str, headers: Dict, session: Optional[aiohttp.ClientSession] = None
+) -> str:
+    """
+    Paradex RESToverHTTP endpoint.
+    [POST] /auth
+    Uses the pooled session of `paradex_http_url` unless `session` is given.
+    """
     path: str = "/auth"
     logging.info(f"get_jwt_token path:{paradex_http_url + path} headers:{headers}")
-    async with aiohttp.ClientSession() as session:
-        async with session.post(paradex_http_url + path, headers=headers) as response:
-            status_code: int = response.status
-            response: Dict = await response.json()
-            if status_code != 200:
-                message: str = "Unable to [POST] /auth"
-                logging.error(message)
-                logging.error(f"Status Code: {status_code}")
-                logging.error(f"Response Text: {response}")
-            logging.info(f"token response:{response}")
-            token = response["jwt_token"]
+    if session is None:
+        session = get_api_client(paradex_http_url).session()
+    async with session.post(paradex_http_url + path, headers=headers) as response:
+        status_code: int = response.status
+        response: Dict = await read_json(response)
+        logging.info(f"token response:{response}")
+        if status_code != 200 or not isinstance(response, dict) or "jwt_token" not in response:
+            message: str = "Unable to [POST] /auth"
+            logging.error(message)
+            logging.error(f"Status Code: {status_code}")
+            logging.error(f"Response Text: {response}")
+            raise AuthError(f"{message} Status Code: {status_code} Response: {response}")
+        return response["jwt_token"]
+
+
+async def get_jwt_token(
+    paradex_config: Dict,
+    paradex_http_url: str,
+    account_address: str,
+    private_key: str,
+    signature_ttl: Optional[int] = None,
+) -> str:
+    """
+    Signs an auth request valid for `signature_ttl` seconds,
+    JWT_SIGNATURE_TTL by default, and exchanges it for a JWT.
+    """
+    logging.info("get_jwt_token")
+    if signature_ttl is None:
+        signature_ttl = ApiConfig().jwt_signature_ttl
+    chain = int_from_bytes(paradex_config["starknet_chain_id"].encode())
+    account = get_account(
+        account_address=account_address, account_key=private_key, paradex_config=paradex_config
+    )
+    now = int(time.time())
+    expiry = now + signature_ttl
+    headers = auth_headers(account, account_address, chain, now, expiry)
+    token = await request_jwt_token(paradex_http_url, headers)
     logging.info("get_jwt_token done")
     return token
 
@@ -619,13 +808,49 @@ def custom_exception_handler(loop, context):
     loop.stop()
 
 
-def sign_order(config: ApiConfig, o: Order) -> Tuple[str, str]:
+def order_signer(config: ApiConfig) -> OrderSigner:
     account = starknet_account(config)
-    message = order_sign_message(account._chain_id.value, o)
+    chain_id = account._chain_id.value
+    signer = config.order_signer
+    if (
+        signer is not None
+        and signer.chain_id == chain_id
+        and signer.account_address == config.paradex_account
+    ):
+        return signer
+
+    signer = OrderSigner(
+        chain_id=chain_id,
+        account_address=config.paradex_account,
+        private_key=account.signer.key_pair.private_key,
+    )
+    config.order_signer = signer
+    return signer
+
+
+def sign_order(config: ApiConfig, o: Order) -> str:
+    return order_signer(config).sign(o)
 
-    sig = account.sign_message(message)
-    flat_sig = flatten_signature(sig)
-    return flat_sig
+
+def order_signer_pool(config: ApiConfig) -> OrderSignerPool:
+    signer = order_signer(config)
+    pool = config.order_signer_pool
+    if pool is not None and pool.signer is signer:
+        return pool
+    if pool is not None:
+        pool.shutdown()
+
+    pool = OrderSignerPool(signer, workers=config.order_sign_workers)
+    config.order_signer_pool = pool
+    return pool
+
+
+def sign_orders(config: ApiConfig, orders: List[Order]) -> List[str]:
+    return order_signer_pool(config).sign(orders)
+
+
+async def sign_orders_async(config: ApiConfig, orders: List[Order]) -> List[str]:
+    return await order_signer_pool(config).sign_async(orders)
 
 
 def get_recovery_phrase(config: ApiConfig) -> str:
@@ -638,30 +863,19 @@ def get_recovery_phrase(config: ApiConfig) -> str:
 def generate_accounts(config: ApiConfig):
     if config.ethereum_private_key != "":
         w3.eth.account.enable_unaudited_hdwallet_features()
-        account = w3.eth.account.from_key(config.ethereum_private_key)
-        eth_address, eth_priv = account.address, account.key.hex()
+        eth_account = w3.eth.account.from_key(config.ethereum_private_key)
+        account = derive_account_from_key(
+            eth_account.address, eth_account.key.hex(), config.paradex_config
+        )
     else:
         mnemonic = get_recovery_phrase(config)
-        eth_address, eth_priv = generate_keys(mnemonic, config.pod_index)
-
-    print("address: ", eth_address)
-    config.ethereum_account = eth_address
-    eth_chain_id = int(config.paradex_config['l1_chain_id'])
-    msg = stark_key_message(eth_chain_id)
-    print("msg: ", msg)
-    # this can be replaces with kms?
-    private_key = derive_stark_key_from_eth_key(msg, eth_priv)
-    print("private_key: ", private_key)
-    key_pair = KeyPair.from_private_key(private_key)
-    print("pub_key: ", hex(key_pair.public_key))
-    config.paradex_account_private_key = hex(private_key)
-    proxy_class_hash = config.paradex_config['paraclear_account_proxy_hash']
-    account_class_hash = config.paradex_config['paraclear_account_hash']
-    account_address = get_acc_contract_address_and_call_data(
-        proxy_class_hash,
-        account_class_hash,
-        hex(key_pair.public_key),
-    )
-    print("account_address: ", account_address)
-    config.paradex_account = account_address
+        keystore = open_keystore(config.keystore_path, config.keystore_password)
+        account = derive_accounts(mnemonic, [config.pod_index], config.paradex_config, keystore)[0]
+
+    print("address: ", account.ethereum_account)
+    config.ethereum_account = account.ethereum_account
+    print("pub_key: ", account.public_key)
+    config.paradex_account_private_key = account.paradex_account_private_key
+    print("account_address: ", account.paradex_account)
+    config.paradex_account = account.paradex_account
     print("config.paradex_account: ", config.paradex_account)
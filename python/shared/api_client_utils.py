@@ -2,23 +2,24 @@ import hashlib
 import json
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from decimal import Decimal
-from enum import IntEnum
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from eth_account.hdaccount import generate_mnemonic
 from eth_account.messages import encode_structured_data
+from .account_registry import get_account, get_chain_id
+from .keystore import Keystore, keystore_fingerprint, open_keystore
 from .paradex_api_utils import Order
 from starknet_py.hash.address import compute_address
 from starknet_py.hash.selector import get_selector_from_name
-from starknet_py.net.full_node_client import FullNodeClient
 from starknet_py.common import int_from_bytes
 from starknet_py.net.signer.stark_curve_signer import KeyPair
 from starknet_py.utils.typed_data import TypedData
 from starkware.crypto.signature.signature import EC_ORDER
 from web3.auto import w3
 
-from helpers.account import Account
 
 
 class TokenExpired(Exception):
@@ -26,6 +27,11 @@ class TokenExpired(Exception):
     pass
 
 
+class AuthError(Exception):
+    "Raised when [POST] /auth does not return a JWT"
+    pass
+
+
 class DecimalEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, Decimal):
@@ -38,31 +44,13 @@ def is_token_expired(status_code: int, response: dict) -> bool:
         True
         if (
             status_code == 401
-            and response["message"].startswith("invalid bearer jwt: token is expired by")
+            and response is not None
+            and response.get("message", "").startswith("invalid bearer jwt: token is expired by")
         )
         else False
     )
 
 
-def get_chain_id(chain_id: str):
-    class CustomStarknetChainId(IntEnum):
-        PRIVATE_TESTNET = int_from_bytes(chain_id.encode("UTF-8"))
-    return CustomStarknetChainId.PRIVATE_TESTNET
-
-
-def get_account(account_address: str, account_key: str, paradex_config: dict):
-    client = FullNodeClient(node_url=paradex_config["starknet_fullnode_rpc_url"])
-    key_pair = KeyPair.from_private_key(key=int(account_key, 16))
-    chain = get_chain_id(paradex_config["starknet_chain_id"])
-    account = Account(
-        client=client,
-        address=account_address,
-        key_pair=key_pair,
-        chain=chain,
-    )
-    return account
-
-
 # Messages
 def auth_message(chainId: int, now: int, expiry: int) -> TypedData:
     message = {
@@ -135,7 +123,7 @@ def stark_key_message(chainId: int):
     return message
 
 
-def order_sign_message(chainId: int, o: Order):
+def order_sign_template(chainId: int):
     message = {
         "domain": {"name": "Paradex", "chainId": hex(chainId), "version": "1"},
         "primaryType": "Order",
@@ -160,14 +148,20 @@ def order_sign_message(chainId: int, o: Order):
                 },  # Quantum value with 8 decimals; Limit price or 0 at the moment of signature
             ],
         },
-        "message": {
-            "timestamp": str(o.signature_timestamp),
-            "market": o.market,  # As encoded short string
-            "side": o.order_side.chain_side(),  # 1: BUY, 2: SELL
-            "orderType": o.order_type.value,  # As encoded short string
-            "size": o.chain_size(),
-            "price": o.chain_price(),
-        },
+        "message": {},
+    }
+    return message
+
+
+def order_sign_message(chainId: int, o: Order):
+    message = order_sign_template(chainId)
+    message["message"] = {
+        "timestamp": str(o.signature_timestamp),
+        "market": o.market,  # As encoded short string
+        "side": o.order_side.chain_side(),  # 1: BUY, 2: SELL
+        "orderType": o.order_type.value,  # As encoded short string
+        "size": o.chain_size(),
+        "price": o.chain_price(),
     }
     return message
 
@@ -299,33 +293,93 @@ def derive_stark_key_from_eth_key(msg: str, eth_private_key: str) -> int:
     return private_key
 
 
+@dataclass
+class DerivedAccount:
+    ethereum_account: str
+    paradex_account: str
+    paradex_account_private_key: str
+    public_key: str
+
+
+def derive_account_from_key(eth_address: str, eth_priv: str, paradex_config: dict) -> DerivedAccount:
+    """
+    Derives the Paradex account of an Ethereum key:
+    STARK key from the signed STARK Key message, then the account contract address.
+    """
+    msg = stark_key_message(int(paradex_config["l1_chain_id"]))
+    private_key = derive_stark_key_from_eth_key(msg, eth_priv)
+    key_pair = KeyPair.from_private_key(private_key)
+    account_address = get_acc_contract_address_and_call_data(
+        paradex_config["paraclear_account_proxy_hash"],
+        paradex_config["paraclear_account_hash"],
+        hex(key_pair.public_key),
+    )
+    return DerivedAccount(eth_address, account_address, hex(private_key), hex(key_pair.public_key))
+
+
+def derive_account(mnemonic: str, index: int, paradex_config: dict) -> DerivedAccount:
+    eth_address, eth_priv = generate_keys(mnemonic, index)
+    return derive_account_from_key(eth_address, eth_priv, paradex_config)
+
+
+def derive_accounts(
+    mnemonic: str,
+    indices: Sequence[int],
+    paradex_config: dict,
+    keystore: Optional[Keystore] = None,
+    workers: int = 0,
+) -> List[DerivedAccount]:
+    """
+    Derives the accounts at HD `indices` of `mnemonic`.
+    Accounts found in `keystore` are not derived again, the others are
+    derived across `workers` processes (one per CPU if 0) and added to it.
+    """
+    fingerprint = keystore_fingerprint(mnemonic, paradex_config)
+    accounts = {}
+    if keystore is not None:
+        for index in indices:
+            entry = keystore.get(fingerprint, index)
+            if entry is not None:
+                accounts[index] = DerivedAccount(**entry)
+    missing = [index for index in dict.fromkeys(indices) if index not in accounts]
+    if len(missing) > 1 and workers != 1:
+        workers = min(workers or os.cpu_count() or 1, len(missing))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            derived = executor.map(
+                derive_account,
+                [mnemonic] * len(missing),
+                missing,
+                [paradex_config] * len(missing),
+            )
+            accounts.update(zip(missing, derived))
+    else:
+        accounts.update((index, derive_account(mnemonic, index, paradex_config)) for index in missing)
+    logging.info(f"Derived {len(missing)} accounts, {len(indices) - len(missing)} from keystore")
+    if keystore is not None:
+        keystore.put(fingerprint, {index: asdict(accounts[index]) for index in missing})
+    return [accounts[index] for index in indices]
+
+
 def generate_accounts_dict(config: dict) -> dict:
     FN = "generate_accounts_dict"
+    paradex_config = config.get("paradex_config", {})
     if config.get("ethereum_private_key"):
         w3.eth.account.enable_unaudited_hdwallet_features()
-        account = w3.eth.account.from_key(config.get("ethereum_private_key"))
-        eth_address, eth_priv = account.address, account.key.hex()
+        eth_account = w3.eth.account.from_key(config.get("ethereum_private_key"))
+        account = derive_account_from_key(
+            eth_account.address, eth_account.key.hex(), paradex_config
+        )
     else:
         mnemonic = get_recovery_phrase_dict(config)
-        eth_address, eth_priv = generate_keys(mnemonic, config.get("pod_index"))
-
-    logging.info(f"{FN} address: {eth_address}")
-    config["ethereum_account"] = eth_address
-    eth_chain_id = int(config.get("paradex_config", {}).get("l1_chain_id"))
-    msg = stark_key_message(eth_chain_id)
-    logging.info(f"{FN} stark_key_message: {msg}")
-    # this can be replaces with kms?
-    private_key = derive_stark_key_from_eth_key(msg, eth_priv)
-    logging.info(f"{FN} private_key:{private_key}")
-    key_pair = KeyPair.from_private_key(private_key)
-    logging.info(f"{FN} pub_key: {hex(key_pair.public_key)}")
-    config["paradex_account_private_key"] = hex(private_key)
-    proxy_class_hash = config["paradex_config"]['paraclear_account_proxy_hash']
-    account_class_hash = config["paradex_config"]['paraclear_account_hash']
-    config["paradex_account"] = get_acc_contract_address_and_call_data(
-        proxy_class_hash,
-        account_class_hash,
-        hex(key_pair.public_key),
-    )
+        keystore = open_keystore(
+            config.get("keystore_path", ""), config.get("keystore_password", "")
+        )
+        account = derive_accounts(mnemonic, [config.get("pod_index")], paradex_config, keystore)[0]
+
+    logging.info(f"{FN} address: {account.ethereum_account}")
+    config["ethereum_account"] = account.ethereum_account
+    logging.info(f"{FN} pub_key: {account.public_key}")
+    config["paradex_account_private_key"] = account.paradex_account_private_key
+    config["paradex_account"] = account.paradex_account
     logging.info(f"{FN} config.paradex_account: {config['paradex_account']}")
     return config
@@ -27,11 +27,14 @@ class ApiConfig(ApiConfigInterface):
                 return 'testnet'
             return env
 
-        self.paradex_ws_url = (
-            f'wss://ws.api.{local_to_testnet(self.paradex_environment.lower())}.paradex.trade/v1'
+        # PARADEX_WS_URL and PARADEX_HTTP_URL override them, e.g. for run_exchange_sim.py
+        self.paradex_ws_url = os.getenv(
+            'PARADEX_WS_URL',
+            f'wss://ws.api.{local_to_testnet(self.paradex_environment.lower())}.paradex.trade/v1',
         )
-        self.paradex_http_url = (
-            f'https://api.{local_to_testnet(self.paradex_environment.lower())}.paradex.trade/v1'
+        self.paradex_http_url = os.getenv(
+            'PARADEX_HTTP_URL',
+            f'https://api.{local_to_testnet(self.paradex_environment.lower())}.paradex.trade/v1',
         )
 
         # Hex of the account contract address
@@ -49,11 +52,51 @@ class ApiConfig(ApiConfigInterface):
             os.getenv('QUOTE_REFRESH_HIGHER_BOUNDARY', "0.1")
         )
 
+        # Maximum pooled connections held by the REST client
+        self.http_pool_size = int(os.getenv('HTTP_POOL_SIZE', "100"))
+        # Maximum pooled connections per host, 0 means no limit
+        self.http_limit_per_host = int(os.getenv('HTTP_LIMIT_PER_HOST', "0"))
+        # Seconds an idle pooled connection is kept open
+        self.http_keepalive_timeout = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', "60"))
+        # Seconds resolved API hostnames are cached
+        self.http_dns_cache_ttl = int(os.getenv('HTTP_DNS_CACHE_TTL', "300"))
+
+        # Worker processes used by sign_orders, 0 means one per CPU
+        self.order_sign_workers = int(os.getenv('ORDER_SIGN_WORKERS', "0"))
+
+        # Seconds before the JWT expiry at which it is refreshed
+        self.jwt_refresh_margin = int(os.getenv('JWT_REFRESH_MARGIN', "60"))
+        # Seconds between refreshes of a JWT without an `exp` claim
+        self.jwt_refresh_interval = int(os.getenv('JWT_REFRESH_INTERVAL', "240"))
+        # Seconds a signed auth request can be sent for
+        self.jwt_signature_ttl = int(os.getenv('JWT_SIGNATURE_TTL', str(24 * 60 * 60)))
+
+        # Concurrent DELETE requests and attempts per order of mass cancels
+        self.cancel_max_in_flight = int(os.getenv('CANCEL_MAX_IN_FLIGHT', "50"))
+        self.cancel_max_attempts = int(os.getenv('CANCEL_MAX_ATTEMPTS', "3"))
+
+        # Seconds after which presigned orders are not submitted anymore
+        self.presign_max_age = float(os.getenv('PRESIGN_MAX_AGE', "30"))
+
+        # Seconds after which the markets metadata is reloaded
+        self.markets_ttl = float(os.getenv('MARKETS_TTL', "300"))
+
+        # Encrypted cache of accounts derived from ETHEREUM_HD_PHRASE,
+        # disabled unless both are set
+        self.keystore_path = os.getenv('KEYSTORE_PATH', "")
+        self.keystore_password = os.getenv('KEYSTORE_PASSWORD', "")
+
         self.ws_recv_timeout = int(os.getenv('WS_RECV_TIMEOUT', "1"))
         self.ws_heartbeat_period = int(os.getenv('WS_HB_PERIOD', "3"))
         self.needs_onboarding = False
         self.paradex_config = dict()
         self.starknet_account = None
+        self.order_signer = None
+        self.order_signer_pool = None
+        self.jwt_manager = None
+        self.presign_pool = None
+        self.cancel_engine = None
+        self.markets_registry = None
         self.pod_ip = os.getenv('POD_IP', '127.0.0.1')
         MAX_PODS = 15
         self.pod_index = int(ipaddress.IPv4Address(self.pod_ip)) % MAX_PODS
@@ -74,6 +117,20 @@ class ApiConfig(ApiConfigInterface):
         config_dict["ethereum_private_key"] = self.ethereum_private_key
         config_dict["quote_refresh_lower_boundary"] = self.quote_refresh_lower_boundary
         config_dict["quote_refresh_higher_boundary"] = self.quote_refresh_higher_boundary
+        config_dict["http_pool_size"] = self.http_pool_size
+        config_dict["http_limit_per_host"] = self.http_limit_per_host
+        config_dict["http_keepalive_timeout"] = self.http_keepalive_timeout
+        config_dict["http_dns_cache_ttl"] = self.http_dns_cache_ttl
+        config_dict["order_sign_workers"] = self.order_sign_workers
+        config_dict["jwt_refresh_margin"] = self.jwt_refresh_margin
+        config_dict["jwt_refresh_interval"] = self.jwt_refresh_interval
+        config_dict["jwt_signature_ttl"] = self.jwt_signature_ttl
+        config_dict["cancel_max_in_flight"] = self.cancel_max_in_flight
+        config_dict["cancel_max_attempts"] = self.cancel_max_attempts
+        config_dict["presign_max_age"] = self.presign_max_age
+        config_dict["markets_ttl"] = self.markets_ttl
+        config_dict["keystore_path"] = self.keystore_path
+        config_dict["keystore_password"] = self.keystore_password
         config_dict["ws_recv_timeout"] = self.ws_recv_timeout
         config_dict["ws_heartbeat_period"] = self.ws_heartbeat_period
         config_dict["needs_onboarding"] = self.needs_onboarding
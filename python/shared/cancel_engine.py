@@ -0,0 +1,157 @@
+"""
+Description:
+    Concurrent order cancellation with priority over submissions.
+"""
+import asyncio
+import logging
+from typing import Iterable, List, Optional
+
+from .api_client import api_client
+from .api_config import ApiConfig
+from .jwt_manager import jwt_manager
+from .paradex_api_utils import Order, OrderAction, OrderSide, OrderStatus, time_millis
+
+# Status codes of a cancelled order
+CANCELLED = (200, 201, 204)
+# Status codes of an order that is unknown or already closed
+ALREADY_CLOSED = (404,)
+# Cancel reason of such orders when the response has no error code
+NOT_FOUND_REASON = "ORDER_NOT_FOUND"
+
+
+def retryable(status_code: int) -> bool:
+    # 0: the request could not be sent
+    return status_code == 0 or status_code == 429 or status_code >= 500
+
+
+def select_orders(
+    orders: Iterable[Order],
+    market: Optional[str] = None,
+    side: Optional[OrderSide] = None,
+    min_age: Optional[float] = None,
+) -> List[Order]:
+    """
+    Open orders of `market` and `side` created at least `min_age` seconds ago.
+    """
+    now = time_millis()
+    return [
+        o
+        for o in orders
+        if o.status != OrderStatus.CLOSED
+        and (market is None or o.market == market)
+        and (side is None or o.order_side == side)
+        and (min_age is None or now - o.created_at >= min_age * 1000)
+    ]
+
+
+class CancelEngine:
+    """
+    Cancels many orders concurrently over the pooled REST session.
+
+    At most `max_in_flight` DELETE requests are outstanding across all
+    callers. A cancel that failed to reach the exchange, was rate limited
+    or hit a server error is retried up to `max_attempts` times with an
+    exponential delay. Orders are updated as each result arrives, an
+    order the exchange does not know or already closed is marked closed
+    with the exchange's error code as its cancel reason.
+
+    Submissions call `wait_drained` before posting, so they wait for
+    every pending cancel to complete.
+    """
+
+    def __init__(
+        self,
+        config: ApiConfig,
+        max_in_flight: int = 50,
+        max_attempts: int = 3,
+        retry_delay: float = 0.05,
+    ):
+        self.config = config
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._window = asyncio.Semaphore(max_in_flight)
+        self._pending = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def wait_drained(self) -> None:
+        await self._drained.wait()
+
+    async def _cancel_one(self, order: Order, reason: str) -> bool:
+        if not order.id:
+            logging.warning(f"Unable to cancel unacknowledged order {order.client_id}")
+            return False
+        client = api_client(self.config)
+        for attempt in range(self.max_attempts):
+            if attempt:
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+            order.last_action = OrderAction.SendCancel
+            order.last_action_time = time_millis()
+            order.cancel_attempts += 1
+            async with self._window:
+                status_code, response = await jwt_manager(self.config).call(
+                    client.delete_order, order.id
+                )
+            if status_code in CANCELLED:
+                order.status = OrderStatus.CLOSED
+                order.cancel_reason = order.cancel_reason or reason
+                return True
+            if status_code in ALREADY_CLOSED:
+                # Filled, cancelled elsewhere or never accepted, not cancelled by us
+                logging.info(f"Cancel of {order.id}: not found or already closed {response}")
+                order.status = OrderStatus.CLOSED
+                order.cancel_reason = order.cancel_reason or response.get("error") or NOT_FOUND_REASON
+                return True
+            if not retryable(status_code):
+                logging.warning(f"Cancel of {order.id} rejected: {status_code} {response}")
+                return False
+        logging.warning(f"Cancel of {order.id} failed after {self.max_attempts} attempts")
+        return False
+
+    async def cancel(self, orders: Iterable[Order], reason: str = "USER_CANCELED") -> List[Order]:
+        """
+        Cancels `orders`, returns the ones that could not be cancelled.
+        """
+        orders = list(orders)
+        if not orders:
+            return []
+        self._pending += len(orders)
+        self._drained.clear()
+        try:
+            results = await asyncio.gather(
+                *(self._cancel_one(o, reason) for o in orders), return_exceptions=True
+            )
+        finally:
+            self._pending -= len(orders)
+            if self._pending == 0:
+                self._drained.set()
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            logging.error(f"{len(errors)} cancels raised, first error: {errors[0]!r}")
+        return [o for o, result in zip(orders, results) if result is not True]
+
+    async def cancel_matching(
+        self,
+        orders: Iterable[Order],
+        market: Optional[str] = None,
+        side: Optional[OrderSide] = None,
+        min_age: Optional[float] = None,
+        reason: str = "USER_CANCELED",
+    ) -> List[Order]:
+        return await self.cancel(select_orders(orders, market, side, min_age), reason)
+
+
+def cancel_engine(config: ApiConfig) -> CancelEngine:
+    if config.cancel_engine is not None:
+        return config.cancel_engine
+
+    config.cancel_engine = CancelEngine(
+        config,
+        max_in_flight=config.cancel_max_in_flight,
+        max_attempts=config.cancel_max_attempts,
+    )
+    return config.cancel_engine
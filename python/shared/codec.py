@@ -0,0 +1,273 @@
+"""
+Description:
+    JSON codec for REST and websocket payloads.
+
+    Uses orjson or msgspec when installed and falls back to the stdlib,
+    PARADEX_JSON_CODEC=orjson|msgspec|json forces a backend.
+    Hot websocket messages decode into the typed structs below, which
+    are msgspec Structs when msgspec is installed and no other backend
+    is forced, and slotted classes with the same attributes otherwise.
+    Both raise ValidationError for fields of the wrong type.
+"""
+import json
+import os
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from .api_client_utils import DecimalEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# In order of preference
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _resolve_backend(name: str = "") -> str:
+    """
+    Returns `name`, or the fastest installed backend if empty.
+    """
+    installed = [
+        backend
+        for backend, module in zip(BACKENDS, (orjson, msgspec, json))
+        if module is not None
+    ]
+    if not name:
+        return installed[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON codec {name}, expected one of {list(BACKENDS)}")
+    if name not in installed:
+        raise ValueError(f"JSON codec {name} is not installed, available: {installed}")
+    return name
+
+
+_FORCED_BACKEND = os.getenv("PARADEX_JSON_CODEC", "")
+BACKEND = _resolve_backend(_FORCED_BACKEND)
+# Typed messages are msgspec Structs unless another backend is forced
+MSGSPEC_STRUCTS = msgspec is not None and _FORCED_BACKEND in ("", "msgspec")
+
+if MSGSPEC_STRUCTS:
+    ValidationError = msgspec.ValidationError
+else:
+
+    class ValidationError(ValueError):
+        "Raised when a message does not match the fields of its struct"
+        pass
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if BACKEND == "orjson":
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_default)
+
+    loads = orjson.loads
+
+elif BACKEND == "msgspec":
+    # msgspec encodes Decimal as a string natively
+    dumps = msgspec.json.Encoder().encode
+    loads = msgspec.json.decode
+
+else:
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, cls=DecimalEncoder, separators=(",", ":")).encode()
+
+    loads = json.loads
+
+
+def dumps_str(obj) -> str:
+    return dumps(obj).decode()
+
+
+async def read_json(response) -> Any:
+    """
+    Decodes an aiohttp response body, None if it is empty.
+    """
+    body = await response.read()
+    return loads(body) if body else None
+
+
+# Typed messages, fields are (name, type, default)
+_STRUCT_FIELDS: Dict[str, List[Tuple]] = {
+    "BookLevel": [
+        ("side", str, ""),
+        ("price", str, "0"),
+        ("size", str, "0"),
+    ],
+    "OrderBookUpdate": [
+        ("seq_no", int, 0),
+        ("market", str, ""),
+        ("update_type", str, "d"),
+        ("last_updated_at", int, 0),
+        ("inserts", "List[BookLevel]", []),
+        ("updates", "List[BookLevel]", []),
+        ("deletes", "List[BookLevel]", []),
+    ],
+    "Fill": [
+        ("id", str, ""),
+        ("market", str, ""),
+        ("side", str, ""),
+        ("size", str, "0"),
+        ("price", str, "0"),
+        ("liquidity", str, ""),
+        ("order_id", str, ""),
+        ("client_id", str, ""),
+        ("fee", str, "0"),
+        ("fee_currency", str, ""),
+        ("remaining_size", str, "0"),
+        ("created_at", int, 0),
+    ],
+    "OrderUpdate": [
+        ("id", str, ""),
+        ("client_id", str, ""),
+        ("market", str, ""),
+        ("side", str, ""),
+        ("type", str, ""),
+        ("size", str, "0"),
+        ("remaining_size", str, "0"),
+        ("price", str, "0"),
+        ("status", str, ""),
+        ("cancel_reason", str, ""),
+        ("instruction", str, ""),
+        ("created_at", int, 0),
+        ("last_updated_at", int, 0),
+    ],
+}
+
+
+def _check_type(value, expected: type, path: str) -> None:
+    # Like msgspec, bool is not accepted as int
+    if type(value) is not expected:
+        raise ValidationError(
+            f"Expected `{expected.__name__}`, got `{type(value).__name__}` - at `{path}`"
+        )
+
+
+class _SlottedStruct:
+    __slots__ = ()
+    _fields: List[Tuple] = []
+    _level_type: Optional[type] = None
+
+    def __init__(self, **kwargs):
+        for name, _, default in self._fields:
+            value = kwargs.get(name, default)
+            setattr(self, name, list(value) if isinstance(value, list) else value)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name, _, _ in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+    @classmethod
+    def from_dict(cls, d, path: str = "$"):
+        """
+        Decodes a JSON object, missing fields take their default.
+        """
+        _check_type(d, dict, path)
+        self = object.__new__(cls)
+        for name, typ, default in cls._fields:
+            value = d.get(name, default)
+            if typ == "List[BookLevel]":
+                _check_type(value, list, f"{path}.{name}")
+                value = [
+                    cls._level_type.from_dict(level, f"{path}.{name}[{i}]")
+                    for i, level in enumerate(value)
+                ]
+            else:
+                _check_type(value, typ, f"{path}.{name}")
+            setattr(self, name, value)
+        return self
+
+
+def _define_structs() -> Dict[str, type]:
+    structs: Dict[str, type] = {}
+    for name, fields in _STRUCT_FIELDS.items():
+        if MSGSPEC_STRUCTS:
+            resolved = [
+                (field, List[structs["BookLevel"]] if typ == "List[BookLevel]" else typ, default)
+                for field, typ, default in fields
+            ]
+            structs[name] = msgspec.defstruct(name, resolved)
+            continue
+        structs[name] = type(
+            name,
+            (_SlottedStruct,),
+            {
+                "__slots__": tuple(field for field, _, _ in fields),
+                "_fields": fields,
+                "_level_type": structs.get("BookLevel"),
+            },
+        )
+    return structs
+
+
+_structs = _define_structs()
+BookLevel = _structs["BookLevel"]
+OrderBookUpdate = _structs["OrderBookUpdate"]
+Fill = _structs["Fill"]
+OrderUpdate = _structs["OrderUpdate"]
+
+
+if MSGSPEC_STRUCTS:
+
+    class _Params(msgspec.Struct):
+        channel: str
+        data: msgspec.Raw = msgspec.Raw(b"null")
+
+    class _Envelope(msgspec.Struct):
+        params: Optional[_Params] = None
+
+    _envelope_decoder = msgspec.json.Decoder(_Envelope)
+    _data_decoders: Dict[type, Any] = {}
+
+
+def decode_subscription(message) -> Tuple[Optional[str], Any]:
+    """
+    Splits a websocket message into (channel, raw data).
+    Messages that are not subscription updates return (None, message).
+    The data is decoded with `decode_data` once its type is known.
+    """
+    if MSGSPEC_STRUCTS:
+        envelope = _envelope_decoder.decode(message)
+        if envelope.params is None:
+            return None, msgspec.json.decode(message)
+        return envelope.params.channel, envelope.params.data
+    message = loads(message)
+    _check_type(message, dict, "$")
+    params = message.get("params")
+    if params is None:
+        return None, message
+    _check_type(params, dict, "$.params")
+    if "channel" not in params:
+        raise ValidationError("Object missing required field `channel` - at `$.params`")
+    _check_type(params["channel"], str, "$.params.channel")
+    return params["channel"], params.get("data")
+
+
+def decode_data(data, struct_type: Optional[type] = None):
+    """
+    Decodes subscription data into `struct_type`, or builtins if None.
+    """
+    if MSGSPEC_STRUCTS:
+        if struct_type is None:
+            return msgspec.json.decode(data)
+        decoder = _data_decoders.get(struct_type)
+        if decoder is None:
+            decoder = _data_decoders[struct_type] = msgspec.json.Decoder(struct_type)
+        return decoder.decode(data)
+    if struct_type is None:
+        return data
+    return struct_type.from_dict(data)
@@ -0,0 +1,173 @@
+"""
+Description:
+    Paradex system config cached on disk per environment.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Optional
+
+import aiohttp
+
+from .api_client import get_api_client
+
+# Directory of the cache files, one per API url
+CONFIG_CACHE_DIR = os.getenv(
+    "PARADEX_CONFIG_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "paradex")
+)
+# Never request /system/config, fail if it is not cached
+CONFIG_OFFLINE = os.getenv("PARADEX_CONFIG_OFFLINE", "false").lower() == "true"
+# System config file used as is instead of the cache, e.g. fixtures/paradex_config.json
+CONFIG_FILE = os.getenv("PARADEX_CONFIG_FILE", "")
+
+
+class ConfigUnavailable(Exception):
+    "Raised when the system config is neither cached nor fetchable"
+    pass
+
+
+def cache_path(cache_dir: str, paradex_http_url: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9.-]+", "_", paradex_http_url.split("://")[-1]).strip("_")
+    return os.path.join(cache_dir, f"system_config_{name}.json")
+
+
+class ConfigStore:
+    """
+    `/system/config` of one environment, persisted to a cache file.
+
+    `get` returns the cached config immediately and revalidates it in
+    the background with a conditional request (ETag/Last-Modified), so
+    startup does not wait on a round trip. Only a missing cache blocks
+    on the request. In `offline` mode no request is ever sent and a
+    missing cache raises ConfigUnavailable.
+    """
+
+    def __init__(
+        self,
+        paradex_http_url: str,
+        cache_dir: Optional[str] = None,
+        offline: Optional[bool] = None,
+    ):
+        self.paradex_http_url = paradex_http_url
+        self.path = cache_path(cache_dir or CONFIG_CACHE_DIR, paradex_http_url)
+        self.offline = CONFIG_OFFLINE if offline is None else offline
+        self.entry: Optional[Dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def config(self) -> Optional[Dict]:
+        return None if self.entry is None else self.entry["config"]
+
+    def load_cached(self) -> Optional[Dict]:
+        try:
+            with open(self.path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable config cache {self.path}: {e}")
+            return None
+        if entry.get("url") != self.paradex_http_url or "config" not in entry:
+            return None
+        self.entry = entry
+        return entry["config"]
+
+    def save(self, entry: Dict) -> None:
+        self.entry = entry
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self.path)
+
+    async def revalidate(self) -> Dict:
+        """
+        Fetches the config, conditionally if it is cached. Returns it.
+        """
+        entry = self.entry or {}
+        status_code, config, headers = await get_api_client(self.paradex_http_url).get_system_config(
+            entry.get("etag", ""), entry.get("last_modified", "")
+        )
+        if status_code == 304 and self.entry is not None:
+            self.save({**self.entry, "validated_at": int(time.time())})
+            logging.debug("System config not modified")
+            return self.entry["config"]
+        if status_code != 200 or not config:
+            raise ConfigUnavailable(
+                f"Unable to [GET] /system/config Status Code: {status_code}"
+            )
+        if self.entry is not None and config != self.entry["config"]:
+            logging.warning("System config changed, restart to use the new config")
+        self.save(
+            {
+                "url": self.paradex_http_url,
+                "etag": headers.get("ETag", ""),
+                "last_modified": headers.get("Last-Modified", ""),
+                "validated_at": int(time.time()),
+                "config": config,
+            }
+        )
+        return config
+
+    async def _revalidate_in_background(self) -> None:
+        try:
+            await self.revalidate()
+        except (ConfigUnavailable, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.warning(f"System config revalidation failed, using the cached one: {e}")
+
+    async def get(self) -> Dict:
+        if self.entry is not None or self.load_cached() is not None:
+            if not self.offline and (self._task is None or self._task.done()):
+                self._task = asyncio.ensure_future(self._revalidate_in_background())
+            return self.entry["config"]
+        if self.offline:
+            raise ConfigUnavailable(
+                f"System config of {self.paradex_http_url} is not cached in {self.path}"
+                " and PARADEX_CONFIG_OFFLINE is set"
+            )
+        try:
+            return await self.revalidate()
+        except aiohttp.ClientError as e:
+            raise ConfigUnavailable(f"Unable to [GET] /system/config: {e}") from e
+
+    async def close(self, timeout: float = 5) -> None:
+        """
+        Lets a running revalidation finish for up to `timeout` seconds.
+        """
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError:
+            logging.warning("System config revalidation did not finish, cache left as is")
+
+
+# One store per API url
+_config_stores: Dict[str, ConfigStore] = {}
+
+
+def config_store(paradex_http_url: str) -> ConfigStore:
+    store = _config_stores.get(paradex_http_url)
+    if store is None:
+        store = _config_stores[paradex_http_url] = ConfigStore(paradex_http_url)
+    return store
+
+
+async def close_config_stores() -> None:
+    for store in _config_stores.values():
+        await store.close()
+
+
+async def load_paradex_config(paradex_http_url: str) -> Dict:
+    """
+    System config of `paradex_http_url`: PARADEX_CONFIG_FILE if set,
+    otherwise the cached one, fetched only if it is not cached.
+    """
+    if CONFIG_FILE:
+        with open(CONFIG_FILE) as f:
+            return json.load(f)
+    return await config_store(paradex_http_url).get()
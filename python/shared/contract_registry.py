@@ -0,0 +1,285 @@
+"""
+Description:
+    Cache of resolved proxies, ABIs and contract handles.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional, Tuple, Union
+
+import aiohttp
+from starknet_py.constants import (
+    RPC_CLASS_HASH_NOT_FOUND_ERROR,
+    RPC_CONTRACT_ERROR,
+    RPC_CONTRACT_NOT_FOUND_ERROR,
+    RPC_INVALID_MESSAGE_SELECTOR_ERROR,
+)
+from starknet_py.contract import Contract
+from starknet_py.net.account.base_account import BaseAccount
+from starknet_py.net.client import Client
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import SierraContractClass
+from starknet_py.net.models import parse_address
+from starknet_py.proxy.contract_abi_resolver import (
+    AbiNotFoundError,
+    ProxyConfig,
+    ProxyResolutionError,
+)
+
+from .starknet_utils import get_proxy_config
+
+Provider = Union[BaseAccount, Client]
+
+# JSON file of the cache, shared by every process of the user
+CONTRACT_CACHE_PATH = os.getenv(
+    "CONTRACT_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "paradex", "contracts.json"),
+)
+
+# Errors of a proxy check that does not apply to the contract
+NOT_A_PROXY_ERRORS = (
+    RPC_CLASS_HASH_NOT_FOUND_ERROR,
+    RPC_CONTRACT_ERROR,
+    RPC_CONTRACT_NOT_FOUND_ERROR,
+    RPC_INVALID_MESSAGE_SELECTOR_ERROR,
+)
+NOT_A_PROXY_MESSAGES = ("not found in contract", "is not declared", "is not deployed")
+
+
+def _not_a_proxy(err: ClientError) -> bool:
+    return err.code in NOT_A_PROXY_ERRORS or any(
+        message in err.message for message in NOT_A_PROXY_MESSAGES
+    )
+
+
+class ImplementationResolver:
+    """
+    Resolves the class hash a contract takes its ABI from, separately
+    from fetching that class, with the ProxyChecks of `proxy_config`.
+    """
+
+    def __init__(self, address: int, client: Client, proxy_config: ProxyConfig):
+        self.address = address
+        self.client = client
+        self.proxy_checks = proxy_config.get("proxy_checks", [])
+
+    async def resolve_implementation(self) -> int:
+        """
+        Returns the class hash of the contract, or of its implementation for proxies.
+        Only proxy lookups are made, the class itself is not fetched.
+        """
+        if not self.proxy_checks:
+            return await self.client.get_class_hash_at(contract_address=self.address)
+        for proxy_check in self.proxy_checks:
+            try:
+                class_hash = await proxy_check.implementation_hash(
+                    address=self.address, client=self.client
+                )
+                if class_hash is not None:
+                    return class_hash
+                implementation = await proxy_check.implementation_address(
+                    address=self.address, client=self.client
+                )
+                if implementation is not None:
+                    return await self.client.get_class_hash_at(contract_address=implementation)
+            except ClientError as err:
+                if not _not_a_proxy(err):
+                    raise err
+        raise ProxyResolutionError(self.proxy_checks)
+
+    async def resolve_class(self, class_hash: int) -> Tuple[list, int]:
+        """
+        Returns (abi, cairo version) of the class.
+        """
+        contract_class = await self.client.get_class_by_hash(class_hash)
+        if contract_class.abi is None:
+            raise AbiNotFoundError()
+        if isinstance(contract_class, SierraContractClass):
+            # Cairo 1 classes hold their ABI as a JSON string
+            return json.loads(contract_class.abi), 1
+        return contract_class.abi, 0
+
+
+class ContractRegistry:
+    """
+    Resolves the implementation of a contract address once and its ABI
+    once per class hash, keeping both in memory and in a JSON file so
+    later processes make no proxy resolution RPCs.
+
+    A cached implementation is resolved again once it is older than
+    `ttl` seconds, or with `revalidate`, and replaced when the proxy now
+    points to another class hash. If that lookup fails the cached class
+    keeps being used.
+
+    The file at `path` is read on first use, not on creation.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        proxy_config: Optional[ProxyConfig] = None,
+        ttl: float = 3600,
+    ):
+        self.path = path
+        self.proxy_config = proxy_config or get_proxy_config()
+        self.ttl = ttl
+        # "{node url}|{address}" -> class hash holding the ABI
+        self.implementations: Dict[str, int] = {}
+        # "{node url}|{address}" -> unix time the implementation was last resolved
+        self.validated_at: Dict[str, float] = {}
+        # class hash -> (abi, cairo version)
+        self.abis: Dict[int, Tuple[list, int]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._loaded = False
+
+    def load(self) -> None:
+        self._loaded = True
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring contract cache {self.path}: {e}")
+            return
+        self.implementations = {
+            key: int(class_hash, 16) for key, class_hash in cache["implementations"].items()
+        }
+        self.abis = {
+            int(class_hash, 16): (entry["abi"], entry["cairo_version"])
+            for class_hash, entry in cache["abis"].items()
+        }
+        self.validated_at = dict(cache.get("validated_at", {}))
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        cache = {
+            "implementations": {
+                key: hex(class_hash) for key, class_hash in self.implementations.items()
+            },
+            "abis": {
+                hex(class_hash): {"abi": abi, "cairo_version": cairo_version}
+                for class_hash, (abi, cairo_version) in self.abis.items()
+            },
+            "validated_at": self.validated_at,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _unpack(provider: Provider) -> Tuple[Client, Optional[BaseAccount]]:
+        if isinstance(provider, BaseAccount):
+            return provider.client, provider
+        return provider, None
+
+    @staticmethod
+    def _key(client: Client, address: int) -> str:
+        return f"{getattr(client, 'url', '')}|{hex(address)}"
+
+    def _is_fresh(self, key: str) -> bool:
+        return time.time() - self.validated_at.get(key, 0) < self.ttl
+
+    async def _resolve(self, client: Client, address: int, key: str) -> Tuple[list, int]:
+        cached = self.implementations.get(key)
+        if cached is not None and cached in self.abis:
+            # Stale, check the proxy still points to the cached class
+            try:
+                await self.revalidate(address, client)
+            except (
+                ClientError,
+                ProxyResolutionError,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+            ) as e:
+                logging.warning(f"Using cached class of contract {hex(address)}: {e!r}")
+            return self.abis[self.implementations[key]]
+
+        resolver = ImplementationResolver(
+            address=address, client=client, proxy_config=self.proxy_config
+        )
+        class_hash = cached
+        if class_hash is None:
+            class_hash = await resolver.resolve_implementation()
+        if class_hash not in self.abis:
+            self.abis[class_hash] = await resolver.resolve_class(class_hash)
+        self.implementations[key] = class_hash
+        self.validated_at[key] = time.time()
+        self.save()
+        logging.info(f"Resolved contract {hex(address)} to class {hex(class_hash)}")
+        return self.abis[class_hash]
+
+    async def abi(self, address: Union[int, str], provider: Provider) -> Tuple[list, int]:
+        """
+        Returns (abi, cairo version) of the contract at `address`.
+        """
+        if not self._loaded:
+            self.load()
+        client, _ = self._unpack(provider)
+        address = parse_address(address)
+        key = self._key(client, address)
+        class_hash = self.implementations.get(key)
+        if class_hash is not None and class_hash in self.abis and self._is_fresh(key):
+            return self.abis[class_hash]
+        # Concurrent callers share a single resolution
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._resolve(client, address, key))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def contract(self, address: Union[int, str], provider: Provider) -> Contract:
+        """
+        Returns the Contract at `address` bound to `provider`.
+        """
+        address = parse_address(address)
+        abi, cairo_version = await self.abi(address, provider)
+        return Contract(address=address, abi=abi, provider=provider, cairo_version=cairo_version)
+
+    def invalidate(self, address: Union[int, str], provider: Provider) -> None:
+        if not self._loaded:
+            self.load()
+        client, _ = self._unpack(provider)
+        address = parse_address(address)
+        key = self._key(client, address)
+        self.implementations.pop(key, None)
+        self.validated_at.pop(key, None)
+
+    async def revalidate(self, address: Union[int, str], provider: Provider) -> bool:
+        """
+        Resolves the implementation of `address` again,
+        returns True if it changed since it was cached.
+        """
+        if not self._loaded:
+            self.load()
+        client, _ = self._unpack(provider)
+        address = parse_address(address)
+        key = self._key(client, address)
+        resolver = ImplementationResolver(
+            address=address, client=client, proxy_config=self.proxy_config
+        )
+        class_hash = await resolver.resolve_implementation()
+        changed = self.implementations.get(key) != class_hash
+        if changed:
+            logging.info(f"Contract {hex(address)} implementation changed to {hex(class_hash)}")
+            if class_hash not in self.abis:
+                self.abis[class_hash] = await resolver.resolve_class(class_hash)
+            self.implementations[key] = class_hash
+        self.validated_at[key] = time.time()
+        self.save()
+        return changed
+
+
+contract_registry = ContractRegistry(
+    CONTRACT_CACHE_PATH, ttl=float(os.getenv("CONTRACT_CACHE_TTL", "3600"))
+)
+
+
+async def get_contract(address: Union[int, str], provider: Provider) -> Contract:
+    return await contract_registry.contract(address, provider)
@@ -0,0 +1,898 @@
+"""
+Description:
+    Local stand-in for the Paradex REST and websocket APIs, for load
+    and latency testing without testnet.
+"""
+import asyncio
+import base64
+import bisect
+import hashlib
+import hmac
+import itertools
+import logging
+import os
+import random
+import time
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Set, Tuple
+
+import websockets
+from aiohttp import web
+from starknet_py.common import int_from_bytes
+
+from helpers.typed_data import TypedData
+from helpers.utils import verify_message_signature
+from .api_client_utils import (
+    auth_message,
+    get_acc_contract_address_and_call_data,
+    onboarding_message,
+)
+from .codec import dumps, dumps_str, loads
+from .order_signer import OrderSigner
+from .paradex_api import SUBSCRIPTION_CHANNELS
+from .paradex_api_utils import WSSubscription, time_millis
+from .signature_audit import parse_signature, record_fields
+
+# Markets listed when none are given: (tick size, size increment, min notional, mark price)
+DEFAULT_MARKETS: Dict[str, Tuple[str, str, str, str]] = {
+    "BTC-USD-PERP": ("1", "0.001", "100", "30000"),
+    "ETH-USD-PERP": ("0.1", "0.001", "100", "1850"),
+}
+# Channels only pushed to the account they belong to
+PRIVATE_SUBSCRIPTIONS = {
+    WSSubscription.ACCOUNT_SUMMARY,
+    WSSubscription.BALANCES,
+    WSSubscription.FILLS,
+    WSSubscription.ORDERS,
+    WSSubscription.POSITIONS,
+    WSSubscription.TRANSACTIONS,
+}
+TAKER_FEE = Decimal("0.0003")
+MAKER_FEE = Decimal("0")
+MARGIN_FRACTION = Decimal("0.1")
+MAX_PAGE_SIZE = 5000
+
+
+def _error(status: int, error: str, message: str) -> web.Response:
+    return _json({"error": error, "message": message}, status)
+
+
+def _json(data, status: int = 200) -> web.Response:
+    return web.Response(body=dumps(data), status=status, content_type="application/json")
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def normalize_address(address: str) -> str:
+    return hex(int(address, 16))
+
+
+class SimMarket:
+    """
+    Synthetic book of `depth` levels on each side of a random walking mark price.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        tick_size: Decimal,
+        size_increment: Decimal,
+        min_notional: Decimal,
+        mark_price: Decimal,
+    ):
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self.size_increment = size_increment
+        self.min_notional = min_notional
+        self.mark_tick = int(mark_price / tick_size)
+        self.seq_no = 0
+        self.last_updated_at = time_millis()
+        # tick -> size
+        self.bids: Dict[int, Decimal] = {}
+        self.asks: Dict[int, Decimal] = {}
+        # Ascending trade ids and the trades, oldest first
+        self.trade_ids: List[int] = []
+        self.trades: List[Dict] = []
+
+    def price(self, tick: int) -> Decimal:
+        return tick * self.tick_size
+
+    @property
+    def mark_price(self) -> Decimal:
+        return self.price(self.mark_tick)
+
+    def best_bid(self) -> int:
+        return max(self.bids) if self.bids else self.mark_tick - 1
+
+    def best_ask(self) -> int:
+        return min(self.asks) if self.asks else self.mark_tick + 1
+
+    def to_dict(self) -> Dict:
+        base = self.symbol.split("-")[0]
+        return {
+            "symbol": self.symbol,
+            "base_currency": base,
+            "quote_currency": "USD",
+            "settlement_currency": "USDC",
+            "asset_kind": "PERP",
+            "price_tick_size": str(self.tick_size),
+            "order_size_increment": str(self.size_increment),
+            "min_notional": str(self.min_notional),
+            "max_open_orders": 100,
+            "position_limit": "1000000",
+        }
+
+    def levels(self, side: str, book: Dict[int, Decimal]) -> List[Dict]:
+        return [{"side": side, "price": str(self.price(t)), "size": str(s)} for t, s in book.items()]
+
+    def snapshot(self) -> Dict:
+        return {
+            "seq_no": self.seq_no,
+            "market": self.symbol,
+            "last_updated_at": self.last_updated_at,
+            "update_type": "s",
+            "deletes": [],
+            "inserts": self.levels("BUY", self.bids) + self.levels("SELL", self.asks),
+            "updates": [],
+        }
+
+    def step(self, rng: random.Random, depth: int, volatility: float) -> Dict:
+        """
+        Moves the mark price and rebuilds the book, returns the delta.
+        """
+        self.mark_tick = max(depth + 1, self.mark_tick + round(rng.gauss(0, volatility)))
+        delta = {"deletes": [], "inserts": [], "updates": []}
+        for side, book, sign in (("BUY", self.bids, -1), ("SELL", self.asks, 1)):
+            new_book = {
+                self.mark_tick + sign * (i + 1): self.size_increment * rng.randint(100, 10_000)
+                for i in range(depth)
+            }
+            for tick in book.keys() - new_book.keys():
+                delta["deletes"].append({"side": side, "price": str(self.price(tick)), "size": "0"})
+            for tick, size in new_book.items():
+                kind = "updates" if tick in book else "inserts"
+                delta[kind].append({"side": side, "price": str(self.price(tick)), "size": str(size)})
+            book.clear()
+            book.update(new_book)
+        self.seq_no += 1
+        self.last_updated_at = time_millis()
+        return {
+            "seq_no": self.seq_no,
+            "market": self.symbol,
+            "last_updated_at": self.last_updated_at,
+            "update_type": "d",
+            **delta,
+        }
+
+
+class SimAccount:
+    def __init__(self, address: str, public_key: int, balance: Decimal):
+        self.address = address
+        self.public_key = public_key
+        self.balance = balance
+        # market -> (signed size, average entry price)
+        self.positions: Dict[str, Tuple[Decimal, Decimal]] = {}
+        self.transfer_ids: List[int] = []
+        self.transfers: List[Dict] = []
+        self.hasher: Optional[OrderSigner] = None
+
+
+class _Connection:
+    """
+    Websocket client. Messages are delivered in order, each one
+    after the simulated latency.
+    """
+
+    def __init__(self, sim: "ExchangeSimulator", websocket):
+        self.sim = sim
+        self.websocket = websocket
+        self.account: Optional[str] = None
+        self.channels: Set[str] = set()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._last_delivery = 0.0
+        self._sender = asyncio.ensure_future(self._send_loop())
+
+    def push(self, message: str) -> None:
+        now = time.monotonic()
+        self._last_delivery = max(self._last_delivery, now + self.sim.delay())
+        self._queue.put_nowait((self._last_delivery, message))
+
+    def reply(self, msg_id, result=None, error=None) -> None:
+        message = {"jsonrpc": "2.0", "id": msg_id}
+        if error is not None:
+            message["error"] = error
+        else:
+            message["result"] = result if result is not None else {}
+        self.push(dumps_str(message))
+
+    async def _send_loop(self) -> None:
+        try:
+            while True:
+                deliver_at, message = await self._queue.get()
+                wait = deliver_at - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await self.websocket.send(message)
+                self.sim.stats["ws_messages"] += 1
+        except websockets.ConnectionClosed:
+            pass
+
+    def close(self) -> None:
+        self._sender.cancel()
+
+
+class ExchangeSimulator:
+    """
+    In-memory Paradex exchange serving the REST API under `http_url`
+    and the JSON-RPC websocket API at `ws_url`.
+
+    Accounts are onboarded with a signed `/onboarding` request, or
+    registered up front from their public key. `/auth` and order
+    signatures are verified against the registered key, so signing
+    bugs are rejected like on the exchange. JWTs expire after `jwt_ttl`
+    seconds with the exchange's error message.
+
+    Every REST response and websocket message is delayed by `latency`
+    plus a uniform `jitter` seconds, and a REST request other than
+    `/system/config` fails with a 503 with probability `error_rate`.
+
+    Each market has a synthetic book around a random walking mark
+    price, stepped every `tick_interval` seconds. Orders crossing the
+    book fill completely at the best level as takers, resting orders
+    fill as makers once the book moves through their price.
+    """
+
+    def __init__(
+        self,
+        paradex_config: Dict,
+        markets: Optional[Dict[str, Tuple[str, str, str, str]]] = None,
+        host: str = "127.0.0.1",
+        http_port: int = 0,
+        ws_port: int = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        jwt_ttl: int = 300,
+        initial_balance: Decimal = Decimal("100000"),
+        tick_interval: float = 0.1,
+        book_depth: int = 10,
+        volatility: float = 1,
+        trade_rate: float = 0.2,
+        seed: Optional[int] = None,
+    ):
+        self.paradex_config = paradex_config
+        self.chain_id = int_from_bytes(paradex_config["starknet_chain_id"].encode())
+        self._config_etag = '"%s"' % hashlib.sha256(dumps(paradex_config)).hexdigest()[:16]
+        self.host = host
+        self.http_port = http_port
+        self.ws_port = ws_port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.jwt_ttl = jwt_ttl
+        self.initial_balance = initial_balance
+        self.tick_interval = tick_interval
+        self.book_depth = book_depth
+        self.volatility = volatility
+        self.trade_rate = trade_rate
+        self.rng = random.Random(seed)
+        self.markets: Dict[str, SimMarket] = {
+            symbol: SimMarket(symbol, *(Decimal(v) for v in values))
+            for symbol, values in (markets or DEFAULT_MARKETS).items()
+        }
+        self.accounts: Dict[str, SimAccount] = {}
+        self.orders: Dict[str, Dict] = {}
+        self.open_orders: Dict[str, Dict] = {}
+        self.stats: Counter = Counter()
+        self._ids = itertools.count(1)
+        self._jwt_secret = os.urandom(32)
+        self._connections: Set[_Connection] = set()
+        self._subscribers: Dict[str, Set[_Connection]] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._ws_server = None
+        self._ticker: Optional[asyncio.Task] = None
+        for market in self.markets.values():
+            market.step(self.rng, self.book_depth, 0)
+
+    @property
+    def http_url(self) -> str:
+        return f"http://{self.host}:{self.http_port}/v1"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.ws_port}/v1"
+
+    def delay(self) -> float:
+        return self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+
+    # Accounts
+
+    def register(self, public_key: int) -> str:
+        """
+        Onboards the account of `public_key` without a signed request,
+        returns its address.
+        """
+        address = normalize_address(
+            get_acc_contract_address_and_call_data(
+                self.paradex_config["paraclear_account_proxy_hash"],
+                self.paradex_config["paraclear_account_hash"],
+                hex(public_key),
+            )
+        )
+        if address not in self.accounts:
+            account = SimAccount(address, public_key, Decimal(0))
+            self.accounts[address] = account
+            self.deposit(address, self.initial_balance)
+        return address
+
+    def deposit(self, address: str, amount: Decimal) -> None:
+        account = self.accounts[address]
+        account.balance += amount
+        transfer_id = next(self._ids)
+        account.transfer_ids.append(transfer_id)
+        account.transfers.append(
+            {
+                "id": str(transfer_id),
+                "account": address,
+                "kind": "DEPOSIT",
+                "status": "COMPLETED",
+                "token": "USDC",
+                "amount": str(amount),
+                "created_at": time_millis(),
+            }
+        )
+
+    def _verify(self, msg_hash: int, signature: str, public_key: int) -> bool:
+        try:
+            return verify_message_signature(msg_hash, list(parse_signature(signature)), public_key)
+        except (TypeError, ValueError):
+            return False
+
+    def issue_jwt(self, address: str) -> str:
+        now = int(time.time())
+        header = _b64(b'{"alg":"HS256","typ":"JWT"}')
+        payload = _b64(dumps({"sub": address, "iat": now, "exp": now + self.jwt_ttl}))
+        signature = hmac.digest(self._jwt_secret, f"{header}.{payload}".encode(), "sha256")
+        return f"{header}.{payload}.{_b64(signature)}"
+
+    def check_jwt(self, token: str) -> Tuple[Optional[SimAccount], str]:
+        """
+        Returns the account of `token`, or None and the reason it is invalid.
+        """
+        try:
+            header, payload, signature = token.split(".")
+            expected = hmac.digest(self._jwt_secret, f"{header}.{payload}".encode(), "sha256")
+            if not hmac.compare_digest(_unb64(signature), expected):
+                return None, "invalid bearer jwt: signature is invalid"
+            claims = loads(_unb64(payload))
+        except ValueError:
+            return None, "invalid bearer jwt: token is malformed"
+        expired_by = int(time.time()) - claims["exp"]
+        if expired_by >= 0:
+            return None, f"invalid bearer jwt: token is expired by {expired_by}s"
+        account = self.accounts.get(claims["sub"])
+        if account is None:
+            return None, "invalid bearer jwt: account not found"
+        return account, ""
+
+    def _authenticate(self, request: web.Request) -> SimAccount:
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            raise web.HTTPUnauthorized(
+                body=dumps({"error": "UNAUTHORIZED", "message": "missing bearer jwt"}),
+                content_type="application/json",
+            )
+        account, reason = self.check_jwt(authorization[len("Bearer "):])
+        if account is None:
+            raise web.HTTPUnauthorized(
+                body=dumps({"error": "UNAUTHORIZED", "message": reason}),
+                content_type="application/json",
+            )
+        return account
+
+    # REST endpoints
+
+    async def _system_config(self, request: web.Request) -> web.Response:
+        if request.headers.get("If-None-Match") == self._config_etag:
+            return web.Response(status=304, headers={"ETag": self._config_etag})
+        response = _json(self.paradex_config)
+        response.headers["ETag"] = self._config_etag
+        return response
+
+    async def _onboarding(self, request: web.Request) -> web.Response:
+        try:
+            address = normalize_address(request.headers["PARADEX-STARKNET-ACCOUNT"])
+            signature = request.headers["PARADEX-STARKNET-SIGNATURE"]
+            public_key = int((await request.json())["public_key"], 16)
+        except (KeyError, TypeError, ValueError):
+            return _error(400, "BAD_REQUEST", "missing onboarding headers or public_key")
+        if self.register(public_key) != address:
+            return _error(400, "INVALID_PUBLIC_KEY", "public key does not match the account")
+        msg_hash = TypedData.from_dict(onboarding_message(self.chain_id)).message_hash(int(address, 16))
+        if not self._verify(msg_hash, signature, public_key):
+            return _error(400, "INVALID_SIGNATURE", "onboarding signature is invalid")
+        return _json({})
+
+    async def _auth(self, request: web.Request) -> web.Response:
+        try:
+            address = normalize_address(request.headers["PARADEX-STARKNET-ACCOUNT"])
+            signature = request.headers["PARADEX-STARKNET-SIGNATURE"]
+            timestamp = int(request.headers["PARADEX-TIMESTAMP"])
+            expiration = int(request.headers["PARADEX-SIGNATURE-EXPIRATION"])
+        except (KeyError, ValueError):
+            return _error(400, "BAD_REQUEST", "missing auth headers")
+        account = self.accounts.get(address)
+        if account is None:
+            return _error(400, "NOT_ONBOARDED", f"account {address} is not onboarded")
+        if expiration < time.time():
+            return _error(400, "SIGNATURE_EXPIRED", "auth signature is expired")
+        message = auth_message(self.chain_id, timestamp, expiration)
+        msg_hash = TypedData.from_dict(message).message_hash(int(address, 16))
+        if not self._verify(msg_hash, signature, account.public_key):
+            return _error(400, "INVALID_SIGNATURE", "auth signature is invalid")
+        return _json({"jwt_token": self.issue_jwt(address)})
+
+    async def _markets(self, request: web.Request) -> web.Response:
+        market = request.query.get("market")
+        return _json(
+            {
+                "results": [
+                    m.to_dict() for m in self.markets.values() if market is None or m.symbol == market
+                ]
+            }
+        )
+
+    async def _post_order(self, request: web.Request) -> web.Response:
+        account = self._authenticate(request)
+        try:
+            record = loads(await request.read())
+            market = self.markets[record["market"]]
+            size = Decimal(record["size"])
+            price = Decimal(record["price"]) if record["type"] == "LIMIT" else None
+            fields = record_fields(record)
+        except KeyError as e:
+            return _error(400, "BAD_REQUEST", f"missing or unknown {e}")
+        except (TypeError, ValueError, InvalidOperation) as e:
+            return _error(400, "BAD_REQUEST", f"malformed order: {e}")
+        if account.hasher is None:
+            account.hasher = OrderSigner(self.chain_id, account.address)
+        if not self._verify(account.hasher.hash_fields(fields), record.get("signature"), account.public_key):
+            self.stats["rejected_signatures"] += 1
+            return _error(400, "INVALID_ORDER_SIGNATURE", "order signature is invalid")
+        if size <= 0 or size % market.size_increment:
+            return _error(400, "ORDER_SIZE_NOT_MULTIPLE_OF_STEP_SIZE", f"invalid size {size}")
+        if price is not None and (price <= 0 or price % market.tick_size):
+            return _error(400, "PRICE_NOT_MULTIPLE_OF_TICK_SIZE", f"invalid price {price}")
+        reference = price if price is not None else market.mark_price
+        if size * reference < market.min_notional:
+            return _error(400, "ORDER_SIZE_BELOW_MIN_NOTIONAL", f"notional below {market.min_notional}")
+
+        now = time_millis()
+        order = {
+            "id": str(next(self._ids)),
+            "account": account.address,
+            "market": market.symbol,
+            "side": record["side"],
+            "type": record["type"],
+            "size": str(size),
+            "remaining_size": str(size),
+            "price": str(price) if price is not None else "0",
+            "status": "NEW",
+            "cancel_reason": "",
+            "client_id": record.get("client_id", ""),
+            "instruction": record.get("instruction", "GTC"),
+            "signature": record["signature"],
+            "signature_timestamp": record["signature_timestamp"],
+            "created_at": now,
+            "last_updated_at": now,
+        }
+        self.orders[order["id"]] = order
+        self.stats["orders"] += 1
+        response = _json(order, 201)
+        # Acknowledged before the order is opened and matched
+        asyncio.get_running_loop().call_soon(self._open_order, order)
+        return response
+
+    async def _get_orders(self, request: web.Request) -> web.Response:
+        account = self._authenticate(request)
+        market = request.query.get("market")
+        return _json(
+            {
+                "results": [
+                    o
+                    for o in self.open_orders.values()
+                    if o["account"] == account.address and (market is None or o["market"] == market)
+                ]
+            }
+        )
+
+    def _owned_order(self, request: web.Request) -> Tuple[SimAccount, Optional[Dict]]:
+        account = self._authenticate(request)
+        order = self.orders.get(request.match_info["order_id"])
+        if order is None or order["account"] != account.address:
+            return account, None
+        return account, order
+
+    async def _get_order(self, request: web.Request) -> web.Response:
+        _, order = self._owned_order(request)
+        if order is None:
+            return _error(404, "ORDER_ID_NOT_FOUND", "order not found")
+        return _json(order)
+
+    async def _delete_order(self, request: web.Request) -> web.Response:
+        _, order = self._owned_order(request)
+        if order is None:
+            return _error(404, "ORDER_ID_NOT_FOUND", "order not found")
+        if order["status"] == "CLOSED":
+            return _error(404, "ORDER_IS_CLOSED", "order is already closed")
+        self.stats["cancels"] += 1
+        self._close_order(order, "USER_CANCELED")
+        return web.Response(status=204)
+
+    async def _positions(self, request: web.Request) -> web.Response:
+        account = self._authenticate(request)
+        return _json({"results": [self._position(account, m) for m in account.positions]})
+
+    async def _balance(self, request: web.Request) -> web.Response:
+        account = self._authenticate(request)
+        return _json({"results": [self._balance_dict(account)]})
+
+    async def _account(self, request: web.Request) -> web.Response:
+        account = self._authenticate(request)
+        return _json(self._account_summary(account))
+
+    async def _transfers(self, request: web.Request) -> web.Response:
+        account = self._authenticate(request)
+        return self._page(request, account.transfer_ids, account.transfers)
+
+    async def _trades(self, request: web.Request) -> web.Response:
+        market = self.markets.get(request.query.get("market", ""))
+        if market is None:
+            return _error(400, "INVALID_MARKET", "unknown market")
+        return self._page(request, market.trade_ids, market.trades)
+
+    def _page(self, request: web.Request, ids: List[int], items: List[Dict]) -> web.Response:
+        """
+        Newest first pages of `items`, the cursor is the id to continue before.
+        """
+        try:
+            page_size = min(int(request.query.get("page_size", 100)), MAX_PAGE_SIZE)
+            cursor = request.query.get("cursor")
+            end = bisect.bisect_left(ids, int(_unb64(cursor))) if cursor else len(ids)
+        except ValueError:
+            return _error(400, "BAD_REQUEST", "invalid cursor or page_size")
+        start = max(0, end - page_size)
+        page = items[start:end][::-1]
+        next_cursor = _b64(str(ids[start]).encode()) if start > 0 else None
+        return _json({"next": next_cursor, "prev": None, "results": page})
+
+    # Order life cycle
+
+    def _open_order(self, order: Dict) -> None:
+        if order["status"] != "NEW":
+            return
+        market = self.markets[order["market"]]
+        if order["type"] == "MARKET" or self._crosses(market, order):
+            tick = market.best_ask() if order["side"] == "BUY" else market.best_bid()
+            self._fill(order, market.price(tick), "TAKER")
+            return
+        if order["instruction"] == "IOC":
+            self._close_order(order, "IOC_CANCEL")
+            return
+        order["status"] = "OPEN"
+        order["last_updated_at"] = time_millis()
+        self.open_orders[order["id"]] = order
+        self._publish_order(order)
+
+    def _crosses(self, market: SimMarket, order: Dict) -> bool:
+        tick = int(Decimal(order["price"]) / market.tick_size)
+        if order["side"] == "BUY":
+            return tick >= market.best_ask()
+        return tick <= market.best_bid()
+
+    def _close_order(self, order: Dict, reason: str) -> None:
+        order["status"] = "CLOSED"
+        order["cancel_reason"] = reason
+        order["last_updated_at"] = time_millis()
+        self.open_orders.pop(order["id"], None)
+        self._publish_order(order)
+
+    def _fill(self, order: Dict, price: Decimal, liquidity: str) -> None:
+        market = self.markets[order["market"]]
+        account = self.accounts[order["account"]]
+        size = Decimal(order["remaining_size"])
+        fee = size * price * (TAKER_FEE if liquidity == "TAKER" else MAKER_FEE)
+        signed_size = size if order["side"] == "BUY" else -size
+        position, entry = account.positions.get(market.symbol, (Decimal(0), Decimal(0)))
+        new_position = position + signed_size
+        if position == 0 or (position > 0) == (signed_size > 0):
+            entry = (position * entry + signed_size * price) / new_position
+        else:
+            closed = min(abs(position), size)
+            account.balance += closed * (price - entry) * (1 if position > 0 else -1)
+            if new_position and (new_position > 0) != (position > 0):
+                entry = price
+        account.positions[market.symbol] = (new_position, entry if new_position else Decimal(0))
+        account.balance -= fee
+
+        now = time_millis()
+        order["remaining_size"] = "0"
+        order["last_updated_at"] = now
+        self.stats["fills"] += 1
+        fill = {
+            "id": str(next(self._ids)),
+            "market": market.symbol,
+            "side": order["side"],
+            "size": str(size),
+            "price": str(price),
+            "liquidity": liquidity,
+            "order_id": order["id"],
+            "client_id": order["client_id"],
+            "fee": str(fee),
+            "fee_currency": "USDC",
+            "remaining_size": "0",
+            "created_at": now,
+        }
+        self._add_trade(market, order["side"], size, price)
+        self._publish(f"fills.{market.symbol}", fill, account.address)
+        self._close_order(order, "")
+        self._publish("positions", self._position(account, market.symbol), account.address)
+        self._publish("balance_events", self._balance_dict(account), account.address)
+        self._publish("account", self._account_summary(account), account.address)
+
+    def _add_trade(self, market: SimMarket, side: str, size: Decimal, price: Decimal) -> None:
+        trade_id = next(self._ids)
+        trade = {
+            "id": str(trade_id),
+            "market": market.symbol,
+            "side": side,
+            "size": str(size),
+            "price": str(price),
+            "created_at": time_millis(),
+        }
+        market.trade_ids.append(trade_id)
+        market.trades.append(trade)
+        self._publish(f"trades.{market.symbol}", trade)
+
+    def _position(self, account: SimAccount, symbol: str) -> Dict:
+        size, entry = account.positions[symbol]
+        market = self.markets[symbol]
+        return {
+            "market": symbol,
+            "side": "SHORT" if size < 0 else "LONG",
+            "size": str(size),
+            "average_entry_price": str(entry),
+            "unrealized_pnl": str(size * (market.mark_price - entry)),
+            "status": "OPEN" if size else "CLOSED",
+            "last_updated_at": time_millis(),
+        }
+
+    def _balance_dict(self, account: SimAccount) -> Dict:
+        return {"token": "USDC", "size": str(account.balance), "last_updated_at": time_millis()}
+
+    def _account_summary(self, account: SimAccount) -> Dict:
+        unrealized = margin = Decimal(0)
+        for symbol, (size, entry) in account.positions.items():
+            mark = self.markets[symbol].mark_price
+            unrealized += size * (mark - entry)
+            margin += abs(size) * mark * MARGIN_FRACTION
+        total = account.balance + unrealized
+        return {
+            "account": account.address,
+            "account_value": str(total),
+            "total_collateral": str(total),
+            "free_collateral": str(total - margin),
+            "initial_margin_requirement": str(margin),
+            "maintenance_margin_requirement": str(margin / 2),
+            "margin_cushion": str(total - margin / 2),
+            "settlement_asset": "USDC",
+            "status": "ACTIVE",
+            "updated_at": time_millis(),
+        }
+
+    def _publish_order(self, order: Dict) -> None:
+        self._publish(
+            f"orders.{order['market']}",
+            {k: v for k, v in order.items() if k not in ("signature", "signature_timestamp")},
+            order["account"],
+        )
+
+    # Market data
+
+    def step(self) -> None:
+        """
+        Steps every book and fills the resting orders it moved through.
+        """
+        for market in self.markets.values():
+            delta = market.step(self.rng, self.book_depth, self.volatility)
+            self._publish(f"order_book.{market.symbol}.deltas", delta)
+            if self.rng.random() < self.trade_rate:
+                side = self.rng.choice(("BUY", "SELL"))
+                tick = market.best_ask() if side == "BUY" else market.best_bid()
+                self._add_trade(market, side, market.size_increment * self.rng.randint(1, 1000), market.price(tick))
+        for order in list(self.open_orders.values()):
+            market = self.markets[order["market"]]
+            if self._crosses(market, order):
+                self._fill(order, Decimal(order["price"]), "MAKER")
+
+    async def _run_ticker(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            try:
+                self.step()
+            except Exception as e:
+                logging.exception(f"Simulator step failed: {e}")
+
+    # Websocket
+
+    def _subscription(self, channel: str) -> Optional[WSSubscription]:
+        for subscription, template in SUBSCRIPTION_CHANNELS.items():
+            if "{market}" not in template:
+                if channel == template:
+                    return subscription
+                continue
+            prefix, suffix = template.split("{market}")
+            if (
+                channel.startswith(prefix)
+                and channel.endswith(suffix)
+                and channel[len(prefix):len(channel) - len(suffix)] in self.markets
+            ):
+                return subscription
+        return None
+
+    def _publish(self, channel: str, data: Dict, account: Optional[str] = None) -> None:
+        subscribers = self._subscribers.get(channel)
+        if not subscribers:
+            return
+        message = dumps_str(
+            {"jsonrpc": "2.0", "method": "subscription", "params": {"channel": channel, "data": data}}
+        )
+        for connection in subscribers:
+            if account is None or connection.account == account:
+                connection.push(message)
+
+    def broadcast(self, message: str) -> None:
+        """
+        Sends a raw `message` to every open websocket connection.
+        """
+        for connection in self._connections:
+            connection.push(message)
+
+    def _handle_rpc(self, connection: _Connection, message: Dict) -> None:
+        msg_id = message.get("id")
+        method = message.get("method")
+        params = message.get("params") or {}
+        if method == "heartbeat":
+            connection.reply(msg_id)
+        elif method == "auth":
+            account, reason = self.check_jwt(params.get("bearer", ""))
+            if account is None:
+                connection.reply(msg_id, error={"code": 40110, "message": reason})
+                return
+            connection.account = account.address
+            connection.reply(msg_id, {"node_id": "sim"})
+        elif method in ("subscribe", "unsubscribe"):
+            channel = params.get("channel", "")
+            subscription = self._subscription(channel)
+            if subscription is None:
+                connection.reply(msg_id, error={"code": -32602, "message": f"invalid channel {channel}"})
+                return
+            if method == "unsubscribe":
+                connection.channels.discard(channel)
+                self._subscribers.get(channel, set()).discard(connection)
+                connection.reply(msg_id, {"channel": channel})
+                return
+            if subscription in PRIVATE_SUBSCRIPTIONS and connection.account is None:
+                connection.reply(msg_id, error={"code": 40111, "message": "not authenticated"})
+                return
+            connection.channels.add(channel)
+            self._subscribers.setdefault(channel, set()).add(connection)
+            connection.reply(msg_id, {"channel": channel})
+            if subscription == WSSubscription.ORDER_BOOK:
+                market = self.markets[channel.split(".")[1]]
+                connection.push(
+                    dumps_str(
+                        {
+                            "jsonrpc": "2.0",
+                            "method": "subscription",
+                            "params": {"channel": channel, "data": market.snapshot()},
+                        }
+                    )
+                )
+        else:
+            connection.reply(msg_id, error={"code": -32601, "message": f"unknown method {method}"})
+
+    async def _serve_ws(self, websocket, *args) -> None:
+        connection = _Connection(self, websocket)
+        self._connections.add(connection)
+        self.stats["ws_connections"] += 1
+        try:
+            async for raw in websocket:
+                try:
+                    message = loads(raw)
+                except ValueError:
+                    connection.reply(None, error={"code": -32700, "message": "parse error"})
+                    continue
+                self._handle_rpc(connection, message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            connection.close()
+            self._connections.discard(connection)
+            for channel in connection.channels:
+                self._subscribers.get(channel, set()).discard(connection)
+
+    # Life cycle
+
+    def build_app(self) -> web.Application:
+        @web.middleware
+        async def simulate(request: web.Request, handler) -> web.StreamResponse:
+            self.stats["requests"] += 1
+            await asyncio.sleep(self.delay())
+            if (
+                self.error_rate
+                and request.path != "/v1/system/config"
+                and self.rng.random() < self.error_rate
+            ):
+                self.stats["injected_errors"] += 1
+                return _error(503, "SERVICE_UNAVAILABLE", "simulated error")
+            return await handler(request)
+
+        app = web.Application(middlewares=[simulate])
+        routes = [
+            ("GET", "/system/config", self._system_config),
+            ("POST", "/onboarding", self._onboarding),
+            ("POST", "/auth", self._auth),
+            ("GET", "/markets", self._markets),
+            ("POST", "/orders", self._post_order),
+            ("GET", "/orders", self._get_orders),
+            ("GET", "/orders/{order_id}", self._get_order),
+            ("DELETE", "/orders/{order_id}", self._delete_order),
+            ("GET", "/positions", self._positions),
+            ("GET", "/balance", self._balance),
+            ("GET", "/account", self._account),
+            ("GET", "/account/transfers", self._transfers),
+            ("GET", "/trades", self._trades),
+        ]
+        for method, path, handler in routes:
+            app.router.add_route(method, "/v1" + path, handler)
+        return app
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.http_port)
+        await site.start()
+        self.http_port = site._server.sockets[0].getsockname()[1]
+        self._ws_server = await websockets.serve(self._serve_ws, self.host, self.ws_port)
+        self.ws_port = next(iter(self._ws_server.sockets)).getsockname()[1]
+        self._ticker = asyncio.ensure_future(self._run_ticker())
+        logging.info(f"Exchange simulator listening on {self.http_url} and {self.ws_url}")
+
+    async def close(self) -> None:
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        if self._ws_server is not None:
+            self._ws_server.close()
+            await self._ws_server.wait_closed()
+            self._ws_server = None
+        for connection in list(self._connections):
+            connection.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "ExchangeSimulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -0,0 +1,193 @@
+"""
+Description:
+    JWT lifecycle: proactive refresh and retry on expiry.
+"""
+import asyncio
+import base64
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from starknet_py.common import int_from_bytes
+
+from .api_client import api_client, auth_headers, request_jwt_token, starknet_account
+from .api_client_utils import TokenExpired
+from .api_config import ApiConfig
+
+
+def jwt_expiry(token: str) -> int:
+    """
+    Returns the `exp` claim (seconds since epoch) of a JWT, 0 if missing.
+    The token is only decoded, its signature is checked by Paradex.
+    Raises ValueError if it cannot be decoded.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise ValueError("not a JWT")
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    claims = json.loads(base64.urlsafe_b64decode(payload))
+    if not isinstance(claims, dict):
+        raise ValueError("JWT payload is not an object")
+    expiry = claims.get("exp", 0)
+    if isinstance(expiry, bool) or not isinstance(expiry, (int, float)):
+        raise ValueError(f"invalid exp claim {expiry!r}")
+    return int(expiry)
+
+
+class JwtManager:
+    """
+    Keeps `config.paradex_jwt` valid for the lifetime of the process.
+
+    The token is refreshed in the background `refresh_margin` seconds
+    before its expiry, or every `refresh_interval` seconds if it has no
+    `exp` claim. The auth request for the next refresh is signed
+    in an executor ahead of time, so refreshing is a single POST.
+    The new token replaces the old one with a single assignment, requests
+    already in flight keep the token they started with.
+    """
+
+    def __init__(
+        self,
+        config: ApiConfig,
+        refresh_margin: Optional[int] = None,
+        refresh_interval: Optional[int] = None,
+        signature_ttl: Optional[int] = None,
+        retry_delay: float = 1,
+    ):
+        self.config = config
+        self.refresh_margin = config.jwt_refresh_margin if refresh_margin is None else refresh_margin
+        self.refresh_interval = (
+            config.jwt_refresh_interval if refresh_interval is None else refresh_interval
+        )
+        self.signature_ttl = config.jwt_signature_ttl if signature_ttl is None else signature_ttl
+        self.retry_delay = retry_delay
+        self.expires_at = 0
+        self.on_refresh: List[Callable[[str], Awaitable[None]]] = []
+        self._chain = int_from_bytes(config.paradex_config["starknet_chain_id"].encode())
+        self._headers: Optional[Dict] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def token(self) -> str:
+        return self.config.paradex_jwt
+
+    def _expires_at(self, token: str) -> float:
+        try:
+            expires_at = jwt_expiry(token)
+        except ValueError as e:
+            logging.warning(f"Unable to decode JWT: {e}")
+            expires_at = 0
+        if not expires_at:
+            # Refreshed `refresh_interval` seconds from now
+            expires_at = time.time() + self.refresh_interval + self.refresh_margin
+        return expires_at
+
+    def _sign(self) -> Dict:
+        now = int(time.time())
+        return auth_headers(
+            starknet_account(self.config),
+            self.config.paradex_account,
+            self._chain,
+            now,
+            now + self.signature_ttl,
+        )
+
+    async def _presign(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._headers = await loop.run_in_executor(None, self._sign)
+
+    def _signed_headers(self) -> Optional[Dict]:
+        headers = self._headers
+        if headers is None:
+            return None
+        # Unused until at least the next refresh
+        expiration = int(headers["PARADEX-SIGNATURE-EXPIRATION"])
+        if expiration - time.time() < 2 * self.refresh_margin:
+            return None
+        return headers
+
+    async def refresh(self, stale_token: Optional[str] = None) -> str:
+        """
+        Fetches a new token. Callers that saw `stale_token` expire
+        share a single refresh, later callers get the token it fetched.
+        """
+        async with self._lock:
+            if stale_token is not None and self.token != stale_token:
+                return self.token
+            headers = self._signed_headers()
+            if headers is None:
+                await self._presign()
+                headers = self._headers
+            session = api_client(self.config).session()
+            token = await request_jwt_token(self.config.paradex_http_url, headers, session)
+            self.expires_at = self._expires_at(token)
+            self.config.paradex_jwt = token
+            logging.info(f"JWT refreshed, expires at {self.expires_at}")
+        # The token is valid even if a callback fails, e.g. on a closed websocket
+        for callback in self.on_refresh:
+            try:
+                await callback(token)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception(f"JWT refresh callback {callback} failed")
+        return token
+
+    async def start(self) -> str:
+        """
+        Fetches a token if needed and starts refreshing it in the background.
+        """
+        if self.token:
+            self.expires_at = self._expires_at(self.token)
+        if self.expires_at - time.time() <= self.refresh_margin:
+            await self.refresh()
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        return self.token
+
+    async def _run(self) -> None:
+        while True:
+            # At most one refresh per retry_delay, even for tokens shorter lived than the margin
+            await asyncio.sleep(
+                max(self.retry_delay, self.expires_at - self.refresh_margin - time.time())
+            )
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"JWT refresh failed: {e}, retrying in {self.retry_delay}s")
+                await asyncio.sleep(self.retry_delay)
+                continue
+            # Sign the next auth request while the token is fresh
+            try:
+                await self._presign()
+            except Exception as e:
+                logging.warning(f"Unable to presign auth request: {e}")
+
+    async def call(self, fn: Callable[..., Awaitable], *args, **kwargs):
+        """
+        Calls `fn(token, *args, **kwargs)`, refreshing the token
+        and retrying once if it expired.
+        """
+        token = self.token
+        try:
+            return await fn(token, *args, **kwargs)
+        except TokenExpired:
+            token = await self.refresh(stale_token=token)
+            return await fn(token, *args, **kwargs)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def jwt_manager(config: ApiConfig) -> JwtManager:
+    if config.jwt_manager is not None:
+        return config.jwt_manager
+
+    config.jwt_manager = JwtManager(config)
+    return config.jwt_manager
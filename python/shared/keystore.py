@@ -0,0 +1,138 @@
+"""
+Description:
+    Encrypted local cache of derived Paradex accounts.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+from typing import Dict, Optional
+
+from Crypto.Cipher import AES
+from Crypto.Util import Counter
+
+KDF_ITERATIONS = 100_000
+
+# fingerprint -> {account index -> entry}
+Accounts = Dict[str, Dict[str, dict]]
+
+
+def keystore_fingerprint(mnemonic: str, paradex_config: dict) -> str:
+    """
+    Identifies the accounts derived from `mnemonic` for one Paradex environment:
+    the same index maps to another account if any of these inputs change.
+    """
+    seed = "|".join(
+        (
+            " ".join(mnemonic.split()),
+            str(paradex_config["l1_chain_id"]),
+            paradex_config["paraclear_account_proxy_hash"],
+            paradex_config["paraclear_account_hash"],
+        )
+    )
+    return hashlib.sha256(seed.encode()).hexdigest()
+
+
+class Keystore:
+    """
+    JSON file holding derived accounts, encrypted as a whole with AES-128-CTR
+    under a key stretched from `password` with PBKDF2 (keystore v3 layout).
+
+    The key is stretched once when the file is read, so a warm start costs
+    one KDF however many accounts the file holds. An existing file keeps the
+    salt and iteration count it was written with, `iterations` only applies
+    to new files. A file that cannot be decrypted is left untouched and
+    accounts are derived as if it were empty.
+    """
+
+    def __init__(self, path: str, password: str, iterations: int = KDF_ITERATIONS):
+        self.path = path
+        self.password = password.encode()
+        self.iterations = iterations
+        self.accounts: Accounts = {}
+        self.writable = True
+        self._salt = b""
+        self._iterations = 0
+        self._key = b""
+        self.load()
+
+    def _derive_key(self, salt: bytes, iterations: int) -> bytes:
+        if (salt, iterations) != (self._salt, self._iterations) or not self._key:
+            self._key = hashlib.pbkdf2_hmac("sha256", self.password, salt, iterations, dklen=32)
+            self._salt = salt
+            self._iterations = iterations
+        return self._key
+
+    @staticmethod
+    def _cipher(key: bytes, iv: bytes):
+        return AES.new(
+            key[:16], AES.MODE_CTR, counter=Counter.new(128, initial_value=int.from_bytes(iv, "big"))
+        )
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                crypto = json.load(f)["crypto"]
+            params = crypto["kdfparams"]
+            key = self._derive_key(bytes.fromhex(params["salt"]), params["c"])
+            ciphertext = bytes.fromhex(crypto["ciphertext"])
+            mac = hashlib.sha256(key[16:] + ciphertext).hexdigest()
+            if not hmac.compare_digest(mac, crypto["mac"]):
+                raise ValueError("wrong password or corrupted file")
+            iv = bytes.fromhex(crypto["cipherparams"]["iv"])
+            self.accounts = json.loads(self._cipher(key, iv).decrypt(ciphertext))
+        except (OSError, KeyError, ValueError) as e:
+            logging.warning(f"Ignoring keystore {self.path}: {e}")
+            self.writable = False
+            self._key = b""
+
+    def save(self) -> None:
+        if not self.writable:
+            return
+        if not self._key:
+            self._derive_key(secrets.token_bytes(16), self.iterations)
+        iv = secrets.token_bytes(16)
+        ciphertext = self._cipher(self._key, iv).encrypt(json.dumps(self.accounts).encode())
+        keystore = {
+            "version": 3,
+            "crypto": {
+                "cipher": "aes-128-ctr",
+                "cipherparams": {"iv": iv.hex()},
+                "ciphertext": ciphertext.hex(),
+                "kdf": "pbkdf2",
+                "kdfparams": {
+                    "c": self._iterations,
+                    "dklen": 32,
+                    "prf": "hmac-sha256",
+                    "salt": self._salt.hex(),
+                },
+                "mac": hashlib.sha256(self._key[16:] + ciphertext).hexdigest(),
+            },
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(os.open(tmp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600), "w") as f:
+            json.dump(keystore, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, fingerprint: str, index: int) -> Optional[dict]:
+        return self.accounts.get(fingerprint, {}).get(str(index))
+
+    def put(self, fingerprint: str, entries: Dict[int, dict]) -> None:
+        if not entries:
+            return
+        accounts = self.accounts.setdefault(fingerprint, {})
+        accounts.update({str(index): entry for index, entry in entries.items()})
+        self.save()
+
+
+def open_keystore(path: str, password: str) -> Optional[Keystore]:
+    """
+    Returns the keystore at `path`, None if no path or password is configured.
+    """
+    if not path or not password:
+        return None
+    return Keystore(path, password, int(os.getenv("KEYSTORE_KDF_ITERATIONS", str(KDF_ITERATIONS))))
@@ -0,0 +1,208 @@
+"""
+Description:
+    Markets metadata loaded once from /markets, with integer tick and
+    step tables for hot-path rounding and validation.
+"""
+import asyncio
+import logging
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from .api_client import api_client
+from .api_config import ApiConfig
+from .paradex_api_utils import (
+    QUANTUM_DECIMALS,
+    OrderSide,
+    OrderType,
+    shortstring_felt,
+    to_quantums,
+)
+
+QUANTUM = 10**QUANTUM_DECIMALS
+
+
+def from_quantums(quantums: int) -> Decimal:
+    return Decimal(quantums).scaleb(-QUANTUM_DECIMALS)
+
+
+class MarketInfo:
+    """
+    Metadata of one market. Tick size, step size and min notional are kept
+    as integer quantums, the same units as Order.price_quantums and
+    Order.size_quantums, so rounding and validation are integer operations.
+    """
+
+    __slots__ = (
+        "market_id",
+        "symbol",
+        "base_currency",
+        "tick_size",
+        "step_size",
+        "min_notional",
+        "tick_quantums",
+        "step_quantums",
+        "min_notional_quantums",
+        "market_felt",
+        "raw",
+    )
+
+    def __init__(self, market_id: int, market: Dict):
+        self.market_id = market_id
+        self.symbol: str = market["symbol"]
+        self.base_currency: str = market.get("base_currency", "")
+        self.tick_size = Decimal(market["price_tick_size"])
+        self.step_size = Decimal(market["order_size_increment"])
+        self.min_notional = Decimal(market.get("min_notional") or 0)
+        self.tick_quantums = to_quantums(self.tick_size)
+        self.step_quantums = to_quantums(self.step_size)
+        # Compared to price_quantums * size_quantums, which has twice the decimals
+        self.min_notional_quantums = to_quantums(self.min_notional) * QUANTUM
+        self.market_felt = shortstring_felt(self.symbol)
+        self.raw = market
+
+    def __repr__(self):
+        return f"MarketInfo({self.market_id}, {self.symbol}, tick={self.tick_size}, step={self.step_size})"
+
+    def round_price_quantums(self, price_quantums: int, side: Optional[OrderSide] = None) -> int:
+        """
+        Rounds to the tick: down for buys, up for sells, to the nearest without a side.
+        """
+        tick = self.tick_quantums
+        if side == OrderSide.Buy:
+            return price_quantums // tick * tick
+        if side == OrderSide.Sell:
+            return -(-price_quantums // tick) * tick
+        return (price_quantums + tick // 2) // tick * tick
+
+    def round_size_quantums(self, size_quantums: int) -> int:
+        """
+        Rounds down to the step size.
+        """
+        return size_quantums // self.step_quantums * self.step_quantums
+
+    # Results have the exponent of the tick and step sizes, e.g. 1850.3 not 1850.30000000
+
+    def round_price(self, price: Decimal, side: Optional[OrderSide] = None) -> Decimal:
+        return from_quantums(self.round_price_quantums(to_quantums(price), side)).quantize(
+            self.tick_size
+        )
+
+    def round_size(self, size: Decimal) -> Decimal:
+        return from_quantums(self.round_size_quantums(to_quantums(size))).quantize(self.step_size)
+
+    def check(
+        self, price_quantums: int, size_quantums: int, order_type: OrderType = OrderType.Limit
+    ) -> Optional[str]:
+        """
+        Returns why an order would be rejected, None if it is valid.
+        Market orders skip the price checks.
+        """
+        if size_quantums <= 0 or size_quantums % self.step_quantums:
+            return f"{self.symbol} size is not a multiple of {self.step_size}"
+        if order_type == OrderType.Market:
+            return None
+        if price_quantums <= 0 or price_quantums % self.tick_quantums:
+            return f"{self.symbol} price is not a multiple of {self.tick_size}"
+        if price_quantums * size_quantums < self.min_notional_quantums:
+            return f"{self.symbol} notional is below {self.min_notional}"
+        return None
+
+
+class MarketsRegistry:
+    """
+    Markets by symbol and by a compact integer id, loaded from /markets.
+
+    Ids are assigned in the order markets are first seen and are kept
+    across refreshes, so they can index arrays for the lifetime of the
+    process. `refresh_if_stale` reloads the markets once they are older
+    than `ttl` seconds, `start` does it in the background. A refresh
+    swaps in new MarketInfo objects, lookups never see a partial table.
+    """
+
+    def __init__(self, config: ApiConfig, ttl: Optional[float] = None):
+        self.config = config
+        self.ttl = config.markets_ttl if ttl is None else ttl
+        self.loaded_at = 0.0
+        self._by_symbol: Dict[str, MarketInfo] = {}
+        self._by_id: List[MarketInfo] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self, markets: List[Dict]) -> None:
+        by_id = list(self._by_id)
+        by_symbol = dict(self._by_symbol)
+        for market in markets:
+            symbol = market["symbol"]
+            market_id = self._ids.setdefault(symbol, len(self._ids))
+            info = MarketInfo(market_id, market)
+            if market_id == len(by_id):
+                by_id.append(info)
+            else:
+                by_id[market_id] = info
+            by_symbol[symbol] = info
+        self._by_id = by_id
+        self._by_symbol = by_symbol
+        self.loaded_at = time.monotonic()
+
+    async def refresh(self) -> None:
+        markets = await api_client(self.config).get_markets(self.config.paradex_jwt)
+        self.load(markets)
+        logging.info(f"Loaded {len(markets)} markets")
+
+    async def refresh_if_stale(self) -> None:
+        if time.monotonic() - self.loaded_at < self.ttl:
+            return
+        async with self._lock:
+            # Refreshed while waiting for the lock
+            if time.monotonic() - self.loaded_at >= self.ttl:
+                await self.refresh()
+
+    def get(self, symbol: str) -> Optional[MarketInfo]:
+        return self._by_symbol.get(symbol)
+
+    def __getitem__(self, symbol: str) -> MarketInfo:
+        return self._by_symbol[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+    def by_id(self, market_id: int) -> MarketInfo:
+        return self._by_id[market_id]
+
+    def id_of(self, symbol: str) -> int:
+        return self._ids[symbol]
+
+    def symbols(self) -> List[str]:
+        return list(self._by_symbol)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh_if_stale()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Markets refresh failed: {e}")
+            await asyncio.sleep(max(1, self.ttl - (time.monotonic() - self.loaded_at)))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def markets_registry(config: ApiConfig) -> MarketsRegistry:
+    if config.markets_registry is not None:
+        return config.markets_registry
+
+    config.markets_registry = MarketsRegistry(config)
+    return config.markets_registry
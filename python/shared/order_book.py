@@ -0,0 +1,178 @@
+"""
+Description:
+    Incremental order book fed from the ORDER_BOOK websocket channel.
+"""
+import heapq
+import logging
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .codec import OrderBookUpdate
+from .paradex_api_utils import OrderSide
+
+
+class OrderBook:
+    """
+    Order book of a single market kept up to date from snapshots and deltas.
+
+    Price levels are integer ticks in a dict of sizes per side, plus a
+    heap of the ticks with the best level on top (bid ticks are stored
+    negated). A level update is a dict write and at most one heap push,
+    O(log n). Removed levels leave their heap entry behind until it
+    reaches the top, and the heap is rebuilt once stale entries
+    outnumber live ones, so best bid/ask is O(1) amortized.
+
+    Deltas carry a sequence number, a gap marks the book as out of sync,
+    clears it and calls `on_gap(market)` so the caller can resubscribe
+    and get a fresh snapshot. Deltas are ignored until that snapshot.
+    """
+
+    def __init__(
+        self,
+        market: str,
+        tick_size: Decimal,
+        on_gap: Optional[Callable[[str], None]] = None,
+    ):
+        self.market = market
+        self.tick_size = tick_size
+        self.on_gap = on_gap
+        self.seq_no: Optional[int] = None
+        self.synced = False
+        self.last_updated_at = 0
+        self._tick = float(tick_size)
+        # tick -> size
+        self._bids: Dict[int, float] = {}
+        self._asks: Dict[int, float] = {}
+        # negated bid ticks and ask ticks, best level first
+        self._bid_heap: List[int] = []
+        self._ask_heap: List[int] = []
+
+    def clear(self) -> None:
+        self._bids.clear()
+        self._asks.clear()
+        self._bid_heap.clear()
+        self._ask_heap.clear()
+
+    def to_tick(self, price) -> int:
+        return round(float(price) / self._tick)
+
+    def to_price(self, tick) -> Decimal:
+        return tick * self.tick_size
+    def apply(self, update: OrderBookUpdate) -> bool:
+        """
+        Applies an ORDER_BOOK message, returns False if it was not applied.
+        """
+        seq_no = update.seq_no
+        if update.update_type == "s":
+            self.clear()
+            self.synced = True
+        elif not self.synced:
+            return False
+        elif seq_no != self.seq_no + 1:
+            logging.warning(
+                f"{self.market} order book gap: expected {self.seq_no + 1} got {seq_no}"
+            )
+            self.synced = False
+            self.clear()
+            if self.on_gap is not None:
+                self.on_gap(self.market)
+            return False
+
+        self.seq_no = seq_no
+        self.last_updated_at = update.last_updated_at
+        for level in update.deletes:
+            self.set_level(level.side == "BUY", self.to_tick(level.price), 0.0)
+        for levels in (update.inserts, update.updates):
+            for level in levels:
+                self.set_level(level.side == "BUY", self.to_tick(level.price), float(level.size))
+        return True
+
+    def set_level(self, is_bid: bool, tick: int, size: float) -> None:
+        """
+        Sets the size resting at `tick`, a size of 0 removes the level.
+        """
+        if is_bid:
+            levels, heap, key = self._bids, self._bid_heap, -tick
+        else:
+            levels, heap, key = self._asks, self._ask_heap, tick
+        if size > 0:
+            if tick not in levels:
+                heapq.heappush(heap, key)
+            levels[tick] = size
+        elif levels.pop(tick, None) is not None and len(heap) > 2 * len(levels) + 16:
+            heap[:] = [-t for t in levels] if is_bid else list(levels)
+            heapq.heapify(heap)
+
+    @staticmethod
+    def _best_key(levels: Dict[int, float], heap: List[int], sign: int) -> Optional[int]:
+        # Drops the entries of removed levels from the top
+        while heap and sign * heap[0] not in levels:
+            heapq.heappop(heap)
+        return sign * heap[0] if heap else None
+
+    def best_bid_tick(self) -> Optional[int]:
+        return self._best_key(self._bids, self._bid_heap, -1)
+
+    def best_ask_tick(self) -> Optional[int]:
+        return self._best_key(self._asks, self._ask_heap, 1)
+
+    def best_bid(self) -> Optional[Tuple[Decimal, float]]:
+        tick = self.best_bid_tick()
+        if tick is None:
+            return None
+        return self.to_price(tick), self._bids[tick]
+
+    def best_ask(self) -> Optional[Tuple[Decimal, float]]:
+        tick = self.best_ask_tick()
+        if tick is None:
+            return None
+        return self.to_price(tick), self._asks[tick]
+
+    def mid_price(self) -> Optional[Decimal]:
+        bid, ask = self.best_bid_tick(), self.best_ask_tick()
+        if bid is None or ask is None:
+            return None
+        return self.to_price(bid + ask) / 2
+
+    def levels(self, is_bid: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (ticks, sizes) arrays of one side, best level first.
+        """
+        levels = self._bids if is_bid else self._asks
+        ticks = sorted(levels, reverse=is_bid)
+        return (
+            np.array(ticks, dtype=np.int64),
+            np.array([levels[tick] for tick in ticks], dtype=np.float64),
+        )
+
+    def depth(self, is_bid: bool, max_ticks: int) -> float:
+        """
+        Total size resting within `max_ticks` of the best level of one side.
+        """
+        ticks, sizes = self.levels(is_bid)
+        if not len(ticks):
+            return 0.0
+        return float(sizes[np.abs(ticks - ticks[0]) <= max_ticks].sum())
+
+    def vwap(self, side: OrderSide, size: float) -> Optional[Decimal]:
+        """
+        Average price to fill `size` with an order on `side`,
+        None if the side is empty or not deep enough.
+        Raises ValueError if `size` is not positive.
+        """
+        if not size > 0:
+            raise ValueError(f"vwap size must be positive, got {size}")
+        size = float(size)
+        ticks, sizes = self.levels(side == OrderSide.Sell)
+        if not len(ticks):
+            return None
+        cum_sizes = np.cumsum(sizes)
+        n = int(np.searchsorted(cum_sizes, size))
+        if n == len(cum_sizes):
+            return None
+        filled = sizes[: n + 1].copy()
+        filled[n] -= cum_sizes[n] - size
+        # Average in ticks, converted like the other prices
+        return self.to_price(Decimal(repr(float(np.dot(ticks[: n + 1], filled)) / size)))
@@ -0,0 +1,233 @@
+"""
+Description:
+    Outbound quote scheduler coalescing superseded quote updates.
+"""
+import asyncio
+import logging
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+from .paradex_api_utils import Order, OrderSide, OrderStatus, OrderType, ParadexApiInterface
+
+# (market, side, level)
+QuoteKey = Tuple[str, OrderSide, int]
+
+
+class _Slot:
+    __slots__ = (
+        "intent",
+        "has_intent",
+        "queued_at",
+        "updated_at",
+        "last_sent",
+        "live",
+        "cancelling",
+        "busy",
+    )
+
+    def __init__(self):
+        # Latest requested order, None to pull the quote
+        self.intent: Optional[Order] = None
+        self.has_intent = False
+        self.queued_at = 0.0
+        self.updated_at = 0.0
+        self.last_sent = float("-inf")
+        self.live: Optional[Order] = None
+        # Replaced orders whose cancel failed, retried until it succeeds
+        self.cancelling: List[Order] = []
+        self.busy = False
+
+    def pending(self) -> bool:
+        return self.has_intent or bool(self.cancelling)
+
+
+def same_quote(a: Order, b: Order) -> bool:
+    return (
+        a.order_type == b.order_type
+        and a.size == b.size
+        and (a.order_type == OrderType.Market or a.limit_price == b.limit_price)
+    )
+
+
+class OrderScheduler:
+    """
+    Sends quote updates keyed by (market, side, level).
+
+    Only the latest intent per key is kept, the ones it superseded are
+    dropped before being signed. A key is sent at most once every
+    `min_interval` seconds (QUOTE_REFRESH_LOWER_BOUNDARY). An intent is
+    held until its key has had no update for `min_interval` seconds, but
+    no longer than `max_interval` seconds (QUOTE_REFRESH_HIGHER_BOUNDARY)
+    after it was queued. Sending an intent cancels the order resting at
+    its key and submits the replacement, an intent equal to the resting
+    order is dropped. A replaced order whose cancel failed stays in the
+    slot and its cancel is retried every `max_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        api: ParadexApiInterface,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+    ):
+        self.api = api
+        config = api.config
+        self.min_interval = (
+            config.quote_refresh_lower_boundary if min_interval is None else min_interval
+        )
+        self.max_interval = (
+            config.quote_refresh_higher_boundary if max_interval is None else max_interval
+        )
+        self.slots: Dict[QuoteKey, _Slot] = {}
+        self.sent = 0
+        self.coalesced = 0
+        self.unchanged = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Set[asyncio.Task] = set()
+
+    def _slot(self, key: QuoteKey) -> _Slot:
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = _Slot()
+        return slot
+
+    def quote(
+        self,
+        market: str,
+        side: OrderSide,
+        level: int,
+        size: Decimal,
+        price: Optional[Decimal],
+        order_type: OrderType = OrderType.Limit,
+        instruction: str = "GTC",
+        client_id: str = "",
+    ) -> None:
+        """
+        Requests `size` @ `price` to rest at (market, side, level).
+        """
+        self.submit(
+            (market, side, level),
+            Order(
+                market=market,
+                order_type=order_type,
+                order_side=side,
+                size=size,
+                limit_price=price,
+                client_id=client_id,
+                instruction=instruction,
+            ),
+        )
+
+    def pull(self, market: str, side: OrderSide, level: int) -> None:
+        """
+        Requests the order at (market, side, level) to be cancelled.
+        """
+        self.submit((market, side, level), None)
+
+    def submit(self, key: QuoteKey, order: Optional[Order]) -> None:
+        slot = self._slot(key)
+        now = time.monotonic()
+        if slot.has_intent:
+            self.coalesced += 1
+        else:
+            slot.queued_at = now
+        slot.updated_at = now
+        slot.intent = order
+        slot.has_intent = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        self._wakeup.set()
+
+    def live(self, key: QuoteKey) -> Optional[Order]:
+        slot = self.slots.get(key)
+        if slot is None or slot.live is None or slot.live.status == OrderStatus.CLOSED:
+            return None
+        return slot.live
+
+    def _due_at(self, slot: _Slot) -> float:
+        next_send = slot.last_sent + self.min_interval
+        if not slot.has_intent:
+            # Only cancels to retry
+            return max(next_send, slot.last_sent + self.max_interval)
+        settled = min(slot.updated_at + self.min_interval, slot.queued_at + self.max_interval)
+        return max(next_send, settled)
+
+    def _needs_send(self, intent: Optional[Order], live: Optional[Order]) -> bool:
+        if intent is None:
+            # Pull, unless nothing is resting
+            return live is not None
+        if live is None:
+            return True
+        return not same_quote(intent, live)
+
+    async def _flush(self, key: QuoteKey, slot: _Slot) -> None:
+        intent = slot.intent
+        has_intent = slot.has_intent
+        slot.intent = None
+        slot.has_intent = False
+        live = self.live(key)
+        try:
+            send = has_intent and self._needs_send(intent, live)
+            if has_intent and not send:
+                self.unchanged += 1
+            cancels = [order for order in slot.cancelling if order.status != OrderStatus.CLOSED]
+            slot.cancelling = []
+            if send and live is not None:
+                cancels.append(live)
+                slot.live = None
+            submission = intent if send else None
+            if not cancels and submission is None:
+                return
+            slot.last_sent = time.monotonic()
+            self.sent += 1
+            # Cancels drain ahead of submissions, see CancelEngine
+            requests = [self.api.cancel_order_async(order) for order in cancels]
+            if submission is not None:
+                requests.append(self.api.submit_order_async(submission))
+            results = await asyncio.gather(*requests, return_exceptions=True)
+            for order, result in zip(cancels, results):
+                if result is not True:
+                    logging.warning(f"Quote {key} cancel of {order.id} failed: {result!r}")
+                    slot.cancelling.append(order)
+            if submission is not None:
+                response = results[-1]
+                if isinstance(response, Exception):
+                    raise response
+                if isinstance(response, dict) and response.get("status_code") == 201:
+                    slot.live = submission
+        except Exception as e:
+            logging.error(f"Quote {key} submission failed: {e!r}")
+        finally:
+            slot.busy = False
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while any(slot.pending() or slot.busy for slot in self.slots.values()):
+            now = time.monotonic()
+            next_due = float("inf")
+            for key, slot in self.slots.items():
+                if not slot.pending() or slot.busy:
+                    continue
+                due_at = self._due_at(slot)
+                if due_at <= now:
+                    slot.busy = True
+                    task = asyncio.ensure_future(self._flush(key, slot))
+                    self._flushing.add(task)
+                    task.add_done_callback(self._flushing.discard)
+                else:
+                    next_due = min(next_due, due_at)
+            self._wakeup.clear()
+            timeout = None if next_due == float("inf") else max(0, next_due - now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in list(self._flushing):
+            task.cancel()
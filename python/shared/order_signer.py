@@ -0,0 +1,151 @@
+"""
+Description:
+    Precompiled Paradex order signing.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from starknet_py.cairo.felt import encode_shortstring
+
+from helpers.typed_data import TypedData
+from helpers.utils import message_signature, pedersen_hash
+from .api_client_utils import flatten_signature, order_sign_template
+from .paradex_api_utils import Order, OrderType
+
+# Number of elements hashed for the Order struct (type hash + 6 fields)
+ORDER_STRUCT_LENGTH = 7
+# Number of elements hashed for the final message
+# ("StarkNet Message", domain hash, account, order struct hash)
+MESSAGE_LENGTH = 4
+
+OrderFields = Tuple[int, int, int, int, int, int]
+
+
+def order_fields(o: Order) -> OrderFields:
+    """
+    Encodes the six signed Order fields as felts,
+    in the order of the `Order` type definition.
+    """
+    return (
+        int(o.signature_timestamp),
+        o.market_felt,
+        o.side_felt,
+        o.type_felt,
+        o.size_quantums,
+        0 if o.order_type == OrderType.Market else o.price_quantums,
+    )
+
+
+class OrderSigner:
+    """
+    Order signer with the constant part of the typed data message precomputed.
+
+    The order message hash is
+        H(["StarkNet Message", H(domain), account, H([H_type(Order), *fields])])
+    where H is the pedersen hash chain. Only the order fields change between
+    orders, so the partial chains over the leading elements are computed once
+    per (chain id, account address) and each order hashes its 6 fields.
+    Without a private key it only computes message hashes.
+    """
+
+    def __init__(self, chain_id: int, account_address: str, private_key: int = 0):
+        self.chain_id = chain_id
+        self.account_address = account_address
+        self.private_key = private_key
+
+        typed_data = TypedData.from_dict(order_sign_template(chain_id))
+        domain_hash = typed_data.struct_hash("StarkNetDomain", typed_data.domain)
+        self._message_prefix = functools.reduce(
+            pedersen_hash,
+            [encode_shortstring("StarkNet Message"), domain_hash, int(account_address, 16)],
+            0,
+        )
+        self._order_prefix = pedersen_hash(0, typed_data.type_hash("Order"))
+
+    def hash_fields(self, fields: OrderFields) -> int:
+        """
+        Computes the message hash of an order from its encoded fields.
+        """
+        order_hash = pedersen_hash(
+            functools.reduce(pedersen_hash, fields, self._order_prefix), ORDER_STRUCT_LENGTH
+        )
+        return pedersen_hash(pedersen_hash(self._message_prefix, order_hash), MESSAGE_LENGTH)
+
+    def message_hash(self, o: Order) -> int:
+        return self.hash_fields(order_fields(o))
+
+    def sign_fields(self, fields: OrderFields) -> str:
+        r, s = message_signature(msg_hash=self.hash_fields(fields), priv_key=self.private_key)
+        return flatten_signature([r, s])
+
+    def sign(self, o: Order) -> str:
+        return self.sign_fields(order_fields(o))
+
+
+# Signer owned by each OrderSignerPool worker process, see _init_worker
+_worker_signer: Optional[OrderSigner] = None
+
+
+def _init_worker(chain_id: int, account_address: str, private_key: int) -> None:
+    global _worker_signer
+    _worker_signer = OrderSigner(chain_id, account_address, private_key)
+
+
+def _sign_chunk(chunk: List[OrderFields]) -> List[str]:
+    return [_worker_signer.sign_fields(fields) for fields in chunk]
+
+
+class OrderSignerPool:
+    """
+    Signs batches of orders across a pool of worker processes.
+
+    Each worker builds its own OrderSigner once at startup, so only the
+    encoded order fields and the flattened signatures cross process
+    boundaries. Batches smaller than `min_parallel` are signed inline
+    since the IPC round trip would cost more than the signing itself.
+    """
+
+    def __init__(self, signer: OrderSigner, workers: int = 0, min_parallel: int = 8):
+        self.signer = signer
+        self.workers = workers or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(signer.chain_id, signer.account_address, signer.private_key),
+        )
+
+    def _chunks(self, orders: Sequence[Order]) -> List[List[OrderFields]]:
+        fields = [order_fields(o) for o in orders]
+        size = -(-len(fields) // self.workers)
+        return [fields[i : i + size] for i in range(0, len(fields), size)]
+
+    def sign(self, orders: Sequence[Order]) -> List[str]:
+        """
+        Signs orders and returns their flattened signatures in input order.
+        """
+        if len(orders) < self.min_parallel:
+            return [self.signer.sign(o) for o in orders]
+        results = self._executor.map(_sign_chunk, self._chunks(orders))
+        return [sig for chunk in results for sig in chunk]
+
+    async def sign_async(self, orders: Sequence[Order]) -> List[str]:
+        """
+        Same as `sign` without blocking the event loop.
+        """
+        if len(orders) < self.min_parallel:
+            return [self.signer.sign(o) for o in orders]
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(self._executor, _sign_chunk, chunk)
+                for chunk in self._chunks(orders)
+            ]
+        )
+        return [sig for chunk in results for sig in chunk]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,198 @@
+"""
+Description:
+    Open order store with columnar stats.
+"""
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .paradex_api_utils import Order, time_millis
+
+
+class OrderStore:
+    """
+    Live orders indexed by id and client_id, with the fields used for
+    monitoring kept in NumPy columns (one row per order) so that stats
+    over all orders are computed with vectorized operations.
+
+    Rows are kept dense: removing an order moves the last row into its
+    place, so every operation other than stats is O(1).
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.orders: List[Order] = []
+        self.markets: List[str] = []
+        self._market_ids: Dict[str, int] = {}
+        self._rows_by_id: Dict[str, int] = {}
+        self._rows_by_client_id: Dict[str, int] = {}
+        self._created_at = np.empty(capacity, dtype=np.int64)
+        self._remaining = np.empty(capacity, dtype=np.float64)
+        self._price = np.empty(capacity, dtype=np.float64)
+        self._side = np.empty(capacity, dtype=np.int8)
+        self._market = np.empty(capacity, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._rows_by_id
+
+    def market_id(self, market: str) -> int:
+        market_id = self._market_ids.get(market)
+        if market_id is None:
+            market_id = len(self.markets)
+            self._market_ids[market] = market_id
+            self.markets.append(market)
+        return market_id
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._created_at)
+        for name in ("_created_at", "_remaining", "_price", "_side", "_market"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def _index(self, order: Order, row: int) -> None:
+        if order.id:
+            self._rows_by_id[order.id] = row
+        if order.client_id:
+            self._rows_by_client_id[order.client_id] = row
+
+    def _existing_row(self, order: Order) -> Optional[int]:
+        id_row = self._rows_by_id.get(order.id) if order.id else None
+        client_id_row = self._rows_by_client_id.get(order.client_id) if order.client_id else None
+        if id_row is not None and client_id_row is not None and id_row != client_id_row:
+            # Two rows now describe the same order, keep the one found by id
+            self._remove_row(client_id_row)
+            id_row = self._rows_by_id[order.id]
+        return client_id_row if id_row is None else id_row
+
+    def add(self, order: Order) -> None:
+        """
+        Adds an order, or replaces the one with the same id or client_id.
+        """
+        row = self._existing_row(order)
+        if row is None:
+            row = len(self.orders)
+            if row == len(self._created_at):
+                self._grow()
+            self.orders.append(order)
+        else:
+            previous = self.orders[row]
+            if previous.id != order.id:
+                self._rows_by_id.pop(previous.id, None)
+            if previous.client_id != order.client_id:
+                self._rows_by_client_id.pop(previous.client_id, None)
+            self.orders[row] = order
+        self._created_at[row] = order.created_at
+        self._remaining[row] = float(order.remaining)
+        self._price[row] = float(order.limit_price or 0)
+        self._side[row] = order.order_side.sign()
+        self._market[row] = self.market_id(order.market)
+        self._index(order, row)
+
+    def get(self, order_id: str) -> Optional[Order]:
+        row = self._rows_by_id.get(order_id)
+        return None if row is None else self.orders[row]
+
+    def get_by_client_id(self, client_id: str) -> Optional[Order]:
+        row = self._rows_by_client_id.get(client_id)
+        return None if row is None else self.orders[row]
+
+    def set_id(self, client_id: str, order_id: str) -> Optional[Order]:
+        """
+        Records the exchange id of an order added before it was acknowledged.
+        """
+        row = self._rows_by_client_id.get(client_id)
+        if row is None:
+            return None
+        order = self.orders[row]
+        order.id = order_id
+        self._rows_by_id[order_id] = row
+        return order
+
+    def fill(self, order_id: str, size: Decimal) -> Optional[Order]:
+        """
+        Reduces the remaining size of an order, removing it once fully filled.
+        """
+        row = self._rows_by_id.get(order_id)
+        if row is None:
+            return None
+        order = self.orders[row]
+        order.remaining -= size
+        if order.remaining <= 0:
+            self._remove_row(row)
+        else:
+            self._remaining[row] = float(order.remaining)
+        return order
+
+    def remove(self, order_id: str) -> Optional[Order]:
+        row = self._rows_by_id.get(order_id)
+        if row is None:
+            return None
+        order = self.orders[row]
+        self._remove_row(row)
+        return order
+
+    def _remove_row(self, row: int) -> None:
+        order = self.orders[row]
+        self._rows_by_id.pop(order.id, None)
+        self._rows_by_client_id.pop(order.client_id, None)
+        last = len(self.orders) - 1
+        if row != last:
+            moved = self.orders[last]
+            self.orders[row] = moved
+            for column in (self._created_at, self._remaining, self._price, self._side, self._market):
+                column[row] = column[last]
+            self._index(moved, row)
+        self.orders.pop()
+
+    def stats(self, now: Optional[int] = None) -> Dict[str, dict]:
+        """
+        Age and exposure stats of live orders per market,
+        ages in seconds and sizes in base currency.
+        """
+        n = len(self.orders)
+        if n == 0:
+            return {}
+        now = time_millis() if now is None else now
+        n_markets = len(self.markets)
+        ages = (now - self._created_at[:n]) / 1_000
+        market_ids = self._market[:n]
+        side = self._side[:n]
+        remaining = self._remaining[:n]
+        notional = remaining * self._price[:n]
+        is_buy = side == 1
+
+        def by_market(weights: np.ndarray) -> np.ndarray:
+            return np.bincount(market_ids, weights=weights, minlength=n_markets)
+
+        counts = np.bincount(market_ids, minlength=n_markets)
+        age_sums = by_market(ages)
+        buy_size = by_market(np.where(is_buy, remaining, 0))
+        sell_size = by_market(np.where(is_buy, 0, remaining))
+        buy_notional = by_market(np.where(is_buy, notional, 0))
+        sell_notional = by_market(np.where(is_buy, 0, notional))
+
+        # Group rows by market once for the quantiles
+        rows_by_market = np.argsort(market_ids, kind="stable")
+        sorted_ages = np.split(ages[rows_by_market], np.cumsum(counts)[:-1])
+
+        stats = {}
+        for market_id in np.flatnonzero(counts):
+            median_age, p90_age, max_age = np.quantile(sorted_ages[market_id], [0.5, 0.9, 1])
+            stats[self.markets[market_id]] = {
+                'count': int(counts[market_id]),
+                'mean_age': float(age_sums[market_id] / counts[market_id]),
+                'median_age': float(median_age),
+                'p90_age': float(p90_age),
+                'max_age': float(max_age),
+                'buy_size': float(buy_size[market_id]),
+                'sell_size': float(sell_size[market_id]),
+                'net_exposure': float(buy_size[market_id] - sell_size[market_id]),
+                'buy_notional': float(buy_notional[market_id]),
+                'sell_notional': float(sell_notional[market_id]),
+            }
+        return stats
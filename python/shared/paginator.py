@@ -0,0 +1,195 @@
+"""
+Description:
+    Concurrent paginated fetching for Paradex list endpoints.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiohttp
+
+if TYPE_CHECKING:
+    # api_client pages its list endpoints with Paginator
+    from .api_client import ParadexApiClient
+
+# Requests per second allowed per endpoint, overridable per Paginator
+DEFAULT_RATE_LIMITS: Dict[str, float] = {
+    "/account/transfers": 10,
+    "/fills": 10,
+    "/orders": 10,
+    "/orders-history": 10,
+    "/trades": 10,
+}
+DEFAULT_RATE_LIMIT: float = 10
+
+
+class PaginationError(Exception):
+    "Raised when a page cannot be fetched after retries"
+
+    def __init__(self, message: str, status_code: Optional[int] = None, response=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` requests per second with bursts up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or rate
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Paginator:
+    """
+    Walks `next` cursors of list endpoints.
+
+    The request for the next page is in flight while the caller handles
+    the current one. Pages for several markets are fetched concurrently,
+    bounded by `max_concurrency` in-flight requests and a per-endpoint
+    rate limit. 429 and 5xx responses, connection errors and timeouts
+    are retried with full-jitter exponential backoff.
+
+    Paginators given the same `limiters` share the budget of each
+    endpoint, otherwise every Paginator has its own.
+    """
+
+    def __init__(
+        self,
+        client: "ParadexApiClient",
+        paradex_jwt: str,
+        max_concurrency: int = 8,
+        rate_limits: Optional[Dict[str, float]] = None,
+        max_retries: int = 5,
+        backoff_base: float = 0.25,
+        backoff_max: float = 10,
+        page_size: Optional[int] = None,
+        limiters: Optional[Dict[str, RateLimiter]] = None,
+    ):
+        self.client = client
+        self.paradex_jwt = paradex_jwt
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.page_size = page_size
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._limiters: Dict[str, RateLimiter] = {} if limiters is None else limiters
+
+    def _limiter(self, path: str) -> RateLimiter:
+        limiter = self._limiters.get(path)
+        if limiter is None:
+            limiter = RateLimiter(self.rate_limits.get(path, DEFAULT_RATE_LIMIT))
+            self._limiters[path] = limiter
+        return limiter
+
+    async def get_page(self, path: str, params: Dict) -> Dict:
+        limiter = self._limiter(path)
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            try:
+                async with self._semaphore:
+                    status_code, response = await self.client.get(path, self.paradex_jwt, params)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status_code, response = None, repr(e)
+            if status_code == 200:
+                return response
+            retryable = status_code is None or status_code == 429 or status_code >= 500
+            if not retryable or attempt == self.max_retries:
+                break
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+            logging.warning(
+                f"[GET] {path} Status Code: {status_code}, retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+        raise PaginationError(
+            f"Unable to [GET] {path} params:{params}"
+            f" Status Code: {status_code}"
+            f" Response: {response}",
+            status_code,
+            response,
+        )
+
+    async def pages(
+        self, path: str, params: Optional[Dict] = None
+    ) -> AsyncIterator[Tuple[List[Dict], Optional[str]]]:
+        """
+        Yields each page of results with the cursor of the next page.
+        A `cursor` in `params` starts from that page.
+        """
+        params = dict(params or {})
+        if self.page_size is not None:
+            params.setdefault("page_size", self.page_size)
+        pending = asyncio.ensure_future(self.get_page(path, params))
+        try:
+            while pending is not None:
+                response = await pending
+                cursor = response.get("next")
+                pending = None
+                if cursor:
+                    # Prefetch while the caller handles this page
+                    pending = asyncio.ensure_future(
+                        self.get_page(path, {**params, "cursor": cursor})
+                    )
+                yield response["results"], cursor or None
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def results(self, path: str, params: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        async for page, _ in self.pages(path, params):
+            for result in page:
+                yield result
+
+    async def fan_out(
+        self, path: str, markets: List[str], params: Optional[Dict] = None
+    ) -> AsyncIterator[Tuple[str, List[Dict]]]:
+        """
+        Pages through `path` for every market concurrently,
+        yielding (market, page) in arrival order.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * len(markets))
+        done = object()
+
+        async def produce(market: str) -> None:
+            try:
+                async for page, _ in self.pages(path, {**(params or {}), "market": market}):
+                    await queue.put((market, page))
+                await queue.put(done)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await queue.put(e)
+
+        tasks = [asyncio.ensure_future(produce(market)) for market in markets]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
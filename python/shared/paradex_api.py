@@ -0,0 +1,302 @@
+"""
+Description:
+    Paradex websocket engine implementing ParadexApiInterface.
+"""
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import websockets
+
+from .api_client import (
+    api_client,
+    send_auth_id,
+    send_heartbeat_id,
+    sign_order,
+    subscribe_channel_with_id,
+)
+from .api_config import ApiConfig
+from .cancel_engine import cancel_engine
+from .codec import Fill, OrderBookUpdate, OrderUpdate, decode_data, decode_subscription, dumps_str
+from .jwt_manager import jwt_manager
+from .order_book import OrderBook
+from .paradex_api_utils import (
+    DatastoreInterface,
+    Order,
+    OrderAction,
+    OrderSide,
+    OrderStatus,
+    ParadexApiInterface,
+    WSSubscription,
+    time_millis,
+    time_now_milli_secs,
+)
+
+# Channel name for each subscription, `{market}` channels are per market
+SUBSCRIPTION_CHANNELS: Dict[WSSubscription, str] = {
+    WSSubscription.ACCOUNT_SUMMARY: "account",
+    WSSubscription.BALANCES: "balance_events",
+    WSSubscription.FILLS: "fills.{market}",
+    WSSubscription.FUNDING_INDEX: "funding_data.{market}",
+    WSSubscription.MARKETS_SUMMARY: "markets_summary",
+    WSSubscription.ORDERS: "orders.{market}",
+    WSSubscription.ORDER_BOOK: "order_book.{market}.deltas",
+    WSSubscription.POSITIONS: "positions",
+    WSSubscription.TRADES: "trades.{market}",
+    WSSubscription.TRADEBUSTS: "tradebusts",
+    WSSubscription.TRANSACTIONS: "transaction",
+}
+
+# Data of these subscriptions is decoded into typed structs, others into dicts
+SUBSCRIPTION_TYPES: Dict[WSSubscription, type] = {
+    WSSubscription.FILLS: Fill,
+    WSSubscription.ORDERS: OrderUpdate,
+    WSSubscription.ORDER_BOOK: OrderBookUpdate,
+}
+
+# Handlers are called inline from the reader with (channel, data)
+ChannelHandler = Callable[[str, Any], None]
+
+
+class ParadexApi(ParadexApiInterface):
+    """
+    Runs every subscription over a single authenticated websocket.
+
+    Messages are dispatched synchronously to the handler registered for
+    their subscription, so handlers must not block. A message that fails
+    to decode or whose handler raises is logged and skipped. On
+    disconnect, including a failed heartbeat, the connection is
+    re-established with exponential backoff and every channel is
+    subscribed again.
+    """
+
+    @classmethod
+    async def create(cls, datastore: DatastoreInterface, config: ApiConfig, loop):
+        api = cls(datastore, config, loop)
+        tokens = jwt_manager(config)
+        tokens.on_refresh.append(api._on_token_refresh)
+        await tokens.start()
+        return api
+
+    def __init__(
+        self,
+        datastore: DatastoreInterface,
+        config: ApiConfig,
+        loop,
+        reconnect_min_delay: float = 0.5,
+        reconnect_max_delay: float = 30,
+    ):
+        self.datastore = datastore
+        self.config = config
+        self.loop = loop
+        self.reconnect_min_delay = reconnect_min_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.channels: Dict[str, WSSubscription] = {}
+        self.handlers: Dict[WSSubscription, ChannelHandler] = {}
+        self.order_books: Dict[str, OrderBook] = {}
+        self.websocket: Optional[websockets.WebSocketClientProtocol] = None
+        self.connected = asyncio.Event()
+        self._msg_id = 0
+        self._closed = False
+        # Resubscriptions in flight, referenced until they complete
+        self._resyncing: Set[asyncio.Task] = set()
+
+    def _next_id(self) -> int:
+        self._msg_id += 1
+        return self._msg_id
+
+    def add_handler(self, subscription: WSSubscription, handler: ChannelHandler) -> None:
+        self.handlers[subscription] = handler
+
+    def add_order_book(self, order_book: OrderBook) -> None:
+        """
+        Feeds `order_book` from its ORDER_BOOK channel,
+        resubscribing to get a new snapshot on sequence gaps.
+        """
+        channel = SUBSCRIPTION_CHANNELS[WSSubscription.ORDER_BOOK].format(
+            market=order_book.market
+        )
+        order_book.on_gap = lambda market: self._resync(channel)
+        self.order_books[order_book.market] = order_book
+        self.handlers[WSSubscription.ORDER_BOOK] = self._on_order_book
+
+    def _on_order_book(self, channel: str, update: OrderBookUpdate) -> None:
+        order_book = self.order_books.get(update.market)
+        if order_book is not None:
+            order_book.apply(update)
+
+    def init_subscription_channels(self, markets: list):
+        for subscription, channel in SUBSCRIPTION_CHANNELS.items():
+            if "{market}" in channel:
+                for market in markets:
+                    self.channels[channel.format(market=market)] = subscription
+            else:
+                self.channels[channel] = subscription
+
+    async def create_tasks(self, order_creator_cb) -> List[asyncio.Task]:
+        tasks = [self.loop.create_task(self._run())]
+        if order_creator_cb is not None:
+            tasks.append(self.loop.create_task(order_creator_cb(self)))
+        return tasks
+
+    def refresh_state(self, market: str):
+        """
+        Resubscribes the market channels to receive fresh snapshots.
+        """
+        for channel in self.channels:
+            if channel.split(".")[1:2] == [market]:
+                self._resync(channel)
+
+    def _resync(self, channel: str) -> None:
+        task = self.loop.create_task(self.resubscribe(channel))
+        self._resyncing.add(task)
+        task.add_done_callback(self._on_resynced)
+
+    def _on_resynced(self, task: asyncio.Task) -> None:
+        self._resyncing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error(f"Websocket resubscribe failed: {task.exception()!r}")
+
+    def get_time_now_milli_secs(self) -> float:
+        return time_now_milli_secs()
+
+    async def close(self) -> None:
+        self._closed = True
+        for task in list(self._resyncing):
+            task.cancel()
+        if self.config.jwt_manager is not None:
+            await self.config.jwt_manager.close()
+        if self.config.presign_pool is not None:
+            await self.config.presign_pool.close()
+        if self.config.markets_registry is not None:
+            await self.config.markets_registry.close()
+        if self.websocket is not None:
+            await self.websocket.close()
+
+    async def resubscribe(self, channel: str) -> None:
+        websocket = self.websocket
+        if websocket is None:
+            # Channels are subscribed again on reconnect
+            return
+        await websocket.send(
+            dumps_str(
+                {
+                    "id": self._next_id(),
+                    "jsonrpc": "2.0",
+                    "method": "unsubscribe",
+                    "params": {"channel": channel},
+                }
+            )
+        )
+        await subscribe_channel_with_id(websocket, channel, self._next_id())
+
+    async def _run(self) -> None:
+        delay = self.reconnect_min_delay
+        while not self._closed:
+            try:
+                async with websockets.connect(self.config.paradex_ws_url) as websocket:
+                    self.websocket = websocket
+                    await self._on_connect(websocket)
+                    delay = self.reconnect_min_delay
+                    heartbeat = self.loop.create_task(self._heartbeat(websocket))
+                    try:
+                        async for message in websocket:
+                            try:
+                                self._dispatch(message)
+                            except Exception as e:
+                                logging.exception(f"Websocket message dropped: {e!r}")
+                    finally:
+                        heartbeat.cancel()
+            except (websockets.WebSocketException, OSError, asyncio.TimeoutError) as e:
+                logging.warning(f"Websocket disconnected: {e}")
+            finally:
+                self.websocket = None
+                self.connected.clear()
+            if self._closed:
+                break
+            logging.info(f"Reconnecting websocket in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def _on_connect(self, websocket: websockets.WebSocketClientProtocol) -> None:
+        await send_auth_id(websocket, self.config.paradex_jwt, self._next_id())
+        for channel in self.channels:
+            await subscribe_channel_with_id(websocket, channel, self._next_id())
+        logging.info(f"Websocket subscribed to {len(self.channels)} channels")
+        self.connected.set()
+
+    async def _on_token_refresh(self, token: str) -> None:
+        websocket = self.websocket
+        if websocket is not None:
+            await send_auth_id(websocket, token, self._next_id())
+
+    async def _heartbeat(self, websocket: websockets.WebSocketClientProtocol) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.config.ws_heartbeat_period)
+                await send_heartbeat_id(websocket, self._next_id())
+        except websockets.ConnectionClosed:
+            # The reader sees the same close and reconnects
+            pass
+        except Exception as e:
+            # Without heartbeats the server drops the connection, reconnect now
+            logging.error(f"Websocket heartbeat failed, reconnecting: {e!r}")
+            await websocket.close()
+
+    def _dispatch(self, message) -> None:
+        channel, data = decode_subscription(message)
+        if channel is None:
+            # Responses to auth, subscribe and heartbeat requests
+            if "error" in data:
+                logging.error(f"Websocket error response: {data}")
+            return
+        subscription = self.channels.get(channel)
+        handler = self.handlers.get(subscription)
+        if handler is not None:
+            handler(channel, decode_data(data, SUBSCRIPTION_TYPES.get(subscription)))
+
+    async def submit_order_async(self, order: Order):
+        # Pending cancels go first
+        await cancel_engine(self.config).wait_drained()
+        markets = self.config.markets_registry
+        if markets is not None:
+            market = markets.get(order.market)
+            reason = (
+                f"unknown market {order.market}"
+                if market is None
+                else market.check(order.price_quantums, order.size_quantums, order.order_type)
+            )
+            if reason is not None:
+                logging.warning(f"Order {order.client_id} not sent: {reason}")
+                order.status = OrderStatus.CLOSED
+                order.cancel_reason = "INVALID_ORDER"
+                return {"error": "INVALID_ORDER", "message": reason}
+        pool = self.config.presign_pool
+        if not order.signature and (pool is None or not pool.claim(order)):
+            order.signature = sign_order(self.config, order)
+        order.last_action = OrderAction.Send
+        order.last_action_time = time_millis()
+        response = await jwt_manager(self.config).call(
+            api_client(self.config).post_order_payload, order.dump_to_dict()
+        )
+        if response.get("status_code") == 201:
+            order.id = response.get("id", "")
+            order.status = OrderStatus.OPEN
+        return response
+
+    async def cancel_order_async(self, order: Order):
+        failed = await cancel_engine(self.config).cancel([order])
+        return not failed
+
+    async def cancel_orders_async(
+        self,
+        orders: List[Order],
+        market: Optional[str] = None,
+        side: Optional[OrderSide] = None,
+        min_age: Optional[float] = None,
+    ) -> List[Order]:
+        """
+        Cancels the open `orders` matching the filters concurrently,
+        returns the ones that could not be cancelled.
+        """
+        return await cancel_engine(self.config).cancel_matching(orders, market, side, min_age)
@@ -1,8 +1,10 @@
+import functools
 import math
 import statistics
 import time
 from decimal import Decimal
 from enum import Enum
+from typing import Union
 
 
 def time_now_milli_secs() -> float:
@@ -123,7 +125,52 @@ class OrderAction(Enum):
     SendCancel = "SEND_CANCEL"
 
 
+# Prices and sizes are signed as integer quantums with 8 decimals
+QUANTUM_DECIMALS = 8
+
+
+def to_quantums(value: Union[Decimal, int]) -> int:
+    if isinstance(value, int):
+        value = Decimal(value)
+    return int(value.scaleb(QUANTUM_DECIMALS))
+
+
+@functools.lru_cache(maxsize=1024)
+def shortstring_felt(value: str) -> int:
+    """
+    Encodes a short string (at most 31 ascii characters) as a felt.
+    """
+    if len(value) > 31:
+        raise ValueError(f"Shortstring cannot be longer than 31 characters: {value}")
+    return int.from_bytes(value.encode("ascii"), "big")
+
+
 class Order:
+    __slots__ = (
+        "id",
+        "account",
+        "status",
+        "_limit_price",
+        "_size",
+        "market",
+        "remaining",
+        "order_type",
+        "order_side",
+        "client_id",
+        "created_at",
+        "cancel_reason",
+        "last_action",
+        "last_action_time",
+        "cancel_attempts",
+        "signature",
+        "signature_timestamp",
+        "instruction",
+        "_price_quantums",
+        "_size_quantums",
+        "_chain_price",
+        "_chain_size",
+    )
+
     def __init__(
         self,
         market,
@@ -156,6 +203,57 @@ class Order:
         self.signature_timestamp = ts if signature_timestamp is None else signature_timestamp
         self.instruction = instruction
 
+    # Integer quantums and chain strings are computed on first use and
+    # reset when size or limit_price change, so an order can be built
+    # with a size or price that is only set before signing
+    @property
+    def size(self) -> Decimal:
+        return self._size
+
+    @size.setter
+    def size(self, size: Decimal) -> None:
+        self._size = size
+        self._size_quantums = None
+        self._chain_size = None
+
+    @property
+    def limit_price(self) -> Decimal:
+        return self._limit_price
+
+    @limit_price.setter
+    def limit_price(self, limit_price: Decimal) -> None:
+        self._limit_price = limit_price
+        self._price_quantums = None
+        self._chain_price = None
+
+    @property
+    def size_quantums(self) -> int:
+        if self._size_quantums is None:
+            self._size_quantums = to_quantums(self._size)
+        return self._size_quantums
+
+    @property
+    def price_quantums(self) -> int:
+        """
+        Limit price in quantums, 0 without a limit price.
+        """
+        if self._price_quantums is None:
+            price = self._limit_price
+            self._price_quantums = 0 if price is None else to_quantums(price)
+        return self._price_quantums
+
+    @property
+    def market_felt(self) -> int:
+        return shortstring_felt(self.market)
+
+    @property
+    def side_felt(self) -> int:
+        return 1 if self.order_side == OrderSide.Buy else 2
+
+    @property
+    def type_felt(self) -> int:
+        return shortstring_felt(self.order_type.value)
+
     def __repr__(self):
         ord_status = self.status.value
         if self.status == OrderStatus.CLOSED:
@@ -195,24 +293,33 @@ class Order:
     def chain_price(self) -> str:
         if self.order_type == OrderType.Market:
             return "0"
-        return str(int(self.limit_price.scaleb(8)))
+        if self._chain_price is None:
+            self._chain_price = str(self.price_quantums)
+        return self._chain_price
 
     def chain_size(self) -> str:
-        return str(int(self.size.scaleb(8)))
+        if self._chain_size is None:
+            self._chain_size = str(self.size_quantums)
+        return self._chain_size
 
 
 def calc_order_age_stats(orders: list) -> dict:
     age_stats = {}
     if orders:
         now = time_millis()
+        ages = [(now - o.created_at) / 1_000 for o in orders]
+        buy_size = sell_size = 0
+        for o in orders:
+            if o.order_side == OrderSide.Buy:
+                buy_size += o.remaining
+            else:
+                sell_size += o.remaining
         age_stats['count'] = len(orders)
-        age_stats['mean_age'] = sum([(now - o.created_at) / 1_000 for o in orders]) / len(orders)
-        age_stats['median_age'] = statistics.median([(now - o.created_at) / 1_000 for o in orders])
-        age_stats['max_age'] = max([(now - o.created_at) / 1_000 for o in orders])
-        age_stats['buy_size'] = sum([o.remaining for o in orders if o.order_side == OrderSide.Buy])
-        age_stats['sell_size'] = sum(
-            [o.remaining for o in orders if o.order_side == OrderSide.Sell]
-        )
+        age_stats['mean_age'] = sum(ages) / len(orders)
+        age_stats['median_age'] = statistics.median(ages)
+        age_stats['max_age'] = max(ages)
+        age_stats['buy_size'] = buy_size
+        age_stats['sell_size'] = sell_size
     return age_stats
 
 
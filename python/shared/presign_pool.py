@@ -0,0 +1,173 @@
+"""
+Description:
+    Orders signed ahead of time for a quoting grid.
+"""
+import asyncio
+import logging
+from collections import deque
+from decimal import Decimal
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from .api_client import sign_orders_async
+from .api_config import ApiConfig
+from .paradex_api_utils import Order, OrderSide, OrderType, time_millis
+
+# Signed fields besides the timestamp: (market, side, type, size, price)
+SlotKey = Tuple[str, OrderSide, OrderType, Decimal, Optional[Decimal]]
+# (signature timestamp in milliseconds, flattened signature)
+Presigned = Tuple[int, str]
+
+
+def slot_key(o: Order) -> SlotKey:
+    price = o.limit_price if o.order_type == OrderType.Limit else None
+    return (o.market, o.order_side, o.order_type, o.size, price)
+
+
+def grid_prices(mid: Decimal, tick: Decimal, levels: int) -> List[Decimal]:
+    """
+    `levels` prices on each side of `mid`, rounded to `tick`.
+    """
+    center = (mid / tick).to_integral_value() * tick
+    return [center + i * tick for i in range(-levels, levels + 1) if center + i * tick > 0]
+
+
+class PresignPool:
+    """
+    Keeps `depth` signatures ready for every (side, price, size) of the
+    quoting grid of each market.
+
+    The signature covers the timestamp and the market, side, type, size
+    and price of the order but not its client id or instruction, so an
+    order matching a grid slot takes a ready signature in `claim` and is
+    posted without signing. A background task signs every slot whose
+    signatures are missing or older than half of `max_age` over the
+    signing process pool, older ones are never handed out.
+    """
+
+    def __init__(
+        self,
+        config: ApiConfig,
+        max_age: Optional[float] = None,
+        depth: int = 1,
+        refill_interval: float = 1,
+    ):
+        self.config = config
+        self.max_age = config.presign_max_age if max_age is None else max_age
+        self.depth = depth
+        self.refill_interval = refill_interval
+        self.grids: Dict[str, List[SlotKey]] = {}
+        self.signed: Dict[SlotKey, Deque[Presigned]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def set_grid(
+        self,
+        market: str,
+        prices: Sequence[Decimal],
+        sizes: Sequence[Decimal],
+        sides: Sequence[OrderSide] = (OrderSide.Buy, OrderSide.Sell),
+        order_type: OrderType = OrderType.Limit,
+    ) -> None:
+        """
+        Replaces the grid of `market`. Signatures of slots still on the grid are kept.
+        """
+        grid = [
+            (market, side, order_type, size, price if order_type == OrderType.Limit else None)
+            for side in sides
+            for price in prices
+            for size in sizes
+        ]
+        slots = set(grid)
+        for key in self.grids.get(market, []):
+            if key not in slots:
+                self.signed.pop(key, None)
+        self.grids[market] = list(dict.fromkeys(grid))
+        self._wakeup.set()
+
+    def claim(self, order: Order) -> bool:
+        """
+        Sets a ready signature and its timestamp on `order`,
+        returns False if none is ready for its slot.
+        """
+        signed = self.signed.get(slot_key(order))
+        oldest = time_millis() - self.max_age * 1000
+        while signed:
+            signature_timestamp, signature = signed.popleft()
+            if signature_timestamp > oldest:
+                order.signature_timestamp = signature_timestamp
+                order.signature = signature
+                self.hits += 1
+                self._wakeup.set()
+                return True
+        self.misses += 1
+        return False
+
+    async def refill(self) -> int:
+        """
+        Signs the missing and aging signatures of every slot, returns how many.
+        """
+        now = time_millis()
+        fresh_after = now - self.max_age * 500
+        orders: List[Order] = []
+        for grid in self.grids.values():
+            for key in grid:
+                signed = self.signed.setdefault(key, deque())
+                while signed and signed[0][0] <= fresh_after:
+                    signed.popleft()
+                market, side, order_type, size, price = key
+                # Distinct timestamps so each signature is unique
+                for i in range(self.depth - len(signed)):
+                    orders.append(
+                        Order(
+                            market=market,
+                            order_type=order_type,
+                            order_side=side,
+                            size=size,
+                            limit_price=price,
+                            signature_timestamp=now + i,
+                        )
+                    )
+        if not orders:
+            return 0
+        signatures = await sign_orders_async(self.config, orders)
+        for o, signature in zip(orders, signatures):
+            # Slots dropped from the grid while signing are discarded
+            signed = self.signed.get(slot_key(o))
+            if signed is not None:
+                signed.append((o.signature_timestamp, signature))
+        return len(orders)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                signed = await self.refill()
+                if signed:
+                    logging.debug(f"Presigned {signed} orders")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Order presigning failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.refill_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def presign_pool(config: ApiConfig) -> PresignPool:
+    if config.presign_pool is not None:
+        return config.presign_pool
+
+    config.presign_pool = PresignPool(config)
+    return config.presign_pool
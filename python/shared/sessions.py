@@ -0,0 +1,36 @@
+"""
+Description:
+    Closes the HTTP sessions shared across a script run.
+"""
+import functools
+from typing import Awaitable, Callable, TypeVar
+
+from .account_registry import close_account_clients
+from .api_client import close_api_clients
+from .config_store import close_config_stores
+
+T = TypeVar("T")
+
+
+async def close_sessions() -> None:
+    """
+    Closes the config stores, node clients and API clients opened so far.
+    """
+    await close_config_stores()
+    await close_account_clients()
+    await close_api_clients()
+
+
+def closing_sessions(main: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Decorates the `main` of a script to close the shared sessions once it returns or raises.
+    """
+
+    @functools.wraps(main)
+    async def wrapper(*args, **kwargs) -> T:
+        try:
+            return await main(*args, **kwargs)
+        finally:
+            await close_sessions()
+
+    return wrapper
@@ -0,0 +1,196 @@
+"""
+Description:
+    Batch verification of historical order signatures.
+"""
+import functools
+import json
+import os
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from helpers.utils import verify_message_signature
+from .order_signer import OrderFields, OrderSigner
+from .paradex_api_utils import OrderType, shortstring_felt, to_quantums
+
+# (line number, order record) pairs
+Records = List[Tuple[int, dict]]
+
+
+@dataclass
+class Mismatch:
+    line: int
+    client_id: str
+    account: str
+    reason: str
+
+
+@dataclass
+class AuditReport:
+    total: int = 0
+    # public key (hex) -> number of signatures it verified
+    verified: Dict[str, int] = field(default_factory=Counter)
+    mismatches: List[Mismatch] = field(default_factory=list)
+
+    def merge(self, other: "AuditReport") -> None:
+        self.total += other.total
+        self.verified.update(other.verified)
+        self.mismatches.extend(other.mismatches)
+
+    def format(self, max_mismatches: int = 20) -> str:
+        lines = [
+            f"orders: {self.total}",
+            f"verified: {sum(self.verified.values())}",
+            *(f"  {key}: {count}" for key, count in sorted(self.verified.items())),
+            f"mismatches: {len(self.mismatches)}",
+            *(
+                f"  line {m.line} client_id={m.client_id} account={m.account}: {m.reason}"
+                for m in self.mismatches[:max_mismatches]
+            ),
+        ]
+        if len(self.mismatches) > max_mismatches:
+            lines.append(f"  ... {len(self.mismatches) - max_mismatches} more")
+        return "\n".join(lines)
+
+
+def record_fields(record: dict) -> OrderFields:
+    """
+    Encodes the signed fields of an order record, as written by
+    `Order.dump_to_dict`, the same way `order_fields` encodes an Order.
+    """
+    order_type = OrderType(record["type"])
+    return (
+        int(record["signature_timestamp"]),
+        shortstring_felt(record["market"]),
+        1 if record["side"] == "BUY" else 2,
+        shortstring_felt(order_type.value),
+        to_quantums(Decimal(record["size"])),
+        0 if order_type == OrderType.Market else to_quantums(Decimal(record["price"])),
+    )
+
+
+def parse_signature(signature) -> Tuple[int, int]:
+    if isinstance(signature, str):
+        signature = json.loads(signature)
+    r, s = signature
+    return int(r, 0) if isinstance(r, str) else r, int(s, 0) if isinstance(s, str) else s
+
+
+@functools.lru_cache(maxsize=1024)
+def _hasher(chain_id: int, account: str) -> OrderSigner:
+    return OrderSigner(chain_id, account)
+
+
+def verify_records(
+    records: Records, chain_id: int, account: str, public_keys: Sequence[int]
+) -> AuditReport:
+    """
+    Verifies each record against its own `public_key` if present, otherwise
+    against `public_keys` in order. Records may override the signing `account`.
+    """
+    report = AuditReport(total=len(records))
+    for line, record in records:
+        record_account = record.get("account") or account
+        try:
+            msg_hash = _hasher(chain_id, record_account).hash_fields(record_fields(record))
+            signature = list(parse_signature(record["signature"]))
+            public_key = record.get("public_key")
+            candidates = [int(public_key, 16)] if public_key else public_keys
+        except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+            reason = f"malformed record: {type(e).__name__}: {e}"
+            report.mismatches.append(
+                Mismatch(line, str(record.get("client_id", "")), record_account, reason)
+            )
+            continue
+        for public_key in candidates:
+            if verify_message_signature(msg_hash, signature, public_key):
+                report.verified[hex(public_key)] += 1
+                break
+        else:
+            report.mismatches.append(
+                Mismatch(line, str(record.get("client_id", "")), record_account, "invalid signature")
+            )
+    return report
+
+
+def read_records(lines: Iterable[str], chunk_size: int) -> Iterator[Records]:
+    """
+    Parses JSON lines lazily into chunks of (line number, record).
+    """
+    chunk: Records = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = {}
+        chunk.append((line_number, record))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class SignatureAuditor:
+    """
+    Verifies a stream of signed order records across worker processes.
+
+    Records are read and sent to the workers in chunks, with at most
+    two chunks in flight per worker, so memory stays bounded however
+    long the stream is. Each worker reuses the precomputed Order typed
+    data prefix per (chain, account), see OrderSigner.
+    """
+
+    def __init__(
+        self,
+        chain_id: int,
+        account: str,
+        public_keys: Sequence[int],
+        workers: int = 0,
+        chunk_size: int = 2000,
+    ):
+        self.chain_id = chain_id
+        self.account = account
+        self.public_keys = list(public_keys)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def audit(self, lines: Iterable[str]) -> AuditReport:
+        report = AuditReport()
+        chunks = read_records(lines, self.chunk_size)
+        if self.workers == 1:
+            for chunk in chunks:
+                report.merge(verify_records(chunk, self.chain_id, self.account, self.public_keys))
+            return report
+
+        in_flight: "deque[Future]" = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for chunk in chunks:
+                in_flight.append(
+                    executor.submit(
+                        verify_records, chunk, self.chain_id, self.account, self.public_keys
+                    )
+                )
+                if len(in_flight) >= 2 * self.workers:
+                    report.merge(in_flight.popleft().result())
+            while in_flight:
+                report.merge(in_flight.popleft().result())
+        return report
+
+
+def audit_file(
+    path: str,
+    chain_id: int,
+    account: str,
+    public_keys: Sequence[int],
+    workers: int = 0,
+    chunk_size: int = 2000,
+) -> AuditReport:
+    auditor = SignatureAuditor(chain_id, account, public_keys, workers, chunk_size)
+    with open(path) as f:
+        return auditor.audit(f)
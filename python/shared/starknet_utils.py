@@ -1,6 +1,8 @@
 import re
 from enum import Enum
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Union
+
+import aiohttp
 
 from starknet_py.common import int_from_bytes
 from starknet_py.constants import RPC_CONTRACT_ERROR
@@ -8,6 +10,7 @@ from starknet_py.hash.selector import get_selector_from_name
 from starknet_py.net.client import Client
 from starknet_py.net.client_errors import ClientError
 from starknet_py.net.client_models import Call
+from starknet_py.net.full_node_client import FullNodeClient
 from starknet_py.net.models import Address
 from starknet_py.proxy.contract_abi_resolver import ProxyConfig
 from starknet_py.proxy.proxy_check import ArgentProxyCheck, OpenZeppelinProxyCheck, ProxyCheck
@@ -69,3 +72,58 @@ def get_proxy_config():
 def to_uint(a):
     """Takes in value, returns uint256-ish tuple."""
     return (a & ((1 << 128) - 1), a >> 128)
+
+
+async def rpc_batch(
+    client: FullNodeClient,
+    method: str,
+    params: List[Dict],
+    session: Optional[aiohttp.ClientSession] = None,
+) -> List[Union[object, ClientError]]:
+    """
+    Sends one JSON-RPC batch calling `starknet_{method}` once per params,
+    over `session` if given, a one-off session otherwise.
+    Returns the result of each call in order, or the ClientError it failed with.
+    """
+    if not params:
+        return []
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": f"starknet_{method}", "params": p}
+        for i, p in enumerate(params)
+    ]
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(client.url, json=payload) as response:
+                responses = await response.json(content_type=None)
+    else:
+        async with session.post(client.url, json=payload) as response:
+            responses = await response.json(content_type=None)
+    if isinstance(responses, dict):
+        # The whole batch was rejected
+        error = responses.get("error", {})
+        raise ClientError(message=error.get("message", str(responses)), code=error.get("code"))
+    missing = object()
+    results: List[Union[object, ClientError]] = [missing] * len(payload)
+    # Errors the node could not tie to a call, e.g. with a null id
+    unmatched: List[ClientError] = []
+    for response in responses:
+        if not isinstance(response, dict):
+            unmatched.append(ClientError(message=f"Invalid batch response: {response!r}"))
+            continue
+        error = response.get("error")
+        if error is not None:
+            result = ClientError(
+                message=error.get("message", ""), code=error.get("code"), data=error.get("data")
+            )
+        else:
+            result = response.get("result")
+        msg_id = response.get("id")
+        if isinstance(msg_id, int) and 0 <= msg_id < len(results):
+            results[msg_id] = result
+        elif isinstance(result, ClientError):
+            unmatched.append(result)
+        else:
+            unmatched.append(ClientError(message=f"Batch response with unknown id: {response!r}"))
+    # Calls without their own response fail with the first unmatched error
+    no_response = unmatched[0] if unmatched else ClientError(message="No response in batch")
+    return [no_response if result is missing else result for result in results]
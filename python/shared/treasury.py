@@ -0,0 +1,335 @@
+"""
+Description:
+    Concurrent USDC sweeps between Paradex accounts.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import ROUND_DOWN, Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.client import Client
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import Call
+from starknet_py.net.full_node_client import FullNodeClient
+
+from helpers.account import Account
+
+from .account_registry import account_registry
+from .contract_registry import get_contract
+from .starknet_utils import rpc_batch
+
+
+def to_units(amount: Decimal, decimals: int) -> int:
+    # Exact for amounts quantized to at most `decimals` places
+    return int(amount.scaleb(decimals))
+
+
+def from_units(units: int, decimals: int) -> Decimal:
+    return Decimal(units).scaleb(-decimals)
+
+
+@dataclass
+class SweepLeg:
+    """
+    Moves `amount` USDC (all of the Paraclear balance if None)
+    from the Paraclear balance of `source` to that of `destination`.
+    """
+
+    source: Account
+    destination: Account
+    amount: Optional[Decimal] = None
+
+
+@dataclass
+class SweepResult:
+    source: str
+    destination: str
+    amount: Decimal = Decimal(0)
+    transfer_tx: str = ""
+    deposit_tx: str = ""
+    status: str = "PENDING"
+    error: str = ""
+    balances: Dict[str, Decimal] = field(default_factory=dict)
+
+
+class NonceTracker:
+    """
+    Hands out consecutive nonces per account so several transactions
+    of one account can be in flight without waiting for each other.
+    """
+
+    def __init__(self):
+        self._nonces: Dict[int, int] = {}
+        self._locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def lock(self, account: Account) -> asyncio.Lock:
+        return self._locks[account.address]
+
+    async def next(self, account: Account) -> int:
+        nonce = self._nonces.get(account.address)
+        if nonce is None:
+            nonce = await account.get_nonce(block_number="pending")
+        self._nonces[account.address] = nonce + 1
+        return nonce
+
+    def reset(self, account: Account) -> None:
+        # Read from the node again after a rejected transaction
+        self._nonces.pop(account.address, None)
+
+
+async def multicall(client: Client, calls: Sequence[Call]) -> List[List[int]]:
+    """
+    Runs read-only calls in a single JSON-RPC batch request
+    when talking to a node over HTTP, concurrently otherwise.
+    """
+    if not isinstance(client, FullNodeClient):
+        return list(await asyncio.gather(*(client.call_contract(call) for call in calls)))
+    params = [
+        {
+            "request": {
+                "contract_address": hex(call.to_addr),
+                "entry_point_selector": hex(call.selector),
+                "calldata": [hex(value) for value in call.calldata],
+            },
+            "block_id": "pending",
+        }
+        for call in calls
+    ]
+    results = []
+    session = account_registry.session(client.url)
+    for result in await rpc_batch(client, "call", params, session=session):
+        if isinstance(result, ClientError):
+            raise result
+        results.append([int(value, 16) for value in result])
+    return results
+
+
+class TreasurySweep:
+    """
+    Executes a plan of sweep legs across many accounts.
+
+    Every source submits one withdraw + transfer transaction per leg,
+    transactions of the same account are pipelined with locally tracked
+    nonces. Once the transfers are accepted every destination deposits
+    what it received in one transaction. Balances are read with one
+    batched request before and after, and confirmations are awaited
+    together.
+
+    Amounts are Decimals quantized once to the coarser of the Paraclear
+    and USDC precisions, so the withdraw, transfer and deposit of a leg
+    move exactly the same value in each contract's units.
+    """
+
+    def __init__(
+        self, paradex_config: Dict, max_fee: int = int(1e18), check_interval: float = 2
+    ):
+        self.paradex_config = paradex_config
+        self.max_fee = max_fee
+        self.check_interval = check_interval
+        self.paraclear_address = int(paradex_config["paraclear_address"], 16)
+        self.paraclear_decimals = paradex_config["paraclear_decimals"]
+        token = paradex_config["bridged_tokens"][0]
+        self.usdc_address = int(token["l2_token_address"], 16)
+        self.usdc_decimals = token["decimals"]
+        self.quantum = Decimal(1).scaleb(-min(self.paraclear_decimals, self.usdc_decimals))
+        self.nonces = NonceTracker()
+
+    def balance_calls(self, account: Account) -> List[Call]:
+        return [
+            Call(
+                to_addr=self.paraclear_address,
+                selector=get_selector_from_name("getTokenAssetBalance"),
+                calldata=[account.address, self.usdc_address],
+            ),
+            Call(
+                to_addr=self.usdc_address,
+                selector=get_selector_from_name("balanceOf"),
+                calldata=[account.address],
+            ),
+        ]
+
+    def quantize(self, amount: Decimal) -> Decimal:
+        return Decimal(amount).quantize(self.quantum, rounding=ROUND_DOWN)
+
+    def amounts(
+        self, plan: Sequence[SweepLeg], balances: Dict[int, Tuple[Decimal, Decimal]]
+    ) -> List[Decimal]:
+        """
+        Returns the quantized amount of every leg. The Paraclear balance
+        of a source left after its legs with an amount goes to its first
+        leg without one, its other legs without one move nothing.
+        """
+        remaining: Dict[int, Decimal] = {}
+        for leg in plan:
+            if leg.amount is not None:
+                address = leg.source.address
+                remaining[address] = remaining.get(address, balances[address][0]) - leg.amount
+        amounts = []
+        for leg in plan:
+            amount = leg.amount
+            if amount is None:
+                address = leg.source.address
+                amount = max(remaining.get(address, balances[address][0]), Decimal(0))
+                remaining[address] = Decimal(0)
+            amounts.append(self.quantize(amount))
+        return amounts
+
+    async def balances(self, accounts: Sequence[Account]) -> Dict[int, Tuple[Decimal, Decimal]]:
+        """
+        Returns (paraclear, wallet) USDC balances of every account.
+        """
+        accounts = list({account.address: account for account in accounts}.values())
+        if not accounts:
+            return {}
+        calls = [call for account in accounts for call in self.balance_calls(account)]
+        results = await multicall(accounts[0].client, calls)
+        balances = {}
+        for i, account in enumerate(accounts):
+            paraclear, wallet = results[2 * i], results[2 * i + 1]
+            # balanceOf returns a Uint256 as (low, high)
+            wallet_amount = wallet[0] + (wallet[1] << 128 if len(wallet) > 1 else 0)
+            balances[account.address] = (
+                from_units(paraclear[0], self.paraclear_decimals),
+                from_units(wallet_amount, self.usdc_decimals),
+            )
+        return balances
+
+    async def _submit(self, account: Account, calls: List[Call]) -> int:
+        async with self.nonces.lock(account):
+            nonce = await self.nonces.next(account)
+            try:
+                response = await account.execute_v1(
+                    calls=calls, nonce=nonce, max_fee=self.max_fee
+                )
+            except Exception:
+                self.nonces.reset(account)
+                raise
+        return response.transaction_hash
+
+    async def _transfer(self, leg: SweepLeg, result: SweepResult) -> None:
+        paraclear = await get_contract(self.paraclear_address, leg.source)
+        usdc = await get_contract(self.usdc_address, leg.source)
+        calls = [
+            paraclear.functions["withdraw"].prepare_invoke_v1(
+                token_address=self.usdc_address,
+                amount=to_units(result.amount, self.paraclear_decimals),
+            ),
+            usdc.functions["transfer"].prepare_invoke_v1(
+                recipient=leg.destination.address,
+                amount=to_units(result.amount, self.usdc_decimals),
+            ),
+        ]
+        tx_hash = await self._submit(leg.source, calls)
+        result.transfer_tx = hex(tx_hash)
+        result.status = "TRANSFER_SENT"
+        await leg.source.client.wait_for_tx(tx_hash, check_interval=self.check_interval)
+        result.status = "TRANSFERRED"
+
+    async def _deposit(self, destination: Account, results: List[SweepResult]) -> None:
+        amount = sum((result.amount for result in results), Decimal(0))
+        paraclear = await get_contract(self.paraclear_address, destination)
+        usdc = await get_contract(self.usdc_address, destination)
+        calls = [
+            usdc.functions["increaseAllowance"].prepare_invoke_v1(
+                spender=self.paraclear_address,
+                addedValue=to_units(amount, self.usdc_decimals),
+            ),
+            paraclear.functions["deposit"].prepare_invoke_v1(
+                token_address=self.usdc_address,
+                amount=to_units(amount, self.paraclear_decimals),
+            ),
+        ]
+        tx_hash = await self._submit(destination, calls)
+        for result in results:
+            result.deposit_tx = hex(tx_hash)
+            result.status = "DEPOSIT_SENT"
+        await destination.client.wait_for_tx(tx_hash, check_interval=self.check_interval)
+        for result in results:
+            result.status = "DONE"
+
+    async def run(self, plan: Sequence[SweepLeg]) -> List[SweepResult]:
+        accounts = [account for leg in plan for account in (leg.source, leg.destination)]
+        before = await self.balances(accounts)
+
+        results = [
+            SweepResult(
+                source=hex(leg.source.address),
+                destination=hex(leg.destination.address),
+                amount=amount,
+            )
+            for leg, amount in zip(plan, self.amounts(plan, before))
+        ]
+
+        async def settle(coro, result_list: List[SweepResult]) -> None:
+            try:
+                await coro
+            except Exception as e:
+                logging.error(f"Sweep from {result_list[0].source} failed: {e}")
+                for result in result_list:
+                    result.status = "FAILED"
+                    result.error = str(e)
+
+        # Withdraw and transfer out of every source
+        await asyncio.gather(
+            *(
+                settle(self._transfer(leg, result), [result])
+                for leg, result in zip(plan, results)
+                if result.amount > 0
+            )
+        )
+
+        # Deposit into Paraclear once per destination
+        deposits: Dict[int, Tuple[Account, List[SweepResult]]] = {}
+        for leg, result in zip(plan, results):
+            if result.status == "TRANSFERRED":
+                destination = deposits.setdefault(leg.destination.address, (leg.destination, []))
+                destination[1].append(result)
+            elif result.amount <= 0:
+                result.status = "SKIPPED"
+        await asyncio.gather(
+            *(settle(self._deposit(account, legs), legs) for account, legs in deposits.values())
+        )
+
+        after = await self.balances(accounts)
+        for leg, result in zip(plan, results):
+            result.balances = {
+                "source_paraclear": after[leg.source.address][0],
+                "destination_paraclear": after[leg.destination.address][0],
+            }
+        return results
+
+
+def format_results(results: Sequence[SweepResult]) -> str:
+    """
+    Per-account result table.
+    """
+    header = (
+        "source",
+        "destination",
+        "amount",
+        "status",
+        "transfer_tx",
+        "deposit_tx",
+        "source_bal",
+        "dest_bal",
+    )
+    rows = [
+        (
+            result.source,
+            result.destination,
+            f"{result.amount:.6f}",
+            result.status if not result.error else f"{result.status}: {result.error.splitlines()[0]}",
+            result.transfer_tx,
+            result.deposit_tx,
+            f"{result.balances.get('source_paraclear', 0):.6f}",
+            f"{result.balances.get('destination_paraclear', 0):.6f}",
+        )
+        for result in results
+    ]
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    return "\n".join(
+        " | ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in [header, *rows]
+    )
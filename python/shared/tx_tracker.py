@@ -0,0 +1,246 @@
+"""
+Description:
+    Shared tracker awaiting Starknet transaction statuses in batches.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starknet_py.net.client import Client
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import Hash, TransactionExecutionStatus, TransactionStatus
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.transaction_errors import TransactionRejectedError, TransactionRevertedError
+
+from .account_registry import account_registry
+from .starknet_utils import rpc_batch
+
+# Order in which a transaction reaches each status
+STATUS_RANK: Dict[TransactionStatus, int] = {
+    TransactionStatus.RECEIVED: 0,
+    TransactionStatus.ACCEPTED_ON_L2: 1,
+    TransactionStatus.ACCEPTED_ON_L1: 2,
+}
+# RPC error returned for hashes the node has not seen yet
+TXN_HASH_NOT_FOUND = 29
+
+TxStatus = Tuple[TransactionStatus, Optional[TransactionExecutionStatus]]
+
+
+class _Pending:
+    __slots__ = ("target", "meta", "future", "status", "interval", "next_at")
+
+    def __init__(self, target: TransactionStatus, meta: dict, interval: float):
+        self.target = target
+        self.meta = meta
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.status: Optional[TransactionStatus] = None
+        self.interval = interval
+        self.next_at = 0.0
+
+
+class TxTracker:
+    """
+    Awaits transactions until they reach a target finality status.
+
+    One polling task queries the status of every due transaction in a
+    single batched request. A transaction whose status did not change is
+    checked less often, up to `max_interval`, a change resets it to
+    `min_interval`. Tracked hashes with their target and metadata are
+    saved to `path` so a restarted process can `resume` them. A hash is
+    removed from `path` once it settles, or with `forget` when
+    `forget_settled` is False, for work that must follow the target
+    status before the hash can be dropped.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        path: Optional[str] = None,
+        min_interval: float = 2,
+        max_interval: float = 120,
+        backoff: float = 1.5,
+        forget_settled: bool = True,
+    ):
+        self.client = client
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.forget_settled = forget_settled
+        self.pending: Dict[int, _Pending] = {}
+        # Saved to `path`: hash -> (target, meta)
+        self.records: Dict[int, Tuple[TransactionStatus, dict]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def track(
+        self,
+        tx_hash: Hash,
+        target: TransactionStatus = TransactionStatus.ACCEPTED_ON_L1,
+        meta: Optional[dict] = None,
+    ) -> asyncio.Future:
+        """
+        Returns a future resolved with (finality status, execution status)
+        once `tx_hash` reaches `target`. It fails with TransactionRevertedError
+        or TransactionRejectedError if the transaction does not succeed.
+        """
+        tx_hash = int(tx_hash, 16) if isinstance(tx_hash, str) else tx_hash
+        entry = self.pending.get(tx_hash)
+        if entry is None:
+            entry = _Pending(target, meta or {}, self.min_interval)
+            self.pending[tx_hash] = entry
+            self.records[tx_hash] = (target, entry.meta)
+            self.save()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        self._wakeup.set()
+        return entry.future
+
+    def resume(self) -> Dict[int, Tuple[asyncio.Future, dict]]:
+        """
+        Tracks the hashes saved by a previous process,
+        returns their futures along with the metadata they were tracked with.
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            saved = json.load(f)
+        resumed = {}
+        for tx_hash, entry in saved.items():
+            future = self.track(tx_hash, TransactionStatus(entry["target"]), entry.get("meta"))
+            resumed[int(tx_hash, 16)] = (future, entry.get("meta") or {})
+        logging.info(f"Resumed tracking {len(resumed)} transactions")
+        return resumed
+
+    def forget(self, tx_hash: Hash) -> None:
+        """
+        Stops tracking `tx_hash` and removes it from `path`.
+        """
+        tx_hash = int(tx_hash, 16) if isinstance(tx_hash, str) else tx_hash
+        entry = self.pending.pop(tx_hash, None)
+        if entry is not None and not entry.future.done():
+            entry.future.cancel()
+        if self.records.pop(tx_hash, None) is not None:
+            self.save()
+
+    def _settled(self, tx_hash: int) -> None:
+        del self.pending[tx_hash]
+        if self.forget_settled:
+            self.records.pop(tx_hash, None)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        saved = {
+            hex(tx_hash): {"target": target.value, "meta": meta}
+            for tx_hash, (target, meta) in self.records.items()
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(saved, f)
+        os.replace(tmp_path, self.path)
+
+    async def _statuses(self, tx_hashes: List[int]) -> List[Optional[TxStatus]]:
+        if isinstance(self.client, FullNodeClient):
+            results = await rpc_batch(
+                self.client,
+                "getTransactionStatus",
+                [{"transaction_hash": hex(tx_hash)} for tx_hash in tx_hashes],
+                session=account_registry.session(self.client.url),
+            )
+        else:
+            results = await asyncio.gather(
+                *(self.client.get_transaction_status(tx_hash) for tx_hash in tx_hashes),
+                return_exceptions=True,
+            )
+        statuses: List[Optional[TxStatus]] = []
+        for result in results:
+            if isinstance(result, ClientError):
+                if result.code != TXN_HASH_NOT_FOUND:
+                    logging.warning(f"Transaction status error: {result}")
+                statuses.append(None)
+            elif isinstance(result, Exception):
+                raise result
+            elif isinstance(result, dict):
+                execution = result.get("execution_status")
+                statuses.append(
+                    (
+                        TransactionStatus(result["finality_status"]),
+                        TransactionExecutionStatus(execution) if execution else None,
+                    )
+                )
+            else:
+                statuses.append((result.finality_status, result.execution_status))
+        return statuses
+
+    def _update(self, tx_hash: int, entry: _Pending, status: Optional[TxStatus]) -> bool:
+        """
+        Applies a polled status, returns True once the entry is settled.
+        """
+        if entry.future.done():
+            return True
+        now = time.monotonic()
+        finality, execution = status if status is not None else (entry.status, None)
+        if finality == TransactionStatus.REJECTED:
+            entry.future.set_exception(TransactionRejectedError(message=hex(tx_hash)))
+            return True
+        if execution == TransactionExecutionStatus.REVERTED:
+            entry.future.set_exception(TransactionRevertedError(message=hex(tx_hash)))
+            return True
+        if finality is not None and STATUS_RANK[finality] >= STATUS_RANK[entry.target]:
+            entry.future.set_result((finality, execution))
+            return True
+        if finality != entry.status:
+            entry.status = finality
+            entry.interval = self.min_interval
+        else:
+            entry.interval = min(entry.interval * self.backoff, self.max_interval)
+        entry.next_at = now + entry.interval
+        return False
+
+    async def _run(self) -> None:
+        while self.pending:
+            now = time.monotonic()
+            due = [
+                tx_hash
+                for tx_hash, entry in self.pending.items()
+                if entry.next_at <= now and not entry.future.done()
+            ]
+            if due:
+                try:
+                    statuses = await self._statuses(due)
+                except Exception as e:
+                    logging.warning(f"Transaction status poll failed: {e}")
+                    statuses = [None] * len(due)
+                settled = False
+                for tx_hash, status in zip(due, statuses):
+                    entry = self.pending.get(tx_hash)
+                    if entry is not None and self._update(tx_hash, entry, status):
+                        self._settled(tx_hash)
+                        settled = True
+                # Futures cancelled by their waiters stop being tracked
+                for tx_hash in [h for h, e in self.pending.items() if e.future.done()]:
+                    self._settled(tx_hash)
+                    settled = True
+                if settled:
+                    self.save()
+            if not self.pending:
+                break
+            delay = min(entry.next_at for entry in self.pending.values()) - time.monotonic()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(0, delay))
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
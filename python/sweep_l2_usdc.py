@@ -0,0 +1,62 @@
+import asyncio
+import json
+import logging
+import os
+from decimal import Decimal
+
+from shared.config_store import load_paradex_config
+from shared.treasury import SweepLeg, TreasurySweep, format_results
+from shared.sessions import closing_sessions
+from utils import get_account, get_paradex_account_address, get_random_max_fee
+
+paradex_http_url = "https://api.testnet.paradex.trade/v1"
+
+
+def load_plan(paradex_config: dict, plan_file: str) -> list:
+    """
+    Plan file is a JSON list of
+    {"source": <private key hex>, "destination": <private key hex>, "amount": <USDC, optional>}
+    """
+    with open(plan_file) as f:
+        # Exact amounts, 0.29 stays 0.29
+        entries = json.load(f, parse_float=Decimal)
+
+    def account(private_key_hex: str):
+        address = get_paradex_account_address(paradex_config, private_key_hex)
+        return get_account(address, private_key_hex, paradex_config)
+
+    return [
+        SweepLeg(
+            source=account(entry["source"]),
+            destination=account(entry["destination"]),
+            amount=entry.get("amount"),
+        )
+        for entry in entries
+    ]
+
+
+# Sweep USDC on Paraclear between many Paradex accounts
+@closing_sessions
+async def main(plan_file: str) -> None:
+    # Load Paradex config
+    paradex_config = await load_paradex_config(paradex_http_url)
+
+    plan = load_plan(paradex_config, plan_file)
+    logging.info(f"Sweeping {len(plan)} legs")
+
+    sweep = TreasurySweep(paradex_config, max_fee=get_random_max_fee())
+    results = await sweep.run(plan)
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    # Logging
+    logging.basicConfig(
+        level=os.getenv("LOGGING_LEVEL", "INFO"),
+        format="%(asctime)s.%(msecs)03d | %(levelname)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    # Load environment variables
+    plan_file = os.getenv("SWEEP_PLAN_FILE", "sweep_plan.json")
+    asyncio.run(main(plan_file))
@@ -0,0 +1,55 @@
+"""
+Description:
+    Typed websocket message decoding, whichever codec backend is in use.
+
+    Run from python/ with `python -m unittest discover tests`.
+"""
+import unittest
+
+from shared import codec
+from shared.codec import OrderBookUpdate, ValidationError, decode_data, decode_subscription, dumps
+
+
+class CodecTest(unittest.TestCase):
+    def decode(self, data):
+        message = dumps({"method": "subscription", "params": {"channel": "c", "data": data}})
+        channel, raw = decode_subscription(message)
+        self.assertEqual(channel, "c")
+        return decode_data(raw, OrderBookUpdate)
+
+    def test_decodes_struct_with_defaults(self):
+        update = self.decode(
+            {"seq_no": 7, "market": "ETH-USD-PERP", "inserts": [{"side": "BUY", "price": "1", "size": "2"}]}
+        )
+        self.assertEqual(update.seq_no, 7)
+        self.assertEqual(update.update_type, "d")
+        self.assertEqual([(level.side, level.price) for level in update.inserts], [("BUY", "1")])
+        self.assertEqual(update.deletes, [])
+
+    def test_wrong_types_raise(self):
+        for data in [
+            {"seq_no": "7"},
+            {"seq_no": True},
+            {"market": None},
+            {"inserts": {"side": "BUY"}},
+            {"inserts": [["BUY", "1", "2"]]},
+            [1, 2],
+        ]:
+            with self.subTest(data=data):
+                with self.assertRaises(ValidationError):
+                    self.decode(data)
+
+    def test_non_subscription_message(self):
+        channel, message = decode_subscription(dumps({"id": 1, "result": {}}))
+        self.assertIsNone(channel)
+        self.assertEqual(message, {"id": 1, "result": {}})
+
+    def test_backend_names_are_validated(self):
+        with self.assertRaises(ValueError):
+            codec._resolve_backend("simdjson")
+        self.assertEqual(codec._resolve_backend("json"), "json")
+        self.assertIn(codec._resolve_backend(), codec.BACKENDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
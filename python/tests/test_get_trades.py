@@ -0,0 +1,134 @@
+"""
+Description:
+    Resumable trades export against the paginated /trades endpoint of the
+    local exchange simulator.
+
+    Run from python/ with `python -m unittest discover tests`.
+"""
+import csv
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+import get_trades
+from shared.api_client import close_api_clients
+from shared.exchange_sim import ExchangeSimulator
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "paradex_config.json"
+)
+MARKET = "ETH-USD-PERP"
+TRADES = 550
+
+
+class Killed(Exception):
+    pass
+
+
+class ExportTradesTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        with open(FIXTURE) as f:
+            paradex_config = json.load(f)
+        # No ticks, so the simulator adds no trades of its own during the export
+        self.sim = ExchangeSimulator(paradex_config, tick_interval=3600, seed=1)
+        await self.sim.start()
+        market = self.sim.markets[MARKET]
+        for i in range(TRADES):
+            self.sim._add_trade(market, "BUY", Decimal("0.1"), Decimal(1850 + i))
+        self.trade_ids = {trade["id"] for trade in market.trades}
+        self.jwt = self.sim.issue_jwt(self.sim.register(0x1234567))
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.trades_file = os.path.join(self.tmp.name, "Trades_Paradex")
+        self.cursor_file = f"{self.trades_file}.cursor"
+        patcher = mock.patch.multiple(
+            get_trades,
+            trades_file=self.trades_file,
+            cursor_file=self.cursor_file,
+            row_group_size=200,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await close_api_clients()
+        await self.sim.close()
+        self.tmp.cleanup()
+
+    async def export(self) -> int:
+        return await get_trades.export_trades(self.sim.http_url, self.jwt, MARKET)
+
+    async def export_killed_after(self, pages: int) -> None:
+        iter_trade_pages = get_trades.iter_trade_pages
+
+        async def killed_after(*args, **kwargs):
+            count = 0
+            async for page in iter_trade_pages(*args, **kwargs):
+                if count == pages:
+                    raise Killed()
+                count += 1
+                yield page
+
+        with mock.patch.object(get_trades, "iter_trade_pages", killed_after):
+            with self.assertRaises(Killed):
+                await self.export()
+
+    def csv_ids(self):
+        with open(f"{self.trades_file}.csv", newline="") as f:
+            return [row["id"] for row in csv.DictReader(f)]
+
+    def parquet_ids(self):
+        import pyarrow.parquet
+
+        ids = []
+        part = 0
+        while os.path.exists(f"{self.trades_file}.{part}.parquet"):
+            table = pyarrow.parquet.read_table(f"{self.trades_file}.{part}.parquet")
+            self.assertEqual(str(table.schema.field("created_at").type), "int64")
+            self.assertEqual(str(table.schema.field("price").type), "double")
+            ids.extend(table.column("id").to_pylist())
+            part += 1
+        return ids
+
+    def assert_exported_once(self, ids):
+        self.assertEqual(len(ids), TRADES)
+        self.assertEqual(set(ids), self.trade_ids)
+        self.assertFalse(os.path.exists(self.cursor_file))
+
+    async def test_csv_export_resumes_from_cursor(self):
+        with mock.patch.object(get_trades, "trades_format", "csv"):
+            await self.export_killed_after(3)
+            self.assertTrue(os.path.exists(self.cursor_file))
+            self.assertEqual(len(self.csv_ids()), 300)
+            self.assertEqual(await self.export(), TRADES - 300)
+        self.assert_exported_once(self.csv_ids())
+
+    async def test_parquet_export_resumes_from_cursor(self):
+        with mock.patch.object(get_trades, "trades_format", "parquet"):
+            await self.export_killed_after(3)
+            self.assertEqual(len(self.parquet_ids()), 300)
+            self.assertEqual(await self.export(), TRADES - 300)
+        self.assert_exported_once(self.parquet_ids())
+
+    async def test_failed_part_write_keeps_cursor(self):
+        replace = os.replace
+
+        def fail_second_part(src, dst):
+            if dst.endswith(".1.parquet"):
+                raise Killed()
+            replace(src, dst)
+
+        with mock.patch.object(get_trades, "trades_format", "parquet"):
+            with mock.patch.object(get_trades.os, "replace", fail_second_part):
+                with self.assertRaises(Killed):
+                    await self.export()
+            self.assertEqual(len(self.parquet_ids()), 200)
+            self.assertEqual(await self.export(), TRADES - 200)
+        self.assert_exported_once(self.parquet_ids())
+
+
+if __name__ == "__main__":
+    unittest.main()
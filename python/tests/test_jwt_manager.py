@@ -0,0 +1,89 @@
+"""
+Description:
+    JwtManager refresh and JWT decoding.
+
+    Run from python/ with `python -m unittest discover tests`.
+"""
+import asyncio
+import base64
+import json
+import os
+import time
+import unittest
+from unittest import mock
+
+from shared.api_client import close_api_clients, request_jwt_token
+from shared.api_client_utils import AuthError
+from shared.api_config import ApiConfig
+from shared.exchange_sim import ExchangeSimulator
+from shared.jwt_manager import JwtManager, jwt_expiry
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "paradex_config.json"
+)
+
+
+def make_jwt(payload) -> str:
+    encoded = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJIUzI1NiJ9.{encoded}.c2ln"
+
+
+class JwtExpiryTest(unittest.TestCase):
+    def test_exp_claim(self):
+        self.assertEqual(jwt_expiry(make_jwt({"exp": 1700000000})), 1700000000)
+
+    def test_missing_exp_claim(self):
+        self.assertEqual(jwt_expiry(make_jwt({"sub": "0x1"})), 0)
+
+    def test_undecodable_tokens(self):
+        for token in ["", "abc", "a.!!!.c", make_jwt([1, 2]), make_jwt("exp"), make_jwt({"exp": None})]:
+            with self.subTest(token=token):
+                with self.assertRaises(ValueError):
+                    jwt_expiry(token)
+
+
+class JwtManagerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        with open(FIXTURE) as f:
+            paradex_config = json.load(f)
+        self.sim = ExchangeSimulator(paradex_config, tick_interval=3600, seed=1)
+        await self.sim.start()
+        config = ApiConfig()
+        config.paradex_config = paradex_config
+        config.paradex_http_url = self.sim.http_url
+        self.manager = JwtManager(config, retry_delay=0.01)
+        self.manager._headers = {"PARADEX-SIGNATURE-EXPIRATION": str(int(time.time()) + 3600)}
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        await close_api_clients()
+        await self.sim.close()
+
+    async def test_failed_callback_keeps_new_token(self):
+        token = make_jwt({"exp": int(time.time()) + 3600})
+        received = []
+
+        async def closed_websocket(token):
+            raise ConnectionError("websocket closed")
+
+        async def record(token):
+            received.append(token)
+
+        self.manager.on_refresh = [closed_websocket, record]
+        with mock.patch("shared.jwt_manager.request_jwt_token", return_value=token):
+            with self.assertLogs(level="ERROR"):
+                self.assertEqual(await self.manager.refresh(), token)
+        self.assertEqual(self.manager.token, token)
+        self.assertEqual(received, [token])
+
+    async def test_rejected_auth_raises(self):
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(AuthError):
+                await request_jwt_token(self.sim.http_url, {"PARADEX-STARKNET-ACCOUNT": "0x1"})
+            with self.assertRaises(AuthError):
+                await self.manager.refresh()
+        self.assertEqual(self.manager.token, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
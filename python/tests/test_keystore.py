@@ -0,0 +1,60 @@
+"""
+Description:
+    Keystore encryption round trips.
+
+    Run from python/ with `python -m unittest discover tests`.
+"""
+import json
+import os
+import tempfile
+import unittest
+
+from shared.keystore import Keystore
+
+ENTRY = {"l2_address": "0x1", "l2_private_key": "0x2", "l2_public_key": "0x3"}
+
+
+class KeystoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "keystore.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def kdf_iterations(self) -> int:
+        with open(self.path) as f:
+            return json.load(f)["crypto"]["kdfparams"]["c"]
+
+    def test_round_trip(self):
+        Keystore(self.path, "secret", 1000).put("fp", {0: ENTRY})
+        keystore = Keystore(self.path, "secret", 1000)
+        self.assertTrue(keystore.writable)
+        self.assertEqual(keystore.get("fp", 0), ENTRY)
+        self.assertIsNone(keystore.get("fp", 1))
+
+    def test_wrong_password_is_not_overwritten(self):
+        Keystore(self.path, "secret", 1000).put("fp", {0: ENTRY})
+        keystore = Keystore(self.path, "other", 1000)
+        self.assertFalse(keystore.writable)
+        self.assertEqual(keystore.accounts, {})
+        keystore.put("fp", {1: ENTRY})
+        self.assertEqual(Keystore(self.path, "secret", 1000).get("fp", 0), ENTRY)
+
+    def test_changed_iterations_keep_file_readable(self):
+        Keystore(self.path, "secret", 2000).put("fp", {0: ENTRY})
+        Keystore(self.path, "secret", 1000).put("fp", {1: ENTRY})
+        self.assertEqual(self.kdf_iterations(), 2000)
+
+        keystore = Keystore(self.path, "secret", 3000)
+        self.assertTrue(keystore.writable)
+        self.assertEqual(keystore.get("fp", 0), ENTRY)
+        self.assertEqual(keystore.get("fp", 1), ENTRY)
+
+    def test_new_file_uses_configured_iterations(self):
+        Keystore(self.path, "secret", 1500).put("fp", {0: ENTRY})
+        self.assertEqual(self.kdf_iterations(), 1500)
+
+
+if __name__ == "__main__":
+    unittest.main()
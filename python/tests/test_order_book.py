@@ -0,0 +1,132 @@
+"""
+Description:
+    OrderBook snapshots, deltas, sequence gaps and vwap.
+
+    Run from python/ with `python -m unittest discover tests`.
+"""
+import unittest
+from decimal import Decimal
+
+from shared.codec import BookLevel, OrderBookUpdate
+from shared.order_book import OrderBook
+from shared.paradex_api_utils import OrderSide
+
+MARKET = "ETH-USD-PERP"
+
+
+def level(side: str, price: str, size: str) -> BookLevel:
+    return BookLevel(side=side, price=price, size=size)
+
+
+def snapshot(seq_no: int, *levels: BookLevel) -> OrderBookUpdate:
+    return OrderBookUpdate(seq_no=seq_no, market=MARKET, update_type="s", inserts=list(levels))
+
+
+def delta(seq_no: int, inserts=(), updates=(), deletes=()) -> OrderBookUpdate:
+    return OrderBookUpdate(
+        seq_no=seq_no,
+        market=MARKET,
+        update_type="d",
+        inserts=list(inserts),
+        updates=list(updates),
+        deletes=list(deletes),
+    )
+
+
+class OrderBookTest(unittest.TestCase):
+    def setUp(self):
+        self.gaps = []
+        self.book = OrderBook(MARKET, Decimal("0.1"), on_gap=self.gaps.append)
+        self.assertTrue(
+            self.book.apply(
+                snapshot(
+                    10,
+                    level("BUY", "1849.9", "1"),
+                    level("BUY", "1849.5", "2"),
+                    level("SELL", "1850.1", "1.5"),
+                    level("SELL", "1850.4", "3"),
+                )
+            )
+        )
+
+    def test_snapshot(self):
+        self.assertEqual(self.book.best_bid(), (Decimal("1849.9"), 1.0))
+        self.assertEqual(self.book.best_ask(), (Decimal("1850.1"), 1.5))
+        self.assertEqual(self.book.mid_price(), Decimal("1850.0"))
+        self.assertEqual(self.book.seq_no, 10)
+
+    def test_deltas(self):
+        self.assertTrue(
+            self.book.apply(
+                delta(
+                    11,
+                    inserts=[level("BUY", "1850.0", "4")],
+                    updates=[level("SELL", "1850.4", "5")],
+                    deletes=[level("SELL", "1850.1", "0")],
+                )
+            )
+        )
+        self.assertEqual(self.book.best_bid(), (Decimal("1850.0"), 4.0))
+        self.assertEqual(self.book.best_ask(), (Decimal("1850.4"), 5.0))
+        ticks, sizes = self.book.levels(True)
+        self.assertEqual(ticks.tolist(), [18500, 18499, 18495])
+        self.assertEqual(sizes.tolist(), [4.0, 1.0, 2.0])
+
+        # Removing and adding the best level again
+        self.book.apply(delta(12, deletes=[level("BUY", "1850.0", "0")]))
+        self.assertEqual(self.book.best_bid(), (Decimal("1849.9"), 1.0))
+        self.book.apply(delta(13, inserts=[level("BUY", "1850.0", "2")]))
+        self.assertEqual(self.book.best_bid(), (Decimal("1850.0"), 2.0))
+
+    def test_emptied_side(self):
+        self.book.apply(
+            delta(11, deletes=[level("SELL", "1850.1", "0"), level("SELL", "1850.4", "0")])
+        )
+        self.assertIsNone(self.book.best_ask())
+        self.assertIsNone(self.book.mid_price())
+        self.assertEqual(self.book.depth(False, 10), 0.0)
+
+    def test_many_updates_keep_best_levels(self):
+        for i in range(500):
+            tick = 18400 + i % 50
+            size = "0" if i % 3 else "1"
+            self.book.apply(delta(11 + i, updates=[level("BUY", str(tick / 10), size)]))
+        ticks, _ = self.book.levels(True)
+        self.assertEqual(self.book.best_bid_tick(), ticks[0])
+        self.assertLessEqual(len(self.book._bid_heap), 2 * len(self.book._bids) + 16)
+
+    def test_gap_clears_book_until_snapshot(self):
+        with self.assertLogs(level="WARNING"):
+            self.assertFalse(self.book.apply(delta(12, inserts=[level("BUY", "1849.8", "1")])))
+        self.assertEqual(self.gaps, [MARKET])
+        self.assertFalse(self.book.synced)
+        self.assertIsNone(self.book.best_bid())
+
+        self.assertFalse(self.book.apply(delta(13, inserts=[level("BUY", "1849.8", "1")])))
+        self.assertIsNone(self.book.best_bid())
+        self.assertEqual(self.gaps, [MARKET])
+
+        self.assertTrue(self.book.apply(snapshot(20, level("BUY", "1849.0", "1"))))
+        self.assertTrue(self.book.apply(delta(21, inserts=[level("BUY", "1849.1", "1")])))
+        self.assertEqual(self.book.best_bid(), (Decimal("1849.1"), 1.0))
+
+    def test_vwap(self):
+        self.assertEqual(self.book.vwap(OrderSide.Buy, 1), Decimal("1850.1"))
+        # 1.5 at 1850.1 and 1.5 at 1850.4
+        self.assertEqual(self.book.vwap(OrderSide.Buy, 3), Decimal("1850.25"))
+        self.assertEqual(self.book.vwap(OrderSide.Sell, 2), Decimal("1849.7"))
+        self.assertIsInstance(self.book.vwap(OrderSide.Sell, 1), Decimal)
+
+    def test_vwap_edge_cases(self):
+        # Exactly the whole side
+        self.assertEqual(self.book.vwap(OrderSide.Buy, 4.5), Decimal("1850.3"))
+        self.assertIsNone(self.book.vwap(OrderSide.Buy, 4.6))
+        for size in (0, -1):
+            with self.assertRaises(ValueError):
+                self.book.vwap(OrderSide.Buy, size)
+        self.book.apply(delta(11, deletes=[level("BUY", "1849.9", "0"), level("BUY", "1849.5", "0")]))
+        self.assertIsNone(self.book.vwap(OrderSide.Sell, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
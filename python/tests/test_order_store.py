@@ -0,0 +1,81 @@
+"""
+Description:
+    OrderStore indexing and per-market stats.
+
+    Run from python/ with `python -m unittest discover tests`.
+"""
+import unittest
+from decimal import Decimal
+
+from shared.order_store import OrderStore
+from shared.paradex_api_utils import Order, OrderSide, OrderType
+
+
+def order(client_id: str, side: OrderSide, size: str, price: str, market: str = "ETH-USD-PERP") -> Order:
+    o = Order(market, OrderType.Limit, side, Decimal(size), Decimal(price), client_id)
+    o.created_at = 1_000
+    return o
+
+
+class OrderStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = OrderStore(capacity=2)
+
+    def test_stats_per_market(self):
+        self.store.add(order("a", OrderSide.Buy, "1", "100"))
+        self.store.add(order("b", OrderSide.Sell, "2", "110"))
+        self.store.add(order("c", OrderSide.Buy, "3", "10", market="BTC-USD-PERP"))
+        stats = self.store.stats(now=3_000)
+        self.assertEqual(stats["ETH-USD-PERP"]["count"], 2)
+        self.assertEqual(stats["ETH-USD-PERP"]["net_exposure"], -1.0)
+        self.assertEqual(stats["ETH-USD-PERP"]["sell_notional"], 220.0)
+        self.assertEqual(stats["BTC-USD-PERP"]["buy_size"], 3.0)
+        self.assertEqual(stats["BTC-USD-PERP"]["max_age"], 2.0)
+
+    def test_re_adding_an_order_replaces_its_row(self):
+        self.store.add(order("a", OrderSide.Buy, "1", "100"))
+        self.store.set_id("a", "1")
+        self.store.add(order("b", OrderSide.Sell, "1", "100"))
+
+        acked = order("a", OrderSide.Buy, "1", "101")
+        acked.id = "1"
+        self.store.add(acked)
+        self.assertEqual(len(self.store), 2)
+        self.assertIs(self.store.get("1"), acked)
+        self.assertIs(self.store.get_by_client_id("a"), acked)
+        self.assertEqual(self.store.stats(now=1_000)["ETH-USD-PERP"]["buy_notional"], 101.0)
+
+        # Same client_id without an id yet
+        self.store.add(order("b", OrderSide.Sell, "2", "100"))
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.stats(now=1_000)["ETH-USD-PERP"]["sell_size"], 2.0)
+
+    def test_rows_found_by_id_and_client_id_are_merged(self):
+        first = order("a", OrderSide.Buy, "1", "100")
+        first.id = "1"
+        self.store.add(first)
+        self.store.add(order("b", OrderSide.Buy, "1", "100"))
+        merged = order("b", OrderSide.Buy, "5", "100")
+        merged.id = "1"
+        self.store.add(merged)
+        self.assertEqual(len(self.store), 1)
+        self.assertIs(self.store.get("1"), merged)
+        self.assertIs(self.store.get_by_client_id("b"), merged)
+        self.assertIsNone(self.store.get_by_client_id("a"))
+        self.assertEqual(self.store.stats(now=1_000)["ETH-USD-PERP"]["buy_size"], 5.0)
+
+    def test_fill_and_remove(self):
+        self.store.add(order("a", OrderSide.Buy, "1", "100"))
+        self.store.add(order("b", OrderSide.Buy, "1", "100"))
+        self.store.set_id("a", "1")
+        self.store.set_id("b", "2")
+        self.store.fill("1", Decimal("0.4"))
+        self.assertEqual(self.store.stats(now=1_000)["ETH-USD-PERP"]["buy_size"], 1.6)
+        self.store.fill("1", Decimal("0.6"))
+        self.assertNotIn("1", self.store)
+        self.assertEqual(self.store.remove("2").client_id, "b")
+        self.assertEqual(self.store.stats(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Description:
+    ParadexApi websocket engine against the local exchange simulator.
+
+    Run from python/ with `python -m unittest discover tests`.
+"""
+import asyncio
+import json
+import os
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from shared.api_config import ApiConfig
+from shared.codec import OrderBookUpdate
+from shared.exchange_sim import ExchangeSimulator
+from shared.order_book import OrderBook
+from shared.paradex_api import ParadexApi
+from shared.paradex_api_utils import WSSubscription
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "paradex_config.json"
+)
+CHANNEL = "order_book.ETH-USD-PERP.deltas"
+
+
+async def wait_until(predicate, timeout: float = 5) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        await asyncio.sleep(0.01)
+
+
+class ParadexApiWebsocketTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        with open(FIXTURE) as f:
+            paradex_config = json.load(f)
+        self.sim = ExchangeSimulator(paradex_config, tick_interval=0.01, seed=1)
+        await self.sim.start()
+
+        config = ApiConfig()
+        config.paradex_config = paradex_config
+        config.paradex_ws_url = self.sim.ws_url
+        config.ws_heartbeat_period = 60
+        self.config = config
+        self.api = ParadexApi(None, config, asyncio.get_running_loop(), reconnect_min_delay=0.01)
+        self.api.channels = {CHANNEL: WSSubscription.ORDER_BOOK}
+        self.received = []
+        self.tasks = []
+
+    async def asyncTearDown(self):
+        await self.api.close()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await self.sim.close()
+
+    @property
+    def connects(self) -> int:
+        return self.sim.stats["ws_connections"]
+
+    async def start(self):
+        self.tasks = await self.api.create_tasks(None)
+
+    async def test_handler_error_does_not_stop_reader(self):
+        def handler(channel, update):
+            self.received.append(update)
+            if len(self.received) == 1:
+                raise ValueError("handler bug")
+
+        self.api.add_handler(WSSubscription.ORDER_BOOK, handler)
+        await self.start()
+        await wait_until(lambda: len(self.received) >= 3)
+        self.assertEqual(self.connects, 1)
+
+    async def test_undecodable_message_is_skipped(self):
+        self.api.add_handler(
+            WSSubscription.ORDER_BOOK, lambda channel, update: self.received.append(update)
+        )
+        await self.start()
+        await wait_until(lambda: len(self.received) >= 1)
+        self.sim.broadcast("not json")
+        count = len(self.received)
+        await wait_until(lambda: len(self.received) >= count + 3)
+        self.assertEqual(self.connects, 1)
+
+    async def test_failed_heartbeat_reconnects(self):
+        self.config.ws_heartbeat_period = 0.05
+        self.api.add_handler(
+            WSSubscription.ORDER_BOOK, lambda channel, update: self.received.append(update)
+        )
+        failures = [RuntimeError("send failed")]
+
+        async def send_heartbeat_id(websocket, msg_id):
+            if failures:
+                raise failures.pop()
+
+        with mock.patch("shared.paradex_api.send_heartbeat_id", send_heartbeat_id):
+            await self.start()
+            await wait_until(lambda: self.connects >= 2)
+            count = len(self.received)
+            await wait_until(lambda: len(self.received) > count)
+        self.assertEqual(self.connects, 2)
+
+    async def test_sequence_gap_resubscribes(self):
+        book = OrderBook("ETH-USD-PERP", Decimal("0.1"))
+        self.api.add_order_book(book)
+        await self.start()
+        await wait_until(lambda: book.synced)
+
+        with self.assertLogs(level="WARNING"):
+            book.apply(OrderBookUpdate(seq_no=book.seq_no + 1000, market=book.market))
+        self.assertFalse(book.synced)
+        # The resubscription brings a new snapshot on the same connection
+        await wait_until(lambda: book.synced and book.best_bid() is not None)
+        self.assertEqual(self.connects, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+Description:
+    Order quantums and chain strings.
+
+    Run from python/ with `python -m unittest discover tests`.
+"""
+import unittest
+from decimal import Decimal
+
+from shared.paradex_api_utils import Order, OrderSide, OrderType
+
+
+class OrderQuantumsTest(unittest.TestCase):
+    def test_decimal_and_int_values(self):
+        order = Order("ETH-USD-PERP", OrderType.Limit, OrderSide.Buy, 2, Decimal("1850.25"))
+        self.assertEqual(order.size_quantums, 200_000_000)
+        self.assertEqual(order.chain_size(), "200000000")
+        self.assertEqual(order.chain_price(), "185025000000")
+
+    def test_market_order_without_price(self):
+        order = Order("ETH-USD-PERP", OrderType.Market, OrderSide.Sell, Decimal("0.5"))
+        self.assertEqual(order.price_quantums, 0)
+        self.assertEqual(order.chain_price(), "0")
+        self.assertEqual(order.dump_to_dict()["size"], "0.5")
+
+    def test_size_set_after_construction(self):
+        order = Order("ETH-USD-PERP", OrderType.Limit, OrderSide.Buy, None, None)
+        order.size = Decimal("1.5")
+        order.limit_price = Decimal("10")
+        self.assertEqual(order.chain_size(), "150000000")
+        self.assertEqual(order.chain_price(), "1000000000")
+        order.limit_price = Decimal("11")
+        self.assertEqual(order.price_quantums, 1_100_000_000)
+        self.assertEqual(order.chain_price(), "1100000000")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Description:
+    TreasurySweep leg amounts and batched JSON-RPC responses.
+
+    Run from python/ with `python -m unittest discover tests`.
+"""
+import json
+import os
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.full_node_client import FullNodeClient
+
+from shared.starknet_utils import rpc_batch
+from shared.treasury import SweepLeg, TreasurySweep
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "paradex_config.json"
+)
+
+
+class SweepAmountsTest(unittest.TestCase):
+    def setUp(self):
+        with open(FIXTURE) as f:
+            self.sweep = TreasurySweep(json.load(f))
+        self.a, self.b, self.c = (SimpleNamespace(address=address) for address in (1, 2, 3))
+        self.balances = {1: (Decimal("10.5"), Decimal(0)), 2: (Decimal("4"), Decimal(0))}
+
+    def test_full_balance_is_taken_once_per_source(self):
+        plan = [SweepLeg(self.a, self.c), SweepLeg(self.a, self.b), SweepLeg(self.b, self.c)]
+        self.assertEqual(
+            self.sweep.amounts(plan, self.balances), [Decimal("10.5"), Decimal(0), Decimal(4)]
+        )
+
+    def test_fixed_amounts_come_first(self):
+        plan = [SweepLeg(self.a, self.c), SweepLeg(self.a, self.b, Decimal("3"))]
+        self.assertEqual(self.sweep.amounts(plan, self.balances), [Decimal("7.5"), Decimal(3)])
+        plan = [SweepLeg(self.a, self.b, Decimal("11")), SweepLeg(self.a, self.c)]
+        self.assertEqual(self.sweep.amounts(plan, self.balances), [Decimal(11), Decimal(0)])
+
+
+class RpcBatchTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.responses = []
+
+        async def handle(request: web.Request) -> web.Response:
+            return web.json_response(self.responses)
+
+        app = web.Application()
+        app.router.add_post("/", handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.client = FullNodeClient(node_url=str(self.server.make_url("/")))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_results_by_id(self):
+        self.responses = [
+            {"jsonrpc": "2.0", "id": 1, "result": ["0x2"]},
+            {"jsonrpc": "2.0", "id": 0, "error": {"code": 29, "message": "not found"}},
+        ]
+        first, second = await rpc_batch(self.client, "call", [{}, {}])
+        self.assertIsInstance(first, ClientError)
+        self.assertEqual(first.code, 29)
+        self.assertEqual(second, ["0x2"])
+
+    async def test_error_without_id(self):
+        self.responses = [
+            {"jsonrpc": "2.0", "id": 0, "result": []},
+            {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid request"}},
+        ]
+        first, second = await rpc_batch(self.client, "call", [{}, {}])
+        self.assertEqual(first, [])
+        self.assertIsInstance(second, ClientError)
+        self.assertEqual(second.code, -32600)
+
+    async def test_missing_response(self):
+        self.responses = [{"jsonrpc": "2.0", "id": 0, "result": None}]
+        first, second = await rpc_batch(self.client, "call", [{}, {}])
+        self.assertIsNone(first)
+        self.assertIsInstance(second, ClientError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,14 +2,13 @@ import asyncio
 import logging
 import os
 
-from starknet_py.contract import Contract
-
 from helpers.account import Account
-from shared.api_client import get_paradex_config
+from shared.config_store import load_paradex_config
+from shared.contract_registry import get_contract
+from shared.sessions import closing_sessions
 from utils import (
     get_account,
     get_paradex_account_address,
-    get_proxy_config,
     get_random_max_fee,
     hex_to_int,
 )
@@ -25,15 +24,9 @@ async def paraclear_transfer(
     usdc_address = config["bridged_tokens"][0]["l2_token_address"]
     usdc_decimals = config["bridged_tokens"][0]["decimals"]
 
-    paraclear_contract = await Contract.from_address(
-        provider=old_account, address=paraclear_address, proxy_config=get_proxy_config()
-    )
-    paraclear_contract_new = await Contract.from_address(
-        provider=new_account, address=paraclear_address, proxy_config=get_proxy_config()
-    )
-    usdc_contract = await Contract.from_address(
-        provider=old_account, address=usdc_address, proxy_config=get_proxy_config()
-    )
+    paraclear_contract = await get_contract(paraclear_address, old_account)
+    paraclear_contract_new = await get_contract(paraclear_address, new_account)
+    usdc_contract = await get_contract(usdc_address, old_account)
 
     # Set transfer amount to available balance if not specified
     if (transfer_amount is None):
@@ -106,9 +99,10 @@ async def paraclear_transfer(
     )
 
 
+@closing_sessions
 async def main(old_paradex_account_private_key_hex, new_paradex_account_private_key_hex) -> None:
     # Load Paradex config
-    paradex_config = await get_paradex_config(paradex_http_url)
+    paradex_config = await load_paradex_config(paradex_http_url)
 
     # Get Paradex account addresses
     old_paradex_account_address = get_paradex_account_address(
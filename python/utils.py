@@ -5,7 +5,6 @@ import logging
 import random
 import re
 import time
-from enum import IntEnum
 from typing import Callable, Dict, Optional, Tuple
 
 from eth_account.messages import encode_structured_data
@@ -20,7 +19,6 @@ from starknet_py.hash.selector import get_selector_from_name
 from starknet_py.net.client import Client
 from starknet_py.net.client_errors import ClientError
 from starknet_py.net.client_models import Call, Hash, TransactionExecutionStatus, TransactionFinalityStatus
-from starknet_py.net.full_node_client import FullNodeClient
 from starknet_py.net.models import Address
 from starknet_py.net.signer.stark_curve_signer import KeyPair
 from starknet_py.proxy.contract_abi_resolver import ProxyConfig
@@ -32,7 +30,7 @@ from starknet_py.transaction_errors import (
 from starknet_py.utils.typed_data import TypedData
 from starkware.crypto.signature.signature import EC_ORDER
 
-from helpers.account import Account
+from shared.account_registry import get_account, get_chain_id
 
 
 paradex_http_url = "https://api.testnet.paradex.trade/v1"
@@ -193,25 +191,6 @@ def generate_paradex_account(
     return paradex_account_address, paradex_account_private_key_hex
 
 
-def get_chain_id(chain_id: str):
-    class CustomStarknetChainId(IntEnum):
-        PRIVATE_TESTNET = int_from_bytes(chain_id.encode("UTF-8"))
-    return CustomStarknetChainId.PRIVATE_TESTNET
-
-
-def get_account(account_address: str, account_key: str, paradex_config: dict):
-    client = FullNodeClient(node_url=paradex_config["starknet_fullnode_rpc_url"])
-    key_pair = KeyPair.from_private_key(key=hex_to_int(account_key))
-    chain = get_chain_id(paradex_config["starknet_chain_id"])
-    account = Account(
-        client=client,
-        address=account_address,
-        key_pair=key_pair,
-        chain=chain,
-    )
-    return account
-
-
 def get_random_max_fee(start=1e18, end=1e19) -> int:
     return random.randint(start, end)
 
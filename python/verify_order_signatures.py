@@ -0,0 +1,46 @@
+import asyncio
+import logging
+import os
+import sys
+import time
+
+from starknet_py.common import int_from_bytes
+
+from shared.config_store import load_paradex_config
+from shared.signature_audit import audit_file
+from shared.sessions import closing_sessions
+
+paradex_http_url = "https://api.testnet.paradex.trade/v1"
+
+
+# Verify signed orders from a JSON lines file of Order.dump_to_dict() records.
+# Records may carry their own "account" and "public_key",
+# otherwise PARADEX_ACCOUNT and the keys in PUBLIC_KEYS are used.
+@closing_sessions
+async def main(path: str, account: str, public_keys: list, workers: int) -> int:
+    # Load Paradex config
+    paradex_config = await load_paradex_config(paradex_http_url)
+    chain_id = int_from_bytes(paradex_config["starknet_chain_id"].encode())
+
+    start = time.perf_counter()
+    report = audit_file(path, chain_id, account, public_keys, workers)
+    elapsed = time.perf_counter() - start
+    print(report.format())
+    logging.info(f"Verified {report.total} orders in {elapsed:.1f}s")
+    return 1 if report.mismatches else 0
+
+
+if __name__ == "__main__":
+    # Logging
+    logging.basicConfig(
+        level=os.getenv("LOGGING_LEVEL", "INFO"),
+        format="%(asctime)s.%(msecs)03d | %(levelname)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    # Load environment variables
+    path = os.getenv("AUDIT_FILE", "orders.jsonl")
+    account = os.getenv("PARADEX_ACCOUNT", "")
+    public_keys = [int(key, 16) for key in os.getenv("PUBLIC_KEYS", "").split(",") if key]
+    workers = int(os.getenv("AUDIT_WORKERS", "0"))
+    sys.exit(asyncio.run(main(path, account, public_keys, workers)))
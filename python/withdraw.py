@@ -8,24 +8,30 @@ from hexbytes import HexBytes
 from typing import Dict, Tuple
 
 from web3.auto import Web3
+from web3.exceptions import ContractLogicError
 
-from starknet_py.contract import Contract
 from starknet_py.net.client import Client
+from starknet_py.transaction_errors import TransactionRejectedError, TransactionRevertedError
 
 from helpers.account import Account
-from shared.api_client import get_paradex_config
+from shared.config_store import load_paradex_config
+from shared.contract_registry import get_contract
+from shared.tx_tracker import TxTracker
+from shared.sessions import closing_sessions
 from utils import (
     generate_paradex_account,
     get_account,
     get_l1_eth_account,
-    get_proxy_config,
     get_random_max_fee,
     hex_to_int,
-    wait_for_tx,
 )
 
 paradex_http_url = "https://api.testnet.paradex.trade/v1"
 l2_bridge_version = 2
+# L2 withdrawals waiting for `ACCEPTED_ON_L1`, resumed on restart
+pending_withdrawals_file = os.getenv("PENDING_WITHDRAWALS_FILE", "pending_withdrawals.json")
+# Revert reason of the L1 bridge for an L2 message that was already consumed
+ALREADY_CLAIMED_REASON = "INVALID_MESSAGE_TO_CONSUME"
 
 async def withdraw_from_paraclear(
     l1_recipient: str, amount: int, config: Dict, account: Account
@@ -38,14 +44,10 @@ async def withdraw_from_paraclear(
     l2_bridge_address = config["bridged_tokens"][0]["l2_bridge_address"]
     usdc_decimals = config["bridged_tokens"][0]["decimals"]
 
-    paraclear_contract = await Contract.from_address(
-        provider=account, address=paraclear_address, proxy_config=True
-    )
+    paraclear_contract = await get_contract(paraclear_address, account)
     logging.info(f"Paraclear Contract: {hex(paraclear_contract.address)}")
 
-    l2_bridge_contract = await Contract.from_address(
-        provider=account, address=l2_bridge_address, proxy_config=get_proxy_config()
-    )
+    l2_bridge_contract = await get_contract(l2_bridge_address, account)
     logging.info(f"USDC Bridge Contract: {hex(l2_bridge_contract.address)}")
 
     token_asset_bal = await paraclear_contract.functions["getTokenAssetBalance"].call(
@@ -78,9 +80,7 @@ async def withdraw_from_paraclear(
     logging.info(f"L2 withdraw completed: {tx_status}")
 
     # Check balance
-    usdc_contract = await Contract.from_address(
-        provider=account, address=usdc_address, proxy_config=get_proxy_config()
-    )
+    usdc_contract = await get_contract(usdc_address, account)
     usdc_bal = await usdc_contract.functions["balanceOf"].call(account=account.address)
     logging.info(f"USDC L2 balance is {usdc_bal[0] / 10**usdc_decimals}")
 
@@ -105,19 +105,34 @@ async def withdraw_from_l1_bridge(
         "nonce": nonce,
         "type": 2,
     }
-    withdraw_tx = l1_contract.functions.withdraw(
-        amount * 10**usdc_decimals, l1_recipient
-    ).build_transaction(tx)
+    withdraw_fn = l1_contract.functions.withdraw(amount * 10**usdc_decimals, l1_recipient)
+
+    # A previous run may have claimed it without recording it
+    try:
+        await asyncio.to_thread(withdraw_fn.call, {"from": l1_recipient})
+    except ContractLogicError as e:
+        if ALREADY_CLAIMED_REASON not in str(e):
+            raise
+        logging.info(f"L1 withdraw of {amount} USDC to {l1_recipient} was already claimed")
+        return
+
+    withdraw_tx = withdraw_fn.build_transaction(tx)
     tx_hash = w3.eth.send_transaction(withdraw_tx)
     logging.info(f"L1 withdraw tx hash: { HexBytes(tx_hash).hex()}")
 
+    # The claim only succeeded once it is mined without reverting
+    receipt = await asyncio.to_thread(w3.eth.wait_for_transaction_receipt, tx_hash)
+    if receipt["status"] != 1:
+        raise RuntimeError(f"L1 withdraw tx {HexBytes(tx_hash).hex()} reverted")
+
 
 # Primary Coroutine
+@closing_sessions
 async def main(eth_private_key_hex: str) -> None:
     w3, eth_account = get_l1_eth_account(eth_private_key_hex)
 
     # Load Paradex config
-    paradex_config = await get_paradex_config(paradex_http_url)
+    paradex_config = await load_paradex_config(paradex_http_url)
 
     # Generate Paradex account (only local)
     paradex_account_address, paradex_account_private_key_hex = generate_paradex_account(
@@ -129,20 +144,48 @@ async def main(eth_private_key_hex: str) -> None:
         paradex_account_address, paradex_account_private_key_hex, paradex_config
     )
 
+    # Withdrawals left pending by a previous run are tracked again,
+    # each one is kept in the file until it is claimed on L1
+    tracker = TxTracker(
+        account.client, path=pending_withdrawals_file, min_interval=5, forget_settled=False
+    )
+    withdrawals = [(tx_hash, future, meta) for tx_hash, (future, meta) in tracker.resume().items()]
+
     amount = 1  # 1 USDC
 
     # This method only waits for `ACCEPTED_ON_L2` status
     # Status change to `ACCEPTED_ON_L1` could take up to 12 hours
-    client, withdraw_tx_hash = await withdraw_from_paraclear(
+    _, withdraw_tx_hash = await withdraw_from_paraclear(
         eth_account.address, amount, paradex_config, account
     )
 
-    # Poll for `ACCEPTED_ON_L1` status
+    # Poll for `ACCEPTED_ON_L1` status along with every other pending withdrawal
     logging.info(f"Poll L2 withdraw tx: {withdraw_tx_hash}")
-    await wait_for_tx(client=client, tx_hash=withdraw_tx_hash)
-
-    # After withdraw tx is `ACCEPTED_ON_L1`, trigger the withdrawal from L1 bridge
-    await withdraw_from_l1_bridge(eth_account.address, amount, paradex_config, w3)
+    meta = {"l1_recipient": eth_account.address, "amount": amount}
+    tx_hash = int(withdraw_tx_hash, 16)
+    withdrawals.append((tx_hash, tracker.track(tx_hash, meta=meta), meta))
+
+    async def complete_withdrawal(
+        tx_hash: int, accepted_on_l1: asyncio.Future, meta: Dict
+    ) -> None:
+        try:
+            await accepted_on_l1
+        except (TransactionRejectedError, TransactionRevertedError) as e:
+            # Nothing to claim on L1
+            logging.error(f"L2 withdraw tx {hex(tx_hash)} failed: {e}")
+            tracker.forget(tx_hash)
+            return
+        # After withdraw tx is `ACCEPTED_ON_L1`, trigger the withdrawal from L1 bridge
+        try:
+            await withdraw_from_l1_bridge(meta["l1_recipient"], meta["amount"], paradex_config, w3)
+        except Exception as e:
+            logging.error(f"L1 claim of {hex(tx_hash)} failed, retried on the next run: {e}")
+            return
+        tracker.forget(tx_hash)
+
+    await asyncio.gather(
+        *(complete_withdrawal(tx_hash, future, meta) for tx_hash, future, meta in withdrawals)
+    )
 
 
 if __name__ == "__main__":